@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Keep/destroy actions confirmed by screen probes instead of fixed sleeps.
+
+Every step of an action chain is performed and then followed by a cheap
+probe of the spot where its effect must show up: the ``Destroy`` entry of the
+context menu, the ``This`` entry of the submenu, or the egg popup itself.
+The next step runs as soon as the probe changes and settles.  Steps that are
+not confirmed within ``action_timeout`` are retried, and the whole action
+reports whether it went through so the loop can rescan instead of acting on
+the wrong egg.
+"""
+import time
+
+from logger import get_logger
+log = get_logger("actions")
+
+from scanner import grab_region, probe_region, wait_for_popup
+from timing import DEFAULT_DELAYS, get_delay, record_latency, report_failure
+from input_backend import get_input
+
+# seconds a step may take before it counts as failed
+ACTION_TIMEOUT = DEFAULT_DELAYS["action_timeout"]
+# extra attempts for steps that are safe to repeat
+ACTION_RETRIES = 1
+# side of the square probed around a menu entry
+MENU_PROBE_SIZE = 12
+# fixed wait after opening a menu when probing is disabled
+ACTION_SLEEP = 0.3
+
+
+def _probe_box(x: int, y: int, size: int = MENU_PROBE_SIZE):
+    return (x - size // 2, y - size // 2, size, size)
+
+
+def run_step(settings, name, perform, probe, retries=None, reset=None, sleep=0.0):
+    """Run ``perform`` until ``probe`` changes; returns ``True`` on success.
+
+    ``probe`` is an ``(x, y, w, h)`` region, or ``None`` to fall back to the
+    old fixed ``sleep``.  ``reset`` is called before each retry to undo a half
+    finished step (e.g. close a stray menu).  Confirmation latencies tune
+    ``action_timeout``, not the scanner's ``action_delay``.
+    """
+    if probe is None or not settings.get("action_probe", True):
+        perform()
+        if sleep:
+            time.sleep(sleep)
+        return True
+    timeout = get_delay(settings, "action_timeout", ACTION_TIMEOUT)
+    if retries is None:
+        retries = settings.get("action_retries", ACTION_RETRIES)
+    backend = settings.get("capture_backend", "auto")
+    for attempt in range(retries + 1):
+        if attempt and reset is not None:
+            reset()
+        baseline = grab_region(probe, backend).copy()
+        perform()
+        waited = wait_for_popup(probe, baseline, timeout, backend=backend)
+        if waited is not None:
+            log.debug("%s confirmed after %.3fs", name, waited)
+            record_latency(settings, "action_timeout", waited)
+            return True
+        log.warning("%s not confirmed within %.2fs (attempt %d)", name, timeout, attempt + 1)
+    report_failure(settings, "action_timeout")
+    return False
+
+
+def slot_box(settings):
+    """Probe region covering the egg icon of the slot ``settings`` points at."""
+    size = (settings.get("slot_grid") or {}).get("slot_size") or [MENU_PROBE_SIZE] * 2
+    w, h = size
+    return (settings["slot_x"] - w // 2, settings["slot_y"] - h // 2, w, h)
+
+
+def keep_egg(settings, popup_open=True) -> bool:
+    """Double-click the slot and confirm that the egg left it.
+
+    With the egg's popup still open its closing is the confirmation;
+    otherwise the slot icon is watched.  A double-click is never repeated:
+    if the first one did move the egg, a second one would take the next egg
+    as well.
+    """
+    x, y = settings["slot_x"], settings["slot_y"]
+    mouse = get_input(settings.get("input_backend", "auto"))
+    probe = probe_region(settings) if popup_open else slot_box(settings)
+    return run_step(
+        settings, "keep", lambda: mouse.doubleClick(x, y), probe, retries=0,
+    )
+
+
+def destroy_egg(settings) -> bool:
+    """Run the right-click → Destroy → This chain, confirming every step."""
+    x, y = settings["slot_x"], settings["slot_y"]
+    dx, dy = settings["destroy_offsets"]
+    dx2, dy2 = settings["destroy_this_offsets"]
+    size = settings.get("menu_probe_size", MENU_PROBE_SIZE)
+    menu = _probe_box(x + dx, y + dy, size)
+    submenu = _probe_box(x + dx2, y + dy2, size)
+    mouse = get_input(settings.get("input_backend", "auto"))
+
+    def open_menu():
+        mouse.moveTo(x, y)
+        mouse.rightClick()
+
+    def close_menu():
+        mouse.press("esc")
+
+    def confirm():
+        mouse.moveTo(x + dx2, y + dy2)
+        mouse.click()
+
+    if not run_step(
+        settings, "context menu", open_menu, menu, reset=close_menu, sleep=ACTION_SLEEP,
+    ):
+        return False
+    if not run_step(
+        settings, "destroy submenu", lambda: mouse.moveTo(x + dx, y + dy), submenu,
+        sleep=ACTION_SLEEP,
+    ):
+        close_menu()
+        return False
+    # the submenu closing confirms the click; never click "This" twice
+    return run_step(settings, "destroy this", confirm, submenu, retries=0)
+
@@ -4,7 +4,7 @@ import random
 import threading
 from typing import Optional
 
-import pyautogui
+from input_backend import get_input
 
 SETTINGS_FILE = "settings.json"
 
@@ -17,9 +17,10 @@ def load_settings() -> dict:
 def eat_food(settings: Optional[dict] = None) -> bool:
     """Double-click one of the configured food slots."""
     settings = settings or load_settings()
+    mouse = get_input(settings.get("input_backend", "auto"))
     for x, y in settings.get("food_slots", []):
-        if pyautogui.onScreen(x, y):
-            pyautogui.doubleClick(x, y)
+        if mouse.onScreen(x, y):
+            mouse.doubleClick(x, y)
             return True
     return False
 
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Single background thread for work that must not delay the next scan.
+
+``BackgroundWriter`` runs submitted callables in order on one daemon thread.
+Tasks submitted with a ``key`` coalesce: while one is still queued, a newer
+task with the same key replaces it, so ten progress saves queued behind a
+slow disk turn into one write of the latest state.  ``flush()`` waits until
+everything submitted so far has run.
+"""
+import itertools
+import threading
+from collections import OrderedDict
+
+from logger import get_logger
+log = get_logger("background_writer")
+
+
+class BackgroundWriter:
+    """Ordered, coalescing task queue served by one worker thread."""
+
+    def __init__(self, name: str = "writer"):
+        self.name = name
+        self._pending = OrderedDict()
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._work, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, key=None) -> None:
+        """Queue ``fn(*args)``; replaces a queued task with the same ``key``."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if key is None:
+                key = ("_task", next(self._ids))
+            self._pending.pop(key, None)
+            self._pending[key] = (fn, args)
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending) + self._busy
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all queued tasks ran; ``False`` on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def close(self, timeout: float | None = None) -> None:
+        """Run what is queued, then stop the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                _, (fn, args) = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                fn(*args)
+            except Exception:
+                log.exception("%s task %r failed", self.name, fn)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -4,120 +4,96 @@ kept_log = get_logger("kept_eggs")
 destroyed_log = get_logger("destroyed_eggs")
 
 from progress_tracker import normalize_species_name, apply_automated_modes
+from decision_trace import DecisionTrace
+import numpy as np
+
+from rule_compiler import MODE_BITS, MODES, compile_rules, modes_from_mask
 
 def should_keep_egg(scan, rules, progress):
+    """Decide keep/destroy/rescan for one scanned egg.
+
+    Returns ``(decision, result)`` where ``result`` maps each mode to whether
+    it passed and ``result["_debug"]`` is a ``DecisionTrace`` of the
+    comparisons made; its text is only built when read.
+    """
     egg = scan["egg"]
     stats = scan["stats"]
     sex = scan["sex"]
     species = normalize_species_name(egg)
+    trace = DecisionTrace(egg)
+    result = dict.fromkeys(MODES, False)
+    result["_debug"] = trace
 
-    log.debug(f"Evaluating egg: {egg} ({sex})")
+    log.debug("Evaluating egg: %s (%s)", egg, sex)
 
     # ─── CATCH GARBAGE SPECIES NAMES ──────────────────────────────
     # require "CS" and either "male" or "female" in the raw OCR
     sl = egg.lower()
     if "cs" not in sl or not ("male" in sl or "female" in sl):
-        result = {
-            "mutations": False,
-            "all_females": False,
-            "stat_merge": False,
-            "top_stat_females": False,
-            "war": False,
-            "_debug": {
-                "invalid_species": "name did not contain CS and male/female",
-                "final": "rescan"
-            }
-        }
-        log.error(f"Invalid OCR for egg species: {egg!r}. Triggering rescan.")
+        trace.note("invalid_species", "invalid_species")
+        trace.final = "rescan"
+        log.error("Invalid OCR for egg species: %r. Triggering rescan.", egg)
         return "rescan", result
 
     # determine effective modes, accounting for automated logic
     enabled = set(rules.get("modes", []))
     # mutations and stat_merge are always active
     enabled.update({"mutations", "stat_merge"})
-    count = progress.get(species, {}).get("female_count", 0)
+    entry = progress.get(species, {})
+    count = entry.get("female_count", 0)
     enabled = apply_automated_modes(count, enabled)
 
     # ─── AUTO-DESTROY FEMALES WHEN NO FEMALE-MODES ENABLED ────────
     female_modes = {"all_females", "top_stat_females", "war"}
     if sex == "female" and not (female_modes & enabled):
-        result = {
-            "mutations": False,
-            "all_females": False,
-            "stat_merge": False,
-            "top_stat_females": False,
-            "war": False,
-            "_debug": {
-                "auto_destroy": "no female modes enabled",
-                "final": "destroy"
-            }
-        }
-        destroyed_log.info(f"Egg {egg} DESTROYED | reason: no female modes enabled")
+        trace.note("auto_destroy", "auto_destroy")
+        trace.final = "destroy"
+        destroyed_log.info("Egg %s DESTROYED | reason: no female modes enabled", egg)
         return "destroy", result
 
-    result = {
-        "mutations": False,
-        "all_females": False,
-        "stat_merge": False,
-        "top_stat_females": False,
-        "war": False,
-        "_debug": {}
-    }
-
     # ─── Mutations ─────────────────────────────────────────
     if "mutations" in enabled and sex == "male":
         log.debug("Evaluating mutations rule")
 
-        tracked = rules.get("mutation_stats", [])
-        old_thresh = progress.get(species, {}).get("mutation_thresholds", {})
-        # default any missing stats to 0
-        thresholds = {st: old_thresh.get(st, 0) for st in tracked}
-
+        old_thresh = entry.get("mutation_thresholds", {})
+        mutation_stud = entry.get("mutation_stud", {})
         all_ok = True
         any_strict = False
         better_base = False
-        reasons = []
-
-        for st in tracked:
-            egg_mut = stats.get(st, {}).get("mutation", 0)
-            th = thresholds[st]
 
+        for st in rules.get("mutation_stats", []):
+            # default any missing stats to 0
             # require at least your old threshold even if no new mutation
-            if egg_mut < th:
+            op = trace.check("mutations", st, "mutation",
+                             stats.get(st, {}).get("mutation", 0), old_thresh.get(st, 0))
+            if op == "<":
                 all_ok = False
-                reasons.append(f"{st}={egg_mut}<{th}")
-            elif egg_mut > th:
+            elif op == ">":
                 any_strict = True
-                reasons.append(f"{st}={egg_mut}>{th}")
-            else:
-                stud_base = progress.get(species, {}).get("mutation_stud", {}).get(st, 0)
-                egg_base = stats.get(st, {}).get("base", 0)
-                if egg_base > stud_base:
-                    better_base = True
-                reasons.append(f"{st}={egg_mut}={th}")
-
-        if all_ok and (any_strict or better_base):
-            result["mutations"] = True
-            result["_debug"]["mutations"] = " | ".join(reasons)
-        else:
-            result["_debug"]["mutations"] = f"❌ not qualified: {' | '.join(reasons)}"
+            elif trace.check("mutations", st, "base",
+                             stats.get(st, {}).get("base", 0), mutation_stud.get(st, 0)) == ">":
+                better_base = True
+
+        result["mutations"] = all_ok and (any_strict or better_base)
+        trace.result("mutations", result["mutations"])
 
     # ─── All Females ──────────────────────────────────────────────
     if "all_females" in enabled and sex == "female":
         log.debug("Evaluating all_females rule")
         result["all_females"] = True
-        result["_debug"]["all_females"] = "female"
+        trace.result("all_females", True)
+        trace.note("all_females", "female")
 
     # ─── Stat Merge ──────────────────────────────────────────────
     if "stat_merge" in enabled and sex == "male":
         log.debug("Evaluating stat_merge rule")
         if scan.get("updated_stud"):
             result["stat_merge"] = True
-            result["_debug"]["stat_merge"] = "updated_stud = True"
+            trace.note("stat_merge", "updated_stud")
         else:
             merge_stats = rules.get("stat_merge_stats", [])
-            top = progress.get(species, {}).get("top_stats", {})
-            stud = progress.get(species, {}).get("stud", {})
+            top = entry.get("top_stats", {})
+            stud = entry.get("stud", {})
             match_count = sum(
                 1 for stat in merge_stats
                 if stats.get(stat, {}).get("base", 0) >= top.get(stat, 0)
@@ -126,85 +102,150 @@ def should_keep_egg(scan, rules, progress):
                 1 for stat in merge_stats
                 if stud.get(stat, 0) >= top.get(stat, 0)
             )
+            trace.check("stat_merge", "", "count", match_count, stud_count)
             if match_count > 0 and not stud:
                 result["stat_merge"] = True
-                result["_debug"]["stat_merge"] = "first valid stud"
+                trace.note("stat_merge", "first_stud")
             elif match_count > stud_count:
                 result["stat_merge"] = True
-                result["_debug"]["stat_merge"] = f"{match_count}>{stud_count}"
             elif match_count == stud_count and match_count > 0:
                 for stat in merge_stats:
                     base = stats.get(stat, {}).get("base", 0)
-                    if base > stud.get(stat, 0):
+                    if trace.check("stat_merge", stat, "base", base, stud.get(stat, 0)) == ">":
                         result["stat_merge"] = True
-                        result["_debug"]["stat_merge"] = f"{stat} base {base}>{stud.get(stat, 0)}"
                         break
+        trace.result("stat_merge", result["stat_merge"])
 
     # ─── Top Stat Females (equal or higher than current stud) ───
     if "top_stat_females" in enabled and sex == "female":
-        log.debug(f"RAW STATS passed into logic: {stats}")
+        log.debug("RAW STATS passed into logic: %s", stats)
         log.debug("Evaluating top_stat_females rule against stud stats")
-        stud = progress.get(species, {}).get("stud", {})
-        tracked = rules.get("top_stat_females_stats", [])
-        mismatched = []
+        stud = entry.get("stud", {})
+        mismatched = False
         has_tracked = False
-        for stat in tracked:
-            stud_val = stud.get(stat, 0)
+        for stat in rules.get("top_stat_females_stats", []):
             base_val = stats.get(stat, {}).get("base", 0)
-            if base_val < stud_val:
-                mismatched.append(f"{stat}={base_val}<{stud_val}")
+            if trace.check("top_stat_females", stat, "base", base_val, stud.get(stat, 0)) == "<":
+                mismatched = True
             else:
                 has_tracked = True
-        if has_tracked and not mismatched:
-            result["top_stat_females"] = True
-            result["_debug"]["top_stat_females"] = ">= current stud"
-        else:
-            reason = (
-                f"mismatched: {', '.join(mismatched)}"
-                if mismatched
-                else "no tracked stats"
-            )
-            result["_debug"]["top_stat_females"] = reason
+        result["top_stat_females"] = has_tracked and not mismatched
+        trace.result("top_stat_females", result["top_stat_females"])
+        if result["top_stat_females"]:
+            trace.note("top_stat_females", "above_stud")
 
     # ─── War Tames ───────────────────────────────────────────────
     if "war" in enabled:
         log.debug("Evaluating war rule")
-        top = progress.get(species, {}).get("top_stats", {})
-        mut_thresh = progress.get(species, {}).get("mutation_thresholds", {})
-        tracked = rules.get("war_stats", [])
-        mismatch = []
-        for stat in tracked:
-            base = stats.get(stat, {}).get("base", 0)
-            mut = stats.get(stat, {}).get("mutation", 0)
-            top_val = top.get(stat, 0)
-            th = mut_thresh.get(stat, 0)
-            failures = []
-            if base < top_val:
-                failures.append(f"base {base}<{top_val}")
-            if mut < th:
-                failures.append(f"mut {mut}<{th}")
-            if failures:
-                mismatch.append(f"{stat}: {' & '.join(failures)}")
-        if not mismatch:
-            result["war"] = True
-            result["_debug"]["war"] = "all stats≥top & muts≥thresh"
-        else:
-            result["_debug"]["war"] = f"failed: {', '.join(mismatch)}"
+        top = entry.get("top_stats", {})
+        mut_thresh = entry.get("mutation_thresholds", {})
+        ok = True
+        for stat in rules.get("war_stats", []):
+            values = stats.get(stat, {})
+            # recorded as a (base, mutation) pair; DecisionTrace relies on it
+            if trace.check("war", stat, "base", values.get("base", 0), top.get(stat, 0)) == "<":
+                ok = False
+            if trace.check("war", stat, "mutation", values.get("mutation", 0), mut_thresh.get(stat, 0)) == "<":
+                ok = False
+        result["war"] = ok
+        trace.result("war", ok)
+        if ok:
+            trace.note("war", "war_ok")
 
     # ─── Final decision & separate logs ──────────────────────────
-    decision = "keep" if any(result[k] for k in result if k != "_debug") else "destroy"
-    result["_debug"]["final"] = decision
+    decision = "keep" if any(result[m] for m in MODES) else "destroy"
+    trace.final = decision
 
+    # the trace formats its details only if the record is emitted
     if decision == "keep":
-        details = []
-        for rule, passed in result.items():
-            if rule == "_debug" or not passed:
-                continue
-            reason = result["_debug"].get(rule, "")
-            details.append(f"{rule}: {reason}")
-        kept_log.info(f"Egg {egg} KEPT | {'; '.join(details)}")
+        kept_log.info("Egg %s KEPT | %s", egg, trace)
     else:
-        details = [f"{k}:{v}" for k, v in result["_debug"].items() if k != "final"]
-        destroyed_log.info(f"Egg {egg} DESTROYED | details: {'; '.join(details)}")
+        destroyed_log.info("Egg %s DESTROYED | details: %s", egg, trace)
+
+    return decision, result
+
+
+class _PassedModes:
+    """Formats a mode bitmask for the kept log only when it is emitted."""
 
+    __slots__ = ("mask",)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __str__(self):
+        return "; ".join(modes_from_mask(self.mask))
+
+
+def decide_egg(scan, rules, progress):
+    """Fast path of ``should_keep_egg`` through the cached ``rule_compiler``.
+
+    Returns the same decision and per-mode results; the trace in ``_debug``
+    records no comparisons, so callers that show reasons use
+    ``should_keep_egg`` instead.
+    """
+    egg = scan["egg"]
+    trace = DecisionTrace(egg)
+    sl = egg.lower()
+    if "cs" not in sl or not ("male" in sl or "female" in sl):
+        log.error("Invalid OCR for egg species: %r. Triggering rescan.", egg)
+        result = dict.fromkeys(MODES, False)
+        trace.note("invalid_species", "invalid_species")
+        trace.final = "rescan"
+        result["_debug"] = trace
+        return "rescan", result
+
+    species = normalize_species_name(egg)
+    compiled = compile_rules(species, rules, progress)
+    bases, muts = compiled.vectors(scan["stats"])
+    passed = compiled.evaluate(
+        bases, muts, scan["sex"] == "female", bool(scan.get("updated_stud"))
+    )
+    result = {mode: bool(passed & (1 << i)) for i, mode in enumerate(MODES)}
+    trace.final = decision = "keep" if passed else "destroy"
+    result["_debug"] = trace
+    if passed:
+        kept_log.info("Egg %s KEPT | %s", egg, _PassedModes(passed))
+    else:
+        destroyed_log.info("Egg %s DESTROYED | no mode passed", egg)
     return decision, result
+
+
+def decide_batch(species, stats_matrix, sexes, rules, progress, updated_stud=None):
+    """Vectorised ``should_keep_egg`` for many eggs of known species.
+
+    ``species`` is one canonical species name or a sequence with one per egg;
+    ``stats_matrix`` is an ``(N, 6, 2)`` array holding base and mutation of
+    each stat in ``rule_compiler.STAT_ORDER``; ``sexes`` holds ``"male"`` /
+    ``"female"`` or booleans (``True`` = female); ``rules`` is the rules.json
+    mapping.  Returns ``(keep, passed)``: an ``(N,)`` boolean mask and a dict
+    of per-mode masks, matching what the scalar path decides egg by egg.
+    Nothing is logged.
+    """
+    stats = np.asarray(stats_matrix)
+    bases, muts = stats[..., 0], stats[..., 1]
+    sexes = np.asarray(sexes)
+    female = sexes if sexes.dtype == bool else sexes == "female"
+    if updated_stud is not None:
+        updated_stud = np.asarray(updated_stud, dtype=bool)
+
+    if isinstance(species, str):
+        groups = [(species, slice(None))]
+    else:
+        names = np.asarray(species)
+        groups = [(str(name), names == name) for name in np.unique(names)]
+
+    masks = np.zeros(len(stats), dtype=np.int64)
+    for name, rows in groups:
+        compiled = compile_rules(name, rules.get(name, {}), progress)
+        b, m = bases[rows], muts[rows]
+        # stats named only in the rules read as 0, as in the scalar path
+        missing = len(compiled.order) - b.shape[1]
+        if missing:
+            b = np.pad(b, ((0, 0), (0, missing)))
+            m = np.pad(m, ((0, 0), (0, missing)))
+        masks[rows] = compiled.evaluate_batch(
+            b, m, female[rows], None if updated_stud is None else updated_stud[rows],
+        )
+    passed = {mode: (masks & MODE_BITS[mode]) != 0 for mode in MODES}
+    return masks != 0, passed
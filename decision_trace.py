@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Structured, lazily formatted traces of keep/destroy decisions.
+
+``should_keep_egg`` used to build a human-readable reason string for every
+mode of every egg.  It now records the raw comparisons instead –
+``Comparison(mode, stat, kind, observed, target, op)`` where ``op`` is the
+relation that held (``"<"``, ``"="`` or ``">"``) – plus a short note per mode.
+Text is only produced when someone reads it: ``trace.get("war")`` returns the
+same string the old ``_debug`` dict held, and ``str(trace)`` formats the
+kept/destroyed log details, so a log call passing the trace as an argument
+only formats when the record is emitted.
+
+``DecisionTrace`` keeps the read-only mapping interface of the old
+``_debug`` dict (``get``, ``[]``, ``in``, ``items``).
+"""
+from typing import NamedTuple
+
+# notes whose text does not depend on any comparison
+NOTES = {
+    "invalid_species": "name did not contain CS and male/female",
+    "auto_destroy": "no female modes enabled",
+    "female": "female",
+    "updated_stud": "updated_stud = True",
+    "first_stud": "first valid stud",
+    "above_stud": ">= current stud",
+    "no_tracked": "no tracked stats",
+    "war_ok": "all stats≥top & muts≥thresh",
+}
+
+
+class Comparison(NamedTuple):
+    mode: str
+    stat: str
+    kind: str  # "mutation", "base" or "count"
+    observed: int
+    target: int
+    op: str  # relation that held: "<", "=" or ">"
+
+
+def relation(observed, target) -> str:
+    return "<" if observed < target else ">" if observed > target else "="
+
+
+class DecisionTrace:
+    """What ``should_keep_egg`` compared, and what came of it."""
+
+    __slots__ = ("egg", "final", "passed", "notes", "checks")
+
+    def __init__(self, egg: str):
+        self.egg = egg
+        self.final = None
+        # modes evaluated, in order, with their outcome
+        self.passed = {}
+        # mode or special key -> NOTES key
+        self.notes = {}
+        self.checks = []
+
+    # ─── recording ──────────────────────────────────
+    def check(self, mode, stat, kind, observed, target) -> str:
+        op = relation(observed, target)
+        self.checks.append(Comparison(mode, stat, kind, observed, target, op))
+        return op
+
+    def note(self, key: str, note: str) -> None:
+        self.notes[key] = note
+
+    def result(self, mode: str, passed: bool) -> None:
+        self.passed[mode] = passed
+
+    # ─── queries ────────────────────────────────────
+    def comparisons(self, mode=None, op=None) -> list:
+        return [
+            c for c in self.checks
+            if (mode is None or c.mode == mode) and (op is None or c.op == op)
+        ]
+
+    def reason(self, key: str):
+        """The text the old ``_debug[key]`` held, or ``None``."""
+        if key == "final":
+            return self.final
+        note = self.notes.get(key)
+        if key == "mutations":
+            parts = [
+                f"{c.stat}={c.observed}{c.op}{c.target}"
+                for c in self.comparisons(key) if c.kind == "mutation"
+            ]
+            text = " | ".join(parts)
+            return text if self.passed[key] else f"❌ not qualified: {text}"
+        if key == "stat_merge":
+            if note is not None:
+                return NOTES[note]
+            checks = self.comparisons(key)
+            if not self.passed[key] or not checks:
+                return None
+            c = checks[-1]
+            if c.kind == "count":
+                return f"{c.observed}>{c.target}"
+            return f"{c.stat} base {c.observed}>{c.target}"
+        if key == "top_stat_females" and not self.passed[key]:
+            mismatched = [f"{c.stat}={c.observed}<{c.target}" for c in self.comparisons(key, "<")]
+            return f"mismatched: {', '.join(mismatched)}" if mismatched else NOTES["no_tracked"]
+        if key == "war" and not self.passed[key]:
+            checks = self.comparisons(key)
+            mismatch = []
+            # recorded as (base, mutation) pairs per tracked stat
+            for base, mut in zip(checks[::2], checks[1::2]):
+                failures = [
+                    f"{label} {c.observed}<{c.target}"
+                    for label, c in (("base", base), ("mut", mut)) if c.op == "<"
+                ]
+                if failures:
+                    mismatch.append(f"{base.stat}: {' & '.join(failures)}")
+            return f"failed: {', '.join(mismatch)}"
+        return NOTES[note] if note is not None else None
+
+    def keys(self) -> list:
+        keys = [k for k in self.notes if k not in self.passed]
+        keys += [m for m in self.passed if self.reason(m) is not None]
+        if self.final is not None:
+            keys.append("final")
+        return keys
+
+    def items(self) -> list:
+        return [(k, self.reason(k)) for k in self.keys()]
+
+    def get(self, key, default=None):
+        value = self.reason(key) if key in self.notes or key in self.passed or key == "final" else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __str__(self) -> str:
+        """Details for the kept/destroyed log line of ``final``."""
+        if self.final == "keep":
+            return "; ".join(
+                f"{mode}: {self.reason(mode) or ''}"
+                for mode, ok in self.passed.items() if ok
+            )
+        return "; ".join(f"{k}:{v}" for k, v in self.items() if k != "final")
+
+    def __repr__(self) -> str:
+        return f"DecisionTrace({self.egg!r}, final={self.final!r}, {len(self.checks)} checks)"
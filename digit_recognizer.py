@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Template-matching recognizer for the stat popup's fixed game font.
+
+Binarized stat crops (``scanner.FramePlanes.binarize``) are split into
+connected components and every glyph is compared against a small bank of
+templates captured during calibration.  Reading a stat this way takes well
+under a millisecond, so Tesseract is only used when a match is uncertain.
+"""
+import json
+import os
+
+import numpy as np
+
+from logger import get_logger
+log = get_logger("digit_recognizer")
+
+try:
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - recognizer simply stays unused
+    cv2 = None
+
+TEMPLATE_FILE = "digit_templates.json"
+GLYPH_CHARS = "0123456789()"
+# every glyph is centred in a square and scaled to GLYPH_SIZE x GLYPH_SIZE
+GLYPH_SIZE = 16
+# keep a few samples per character so small rendering differences still match
+MAX_SAMPLES = 5
+# components smaller than this fraction of the crop height are noise
+MIN_GLYPH_HEIGHT = 0.25
+
+
+def foreground_mask(prim: np.ndarray) -> np.ndarray:
+    """Return a 0/1 mask where text pixels are 1, whatever the polarity."""
+    gray = prim if prim.ndim == 2 else prim[..., 0]
+    mask = (gray > 127).astype(np.uint8)
+    border = np.concatenate((mask[0], mask[-1], mask[:, 0], mask[:, -1]))
+    if border.mean() > 0.5:
+        mask = 1 - mask
+    return mask
+
+
+def segment(mask: np.ndarray) -> list:
+    """Split ``mask`` into glyph masks ordered left to right.
+
+    Components whose columns overlap are merged so glyphs that binarize into
+    several pieces still form a single glyph.
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    min_h = max(2, int(mask.shape[0] * MIN_GLYPH_HEIGHT))
+    boxes = []
+    for i in range(1, count):
+        x, y, w, h, _area = stats[i]
+        boxes.append([x, y, x + w, y + h])
+    boxes.sort()
+
+    merged = []
+    for box in boxes:
+        if merged and box[0] < merged[-1][2]:
+            last = merged[-1]
+            last[1] = min(last[1], box[1])
+            last[2] = max(last[2], box[2])
+            last[3] = max(last[3], box[3])
+        else:
+            merged.append(box)
+    return [
+        mask[y0:y1, x0:x1] for x0, y0, x1, y1 in merged if y1 - y0 >= min_h
+    ]
+
+
+def normalize_glyph(glyph: np.ndarray) -> np.ndarray:
+    """Centre ``glyph`` in a square, keeping its aspect ratio, and rescale."""
+    h, w = glyph.shape
+    side = max(h, w)
+    square = np.zeros((side, side), dtype=np.uint8)
+    top, left = (side - h) // 2, (side - w) // 2
+    square[top:top + h, left:left + w] = glyph * 255
+    small = cv2.resize(square, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA)
+    return small.astype(np.float32).ravel() / 255.0
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    centred = vectors - vectors.mean(axis=-1, keepdims=True)
+    norms = np.linalg.norm(centred, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return centred / norms
+
+
+class TemplateBank:
+    """Glyph templates keyed by character."""
+
+    def __init__(self, samples=None):
+        self.samples = {ch: list(v) for ch, v in (samples or {}).items()}
+        self._matrix = None
+        self._labels = None
+
+    def __len__(self):
+        return sum(len(v) for v in self.samples.values())
+
+    def add(self, char: str, vector: np.ndarray) -> None:
+        bucket = self.samples.setdefault(char, [])
+        bucket.append(np.asarray(vector, dtype=np.float32))
+        del bucket[:-MAX_SAMPLES]
+        self._matrix = None
+
+    def _compiled(self):
+        if self._matrix is None:
+            labels, rows = [], []
+            for ch, vecs in self.samples.items():
+                for v in vecs:
+                    labels.append(ch)
+                    rows.append(v)
+            self._labels = labels
+            self._matrix = _unit(np.stack(rows)) if rows else np.zeros((0, GLYPH_SIZE ** 2))
+        return self._matrix, self._labels
+
+    def classify(self, vectors: np.ndarray):
+        """Return ``(chars, scores)`` for a stack of normalized glyphs."""
+        matrix, labels = self._compiled()
+        sims = _unit(vectors) @ matrix.T
+        best = sims.argmax(axis=1)
+        return [labels[i] for i in best], sims[np.arange(len(best)), best]
+
+    def learn(self, prim: np.ndarray, text: str) -> bool:
+        """Add the glyphs in ``prim`` using ``text`` as the ground truth.
+
+        Returns ``False`` when the number of segmented glyphs does not match
+        the characters in ``text`` and nothing was learned.
+        """
+        chars = [c for c in text if c in GLYPH_CHARS]
+        glyphs = segment(foreground_mask(prim))
+        if not chars or len(glyphs) != len(chars):
+            log.warning(
+                "template capture: %d glyphs for %r, skipping", len(glyphs), text
+            )
+            return False
+        for ch, glyph in zip(chars, glyphs):
+            self.add(ch, normalize_glyph(glyph))
+        return True
+
+    def to_json(self) -> dict:
+        return {
+            "size": GLYPH_SIZE,
+            "glyphs": {
+                ch: [
+                    "".join("1" if p >= 0.5 else "0" for p in v) for v in vecs
+                ]
+                for ch, vecs in self.samples.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TemplateBank":
+        if data.get("size") != GLYPH_SIZE:
+            return cls()
+        return cls({
+            ch: [np.array([float(c) for c in bits], dtype=np.float32) for bits in vecs]
+            for ch, vecs in data.get("glyphs", {}).items()
+        })
+
+
+def load_templates(path: str = TEMPLATE_FILE) -> TemplateBank:
+    if not os.path.exists(path):
+        return TemplateBank()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return TemplateBank.from_json(json.load(f))
+    except (OSError, ValueError):
+        log.warning("Could not read digit templates from %s", path)
+        return TemplateBank()
+
+
+def save_templates(bank: TemplateBank, path: str = TEMPLATE_FILE) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(bank.to_json(), f, indent=2)
+
+
+def read_glyphs(prim: np.ndarray, bank: TemplateBank):
+    """Read ``prim`` with ``bank`` and return ``(text, confidence)``.
+
+    The confidence is the weakest glyph score, so one unclear glyph is enough
+    to reject the whole read.
+    """
+    if cv2 is None or not len(bank):
+        return "", 0.0
+    glyphs = segment(foreground_mask(prim))
+    if not glyphs:
+        return "", 0.0
+    vectors = np.stack([normalize_glyph(g) for g in glyphs])
+    chars, scores = bank.classify(vectors)
+    return "".join(chars), float(scores.min())
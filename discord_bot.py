@@ -7,10 +7,11 @@ import urllib.request
 
 import discord
 from discord.ext import commands
-import pyautogui
 
 from auto_eat import eat_food
+from input_backend import get_input
 from progress_tracker import load_progress
+from session import ScanSession, SessionCallbacks
 
 SETTINGS_FILE = "settings.json"
 
@@ -25,10 +26,20 @@ CHANNEL_ID = os.getenv("DISCORD_CHANNEL_ID")
 
 bot = commands.Bot(command_prefix="!")
 
-# shared lock to prevent simultaneous pyautogui actions
+# shared lock to prevent simultaneous mouse/keyboard actions
 GUI_LOCK = threading.Lock()
 
 
+def _locked(fn, *args):
+    """Run ``fn`` holding ``GUI_LOCK``; called off the event loop."""
+    with GUI_LOCK:
+        return fn(*args)
+
+
+# live scan session started with !startscan
+SESSION = None
+
+
 def build_progress_message(species: str) -> str:
     """Return a formatted breeding progress summary for ``species``."""
     prog = load_progress(SETTINGS.get("current_wipe", "default")).get(species, {})
@@ -60,11 +71,12 @@ def drop_all(settings):
     """Click the configured drop-all button and confirm."""
     bx, by = settings.get("drop_all_button", [0, 0])
     cx, cy = settings.get("drop_all_confirm", [0, 0])
-    pyautogui.moveTo(bx, by)
-    pyautogui.click()
+    mouse = get_input(settings.get("input_backend", "auto"))
+    mouse.moveTo(bx, by)
+    mouse.click()
     time.sleep(0.5)
-    pyautogui.moveTo(cx, cy)
-    pyautogui.click()
+    mouse.moveTo(cx, cy)
+    mouse.click()
 
 
 @bot.event
@@ -75,16 +87,15 @@ async def on_ready():
 @bot.command()
 async def dropall(ctx):
     """Drop all eggs using configured coordinates."""
-    with GUI_LOCK:
-        drop_all(SETTINGS)
+    # waiting for a running scan pass must not stall the event loop
+    await asyncio.to_thread(_locked, drop_all, SETTINGS)
     await ctx.send("🗑 Drop All executed")
 
 
 @bot.command()
 async def eatfood(ctx):
     """Consume food from the configured slots."""
-    with GUI_LOCK:
-        eat_food(SETTINGS)
+    await asyncio.to_thread(_locked, eat_food, SETTINGS)
     await ctx.send("🍗 Ate one food item")
 
 
@@ -95,4 +106,51 @@ async def progress(ctx, *, species: str):
     await ctx.send(msg)
 
 
+class BotCallbacks(SessionCallbacks):
+    """Print session events; new species get the default template."""
+
+    def log(self, msg):
+        print(msg, flush=True)
+
+
+@bot.command()
+async def startscan(ctx, max_eggs: int = None):
+    """Start the live scan loop, optionally stopping after ``max_eggs`` eggs."""
+    global SESSION
+    if SESSION is not None and SESSION.running:
+        await ctx.send("⚠️ Already scanning")
+        return
+    with open("rules.json", "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    # each pass holds GUI_LOCK from its slot click to the settled slot, so
+    # !dropall and !eatfood run between eggs, never inside a click chain
+    SESSION = ScanSession(SETTINGS, rules, BotCallbacks(), SETTINGS_FILE, gui_lock=GUI_LOCK)
+    SESSION.running = True
+    threading.Thread(target=SESSION.run, args=(max_eggs,), daemon=True).start()
+    await ctx.send("▶️ Scanning started")
+
+
+@bot.command()
+async def stopscan(ctx):
+    """Stop the live scan loop after the current egg."""
+    if SESSION is None or not SESSION.running:
+        await ctx.send("Not scanning")
+        return
+    SESSION.stop()
+    await ctx.send("⏹ Scanning will stop after the current egg")
+
+
+@bot.command()
+async def scanstatus(ctx):
+    """Report eggs processed and per-stage timings of the scan loop."""
+    if SESSION is None:
+        await ctx.send("No scan started")
+        return
+    state = "running" if SESSION.running else "stopped"
+    lines = [f"Scan {state}: {SESSION.eggs} eggs"]
+    for stage, stats in SESSION.timing_report().items():
+        lines.append(f"  {stage}: {stats['mean_ms']:.1f} ms avg ({stats['calls']} calls)")
+    await ctx.send("\n".join(lines))
+
+
 bot.run(BOT_TOKEN)
@@ -1,9 +1,7 @@
 import os
 import json
-import time
 import threading
 import subprocess
-import pyautogui
 import keyboard
 import tkinter as tk
 from tkinter import ttk
@@ -11,15 +9,9 @@ from copy import deepcopy
 from utils.dialogs import show_error, show_warning, show_info
 import webbrowser
 
-from scanner import scan_slot
-from breeding_logic import should_keep_egg
-from progress_tracker import (
-    load_progress, save_progress,
-    update_mutation_thresholds,
-    update_stud, update_mutation_stud,
-    increment_female_count, adjust_rules_for_females,
-    normalize_species_name
-)
+from actions import keep_egg, destroy_egg
+from progress_tracker import load_progress
+from session import ScanSession, SessionCallbacks
 
 from tabs.global_tab import build_global_tab
 from tabs.species_tab import build_species_tab
@@ -75,6 +67,25 @@ for species in progress:
         rules[species]["modes"] = list(modes)
 
 # ─── Main GUI ─────────────────────────────────────────────────────
+class EditorCallbacks(SessionCallbacks):
+    """Forward ``ScanSession`` events to the settings editor."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def log(self, msg):
+        self.app.log_message(msg)
+
+    def status(self, state):
+        self.app.update_status(state)
+
+    def new_species(self, species):
+        return prompt_new_species(self.app, species)
+
+    def species_added(self, species):
+        refresh_species_dropdown(self.app)
+
+
 class SettingsEditor(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -240,6 +251,8 @@ class SettingsEditor(tk.Tk):
             self.scanning_paused = not getattr(self, "scanning_paused", False)
         else:
             self.scanning_paused = bool(value)
+        if getattr(self, "session", None) is not None:
+            self.session.paused = self.scanning_paused
         self.log_message("⏸ Paused" if self.scanning_paused else "▶️ Resumed")
         self.update_status("Paused" if self.scanning_paused else "Running")
         if hasattr(self, "btn_pause") and hasattr(self, "btn_resume"):
@@ -256,149 +269,24 @@ class SettingsEditor(tk.Tk):
             self.log_message("⚠️ Already running.")
             return
 
+        self.session = ScanSession(
+            self.settings, self.rules, EditorCallbacks(self), SETTINGS_FILE, RULES_FILE
+        )
         # reset summary each run
-        self._summary = {"studs": [], "mutations": []}
+        self._summary = self.session.summary
         self.live_running = True
         self.scanning_paused = False
-        self.update_status("Running")
 
         def run_loop():
-            self.log_message("▶️ Live scanning started (F8 to run, F9 to pause/resume, ESC to exit)")
-            while self.live_running:
-                if self.scanning_paused:
-                    time.sleep(0.1)
-                    continue
-
-                scan = scan_slot(self.settings)
-                if scan == "no_egg":
-                    self.log_message("→ No egg detected.")
-                    time.sleep(self.settings.get("scan_loop_delay", 0.5))
-                    continue
-
-                egg = scan["species"]
-                stats = scan["stats"]
-                sex = "female" if "female" in egg.lower() else "male"
-                normalized = normalize_species_name(egg)
-
-                config = self.rules.get(normalized)
-                wipe = self.settings.get("current_wipe", "default")
-                progress = load_progress(wipe)
-                new_species = False
-                if config is None:
-                    new_species = True
-                    if self.settings.get("monitored_scan", True):
-                        self.log_message(f"⏸ New species detected: {normalized}")
-                        self.scanning_paused = True
-                        self.update_status("Paused")
-                        cfg = prompt_new_species(self, normalized)
-                        self.scanning_paused = False
-                        self.update_status("Running")
-                        if cfg is None:
-                            cfg = deepcopy(self.settings.get("default_species_template", {}))
-                    else:
-                        cfg = deepcopy(self.settings.get("default_species_template", {}))
-                    modes = set(cfg.get("modes", []))
-                    modes.add("automated")
-                    cfg["modes"] = list(modes)
-                    self.rules[normalized] = cfg
-                    config = cfg
-                    with open(RULES_FILE, "w", encoding="utf-8") as f:
-                        json.dump(self.rules, f, indent=2)
-                    self.log_message(f"✔ Added {normalized} to rules")
-
-                # Step 1: decide keep/destroy
-                decision, reasons = should_keep_egg(
-                    {"egg": egg, "sex": sex, "stats": stats},
-                    config,
-                    progress
-                )
-
-                # Track kept females and adjust rules automatically
-                if decision == "keep" and sex == "female":
-                    count = increment_female_count(egg, progress, sex)
-                    if adjust_rules_for_females(normalized, progress, self.rules, self.settings.get("default_species_template")):
-                        with open(RULES_FILE, "w", encoding="utf-8") as f:
-                            json.dump(self.rules, f, indent=2)
-                        self.log_message(f"⚙ Rules updated for {normalized} (females={count})")
-
-                # Step 2: update thresholds only if mutations rule passed
-                if reasons.get("mutations"):
-                    updated_thresholds = update_mutation_thresholds(
-                        egg, stats, config, progress, sex, wipe
-                    )
-                else:
-                    updated_thresholds = False
-
-                # and only then update stud logic
-                updated_stud = (
-                    update_stud(egg, stats, config, progress, wipe)
-                    if sex == "male"
-                    else False
-                )
-                updated_mstud = (
-                    update_mutation_stud(egg, stats, config, progress)
-                    if sex == "male"
-                    else False
-                )
-
-                # record for summary
-                if updated_thresholds:
-                    curr = progress[normalized]["mutation_thresholds"].copy()
-                    self._summary["mutations"].append((normalized, curr))
-                if updated_stud:
-                    self._summary["studs"].append((normalized, stats))
-
-                # Step 3: save progress & UI feedback
-                scan.update({
-                    "egg": egg,
-                    "sex": sex,
-                    "stats": stats,
-                    "updated_thresholds": updated_thresholds,
-                    "updated_stud": updated_stud,
-                    "updated_mutation_stud": updated_mstud
-                })
-                save_progress(progress, wipe)
-                if new_species:
-                    refresh_species_dropdown(self)
-                # print UI feedback
-                self.log_message(f"→ {egg}: {decision.upper()}")
-                for k, v in reasons.items():
-                    if k != "_debug" and v:
-                        self.log_message(f"  ✔ {k}")
-                debug_cfg = self.settings.get("debug_mode", False)
-                debug_enabled = (
-                    debug_cfg.get("breeding_logic", False)
-                    if isinstance(debug_cfg, dict)
-                    else bool(debug_cfg)
-                )
-                if debug_enabled and "_debug" in reasons:
-                    for k, v in reasons["_debug"].items():
-                        self.log_message(f"    debug[{k}]: {v}")
-
-                if decision == "keep":
-                    pyautogui.doubleClick(self.settings["slot_x"], self.settings["slot_y"])
-                    self.log_message("✔ Egg auto-kept via double-click")
-                else:
-                    x, y = self.settings["slot_x"], self.settings["slot_y"]
-                    dx, dy = self.settings["destroy_offsets"]
-                    dx2, dy2 = self.settings["destroy_this_offsets"]
-                    pyautogui.moveTo(x, y); pyautogui.rightClick()
-                    time.sleep(0.3)
-                    pyautogui.moveTo(x + dx, y + dy)
-                    time.sleep(0.3)
-                    pyautogui.moveTo(x + dx2, y + dy2); pyautogui.click()
-                    self.log_message("✖ Egg destroyed via right-click chain")
-
-                time.sleep(self.settings.get("scan_loop_delay", 0.5))
-
-            self.live_running = False
-            self.log_message("⏹ Scanning stopped.")
-            self.update_status("Stopped")
-            if hasattr(self, "btn_start"):
-                self.btn_start.config(state="normal")
-            if hasattr(self, "btn_pause") and hasattr(self, "btn_resume"):
-                self.btn_pause.config(state="disabled")
-                self.btn_resume.config(state="disabled")
+            try:
+                self.session.run()
+            finally:
+                self.live_running = False
+                if hasattr(self, "btn_start"):
+                    self.btn_start.config(state="normal")
+                if hasattr(self, "btn_pause") and hasattr(self, "btn_resume"):
+                    self.btn_pause.config(state="disabled")
+                    self.btn_resume.config(state="disabled")
         # pause/resume toggle handled globally
         threading.Thread(target=run_loop, daemon=True).start()
         keyboard.add_hotkey("f9", self.toggle_pause)
@@ -410,25 +298,20 @@ class SettingsEditor(tk.Tk):
 
     def keep_egg(self):
         """Button: force KEEP via real logic."""
-        pyautogui.doubleClick(self.settings["slot_x"], self.settings["slot_y"])
-        self.log_message("✔ KEEP action invoked")
+        ok = keep_egg(self.settings)
+        self.log_message("✔ KEEP action invoked" if ok else "⚠ KEEP not confirmed")
 
     def destroy_egg(self):
         """Button: force DESTROY via real logic."""
-        x, y = self.settings["slot_x"], self.settings["slot_y"]
-        dx, dy = self.settings["destroy_offsets"]
-        dx2, dy2 = self.settings["destroy_this_offsets"]
-        pyautogui.moveTo(x, y); pyautogui.rightClick()
-        time.sleep(0.3)
-        pyautogui.moveTo(x + dx, y + dy)
-        time.sleep(0.3)
-        pyautogui.moveTo(x + dx2, y + dy2); pyautogui.click()
-        self.log_message("✖ DESTROY action invoked")
+        ok = destroy_egg(self.settings)
+        self.log_message("✖ DESTROY action invoked" if ok else "⚠ DESTROY not confirmed")
 
     def quit(self):
         """On ESC: write summary.log then close."""
         self.log_message("🛑 ESC pressed — quitting application.")
         self.update_status("Stopped")
+        if getattr(self, "session", None) is not None:
+            self.session.stop()
         self.save_geometry()
         with open("summary.log", "w", encoding="utf-8") as f:
             f.write("=== STUDS UPDATED (tracked only) ===\n")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Mouse/keyboard backends behind one small pyautogui-style interface.
+
+Every ``pyautogui`` call pays its global ``PAUSE`` (0.1s by default) plus
+fail-safe checks, and an egg costs five or more of them.  The backends here
+expose the handful of calls the bot needs (``moveTo``, ``click``,
+``rightClick``, ``doubleClick``, ``press``, ``onScreen``) without implicit
+pauses:
+
+* ``XTestInput`` injects events straight through the X11 XTest extension;
+* ``PyAutoGUIInput`` still uses pyautogui, but with ``_pause=False``;
+* ``RecordingInput`` performs nothing and records every call, for tests.
+
+Each backend keeps per-call latency counters (``latency_stats()``).
+"""
+import ctypes
+import ctypes.util
+from abc import ABC, abstractmethod
+import os
+import threading
+import time
+
+from logger import get_logger
+log = get_logger("input_backend")
+
+BUTTONS = {"left": 1, "middle": 2, "right": 3}
+# pyautogui key names that differ from X keysym names
+KEYSYMS = {
+    "esc": "Escape",
+    "escape": "Escape",
+    "enter": "Return",
+    "return": "Return",
+    "tab": "Tab",
+    "space": "space",
+    "backspace": "BackSpace",
+    "shift": "Shift_L",
+    "ctrl": "Control_L",
+    "alt": "Alt_L",
+}
+
+
+class InputBackend(ABC):
+    """Shared click/key logic and latency bookkeeping.
+
+    Subclasses must provide the primitives ``_move``, ``_button``, ``_key``
+    and ``size``.  Each public method holds a lock, so the events of one
+    call (a double click, a key press) never interleave with another
+    thread's; chains of calls need a lock of their own.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # op -> [calls, total seconds]
+        self.latency = {}
+
+    # ─── primitives ─────────────────────────────────
+    @abstractmethod
+    def _move(self, x: int, y: int) -> None:
+        """Move the pointer to ``(x, y)``."""
+
+    @abstractmethod
+    def _button(self, button: str, down: bool) -> None:
+        """Press or release ``button``."""
+
+    @abstractmethod
+    def _key(self, key: str, down: bool) -> None:
+        """Press or release ``key``."""
+
+    def _flush(self) -> None:
+        pass
+
+    @abstractmethod
+    def size(self):
+        """Screen ``(width, height)``."""
+
+    def close(self) -> None:
+        pass
+
+    # ─── public API ─────────────────────────────────
+    def _record(self, op: str, args: tuple, start: float) -> None:
+        entry = self.latency.setdefault(op, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+
+    def onScreen(self, x, y) -> bool:
+        w, h = self.size()
+        return 0 <= x < w and 0 <= y < h
+
+    def moveTo(self, x, y) -> None:
+        start = time.perf_counter()
+        with self._lock:
+            self._move(int(x), int(y))
+            self._flush()
+        self._record("moveTo", (x, y), start)
+
+    def click(self, x=None, y=None, clicks=1, interval=0.0, button="left", _op="click"):
+        start = time.perf_counter()
+        with self._lock:
+            if x is not None and y is not None:
+                self._move(int(x), int(y))
+            for i in range(clicks):
+                if i and interval:
+                    self._flush()
+                    time.sleep(interval)
+                self._button(button, True)
+                self._button(button, False)
+            self._flush()
+        self._record(_op, (x, y), start)
+
+    def rightClick(self, x=None, y=None) -> None:
+        self.click(x, y, button="right", _op="rightClick")
+
+    def doubleClick(self, x=None, y=None, interval=0.0) -> None:
+        self.click(x, y, clicks=2, interval=interval, _op="doubleClick")
+
+    def press(self, key: str) -> None:
+        start = time.perf_counter()
+        with self._lock:
+            self._key(key, True)
+            self._key(key, False)
+            self._flush()
+        self._record("press", (key,), start)
+
+    def latency_stats(self) -> dict:
+        """``{op: {"calls": n, "mean_ms": ms}}`` for every call made so far."""
+        return {
+            op: {"calls": n, "mean_ms": total * 1000 / n}
+            for op, (n, total) in self.latency.items()
+        }
+
+
+class PyAutoGUIInput(InputBackend):
+    """pyautogui without its global ``PAUSE`` after every call."""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        super().__init__()
+        import pyautogui
+        self._gui = pyautogui
+
+    def _move(self, x, y):
+        self._gui.moveTo(x, y, _pause=False)
+
+    def _button(self, button, down):
+        (self._gui.mouseDown if down else self._gui.mouseUp)(button=button, _pause=False)
+
+    def _key(self, key, down):
+        (self._gui.keyDown if down else self._gui.keyUp)(key, _pause=False)
+
+    def size(self):
+        return tuple(self._gui.size())
+
+    def onScreen(self, x, y) -> bool:
+        return self._gui.onScreen(x, y)
+
+
+class XTestInput(InputBackend):
+    """Synthetic X11 events via the XTest extension; no pauses, no polling."""
+
+    name = "xtest"
+
+    def __init__(self):
+        super().__init__()
+        x11 = ctypes.util.find_library("X11")
+        xtst = ctypes.util.find_library("Xtst")
+        if not x11 or not xtst or not os.environ.get("DISPLAY"):
+            raise OSError("XTest input unavailable")
+        self._x11 = ctypes.CDLL(x11)
+        self._xtst = ctypes.CDLL(xtst)
+        self._declare()
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        dummy = ctypes.c_int()
+        if not self._xtst.XTestQueryExtension(
+            self._display, *(ctypes.byref(dummy) for _ in range(4))
+        ):
+            self._x11.XCloseDisplay(self._display)
+            raise OSError("X server lacks the XTEST extension")
+        screen = self._x11.XDefaultScreen(self._display)
+        self._size = (
+            self._x11.XDisplayWidth(self._display, screen),
+            self._x11.XDisplayHeight(self._display, screen),
+        )
+        self._keycodes = {}
+
+    def _declare(self):
+        c = ctypes
+        x11, xtst = self._x11, self._xtst
+        x11.XOpenDisplay.restype = c.c_void_p
+        x11.XOpenDisplay.argtypes = [c.c_char_p]
+        x11.XCloseDisplay.argtypes = [c.c_void_p]
+        x11.XFlush.argtypes = [c.c_void_p]
+        x11.XDefaultScreen.argtypes = [c.c_void_p]
+        x11.XDisplayWidth.argtypes = [c.c_void_p, c.c_int]
+        x11.XDisplayHeight.argtypes = [c.c_void_p, c.c_int]
+        x11.XStringToKeysym.restype = c.c_ulong
+        x11.XStringToKeysym.argtypes = [c.c_char_p]
+        x11.XKeysymToKeycode.restype = c.c_ubyte
+        x11.XKeysymToKeycode.argtypes = [c.c_void_p, c.c_ulong]
+        xtst.XTestQueryExtension.argtypes = [c.c_void_p] + [c.POINTER(c.c_int)] * 4
+        xtst.XTestFakeMotionEvent.argtypes = [c.c_void_p, c.c_int, c.c_int, c.c_int, c.c_ulong]
+        xtst.XTestFakeButtonEvent.argtypes = [c.c_void_p, c.c_uint, c.c_int, c.c_ulong]
+        xtst.XTestFakeKeyEvent.argtypes = [c.c_void_p, c.c_uint, c.c_int, c.c_ulong]
+
+    def _move(self, x, y):
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+
+    def _button(self, button, down):
+        self._xtst.XTestFakeButtonEvent(self._display, BUTTONS[button], int(down), 0)
+
+    def _keycode(self, key: str) -> int:
+        code = self._keycodes.get(key)
+        if code is None:
+            name = KEYSYMS.get(key.lower(), key)
+            if name[:1] in "fF" and name[1:].isdigit():
+                name = name.upper()  # "f9" → "F9"
+            sym = self._x11.XStringToKeysym(name.encode())
+            code = self._x11.XKeysymToKeycode(self._display, sym) if sym else 0
+            if not code:
+                raise ValueError(f"unknown key {key!r}")
+            self._keycodes[key] = code
+        return code
+
+    def _key(self, key, down):
+        self._xtst.XTestFakeKeyEvent(self._display, self._keycode(key), int(down), 0)
+
+    def _flush(self):
+        self._x11.XFlush(self._display)
+
+    def size(self):
+        return self._size
+
+    def close(self):
+        if self._display:
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+class RecordingInput(InputBackend):
+    """No-op backend recording ``(op, args)`` for every public call."""
+
+    name = "recording"
+
+    def __init__(self, screen=(1920, 1080)):
+        super().__init__()
+        self._size = screen
+        self.calls = []
+
+    def _move(self, x, y):
+        pass
+
+    def _button(self, button, down):
+        pass
+
+    def _key(self, key, down):
+        pass
+
+    def size(self):
+        return self._size
+
+    def _record(self, op, args, start):
+        self.calls.append((op, args))
+        super()._record(op, args, start)
+
+
+INPUT_BACKENDS = {"xtest": XTestInput, "pyautogui": PyAutoGUIInput, "recording": RecordingInput}
+_inputs = {}
+
+
+def get_input(name: str = "auto") -> InputBackend:
+    """Return a cached input backend.
+
+    ``"auto"`` tries XTest first and falls back to pyautogui when it is
+    unavailable (e.g. on Windows or without ``$DISPLAY``).
+    """
+    if name in _inputs:
+        return _inputs[name]
+    order = ["xtest", "pyautogui"] if name == "auto" else [name, "pyautogui"]
+    for candidate in order:
+        try:
+            backend = INPUT_BACKENDS[candidate]()
+        except Exception as e:
+            log.debug("input backend %s unavailable: %s", candidate, e)
+            continue
+        log.info("Input backend: %s", backend.name)
+        _inputs[name] = backend
+        return backend
+    raise RuntimeError("No input backend available")
+
+
+def close_inputs() -> None:
+    """Log per-call latencies and release display connections."""
+    for backend in set(_inputs.values()):
+        if backend.latency:
+            log.info("%s input latency: %r", backend.name, backend.latency_stats())
+        backend.close()
+    _inputs.clear()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Per-species plausibility checks for scanned stats.
+
+``scanner.is_invalid`` only catches bases above 99, so a dropped digit (45
+read as 4) goes straight into the keep/destroy decision.  The model below is
+learned from a wipe's ``breeding_progress.json`` and ``progress_history.json``:
+every stat gets an expected base range around its recorded top stat and every
+species a limit on mutation counts.  Stats outside those bounds are only
+*suspicious* – the scanner re-reads them instead of trusting the first read.
+
+The model is built once per wipe and then kept current from the history
+entries ``record_history`` reports, so the scan loop never re-reads the wipe
+files.  Edits made outside the loop (species tab, another process) are picked
+up by a rebuild in a background thread, at most once per ``RELOAD_INTERVAL``.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+from logger import get_logger
+log = get_logger("plausibility")
+
+from progress_tracker import (
+    add_history_observer,
+    get_history_file,
+    get_progress_file,
+    normalize_species_name,
+)
+
+# allowed rise over the current top stat (one mutation is +2 levels)
+TOP_MARGIN = 4
+# bases below (lowest recorded top // LOW_DIVISOR) look like a dropped digit
+LOW_DIVISOR = 2
+# lower bounds only apply once the recorded tops are at least this high
+MIN_LOW_TOP = 10
+# allowed rise over the highest recorded mutation count
+MUTATION_MARGIN = 3
+# seconds between checks whether the wipe files changed outside the loop
+RELOAD_INTERVAL = 60.0
+
+
+class PlausibilityModel:
+    """Expected base ranges and mutation limits keyed by species."""
+
+    def __init__(self, ranges=None, mutation_limits=None):
+        # {species: {stat: (low, high)}}
+        self.ranges = ranges or {}
+        # {species: {stat: limit}}; the "*" entry applies to unlisted stats
+        self.mutation_limits = mutation_limits or {}
+        # recorded values behind the bounds: {species: {stat: sorted tops}}
+        # and {species: {stat: highest mutation count}}
+        self._tops = {}
+        self._muts = {}
+
+    @classmethod
+    def from_progress(cls, progress: dict, history: dict) -> "PlausibilityModel":
+        model = cls()
+        for species in set(progress) | set(history):
+            data = progress.get(species, {})
+            hist = history.get(species, {})
+            for category in ("top_stats", "mutation_thresholds"):
+                for stat, value in data.get(category, {}).items():
+                    model.observe(species, category, stat, value)
+                for stat, entries in hist.get(category, {}).items():
+                    for e in entries:
+                        model.observe(species, category, stat, e["value"])
+        return model
+
+    def observe(self, species: str, category: str, stat: str, value: int) -> None:
+        """Widen the bounds of ``species`` by one recorded value."""
+        if category == "top_stats":
+            values = self._tops.setdefault(species, {}).setdefault(stat, [])
+            bisect.insort(values, value)
+            if values[-1] <= 0:
+                return
+            step = max((b - a for a, b in zip(values, values[1:])), default=0)
+            high = min(99, values[-1] + max(TOP_MARGIN, step))
+            low = values[0] // LOW_DIVISOR if values[0] >= MIN_LOW_TOP else 0
+            self.ranges.setdefault(species, {})[stat] = (low, high)
+        elif category == "mutation_thresholds":
+            muts = self._muts.setdefault(species, {})
+            muts[stat] = max(muts.get(stat, 0), value)
+            stat_limits = {st: v + MUTATION_MARGIN for st, v in muts.items()}
+            stat_limits["*"] = max(stat_limits.values())
+            self.mutation_limits[species] = stat_limits
+
+    def suspicious(self, species: str, stats: dict) -> list:
+        """Return the stats of a scan that fall outside the learned bounds."""
+        ranges = self.ranges.get(species, {})
+        limits = self.mutation_limits.get(species, {})
+        flagged = []
+        for stat, v in stats.items():
+            base, mut = v.get("base"), v.get("mutation")
+            low, high = ranges.get(stat, (0, 99))
+            limit = limits.get(stat, limits.get("*"))
+            if base is not None and not low <= base <= high:
+                log.debug("%s %s base %r outside %d-%d", species, stat, base, low, high)
+                flagged.append(stat)
+            elif limit is not None and mut is not None and mut > limit:
+                log.debug("%s %s mutations %r above %d", species, stat, mut, limit)
+                flagged.append(stat)
+        return flagged
+
+
+def _read_json(path: str) -> dict:
+    """Contents of a wipe file, without creating or repairing it."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _stamp(wipe: str) -> tuple:
+    return (_mtime(get_progress_file(wipe)), _mtime(get_history_file(wipe)))
+
+
+def _build(wipe: str) -> PlausibilityModel:
+    model = PlausibilityModel.from_progress(
+        _read_json(get_progress_file(wipe)), _read_json(get_history_file(wipe))
+    )
+    log.debug("plausibility model for %s covers %d species", wipe, len(model.ranges))
+    return model
+
+
+class _WipeModel:
+    """The model of one wipe plus its reload bookkeeping."""
+
+    def __init__(self, wipe: str):
+        self.stamp = _stamp(wipe)
+        self.model = _build(wipe)
+        self.checked = time.monotonic()
+        # entries observed while a rebuild reads the files; replayed onto it
+        self.pending = None
+        self.thread = None
+
+
+_models = {}
+_lock = threading.Lock()
+
+
+def _rebuild(wipe: str, state: _WipeModel, stamp: tuple) -> None:
+    try:
+        model = _build(wipe)
+        with _lock:
+            # values observed meanwhile may not have reached the files yet;
+            # observing a value twice does not change the bounds
+            for entry in state.pending:
+                model.observe(*entry)
+            state.model, state.stamp = model, stamp
+    except Exception as e:
+        # keep the current model; the next check tries again
+        log.error("Plausibility model for %s could not be rebuilt: %s", wipe, e)
+    finally:
+        with _lock:
+            state.pending = None
+
+
+def observe_history(entry, wipe: str = "default") -> None:
+    """History observer keeping the cached model of ``wipe`` current."""
+    species, category, stat, value = entry[:4]
+    with _lock:
+        state = _models.get(wipe)
+        if state is None:
+            return
+        state.model.observe(species, category, stat, value)
+        if state.pending is not None:
+            state.pending.append((species, category, stat, value))
+
+
+add_history_observer(observe_history)
+
+
+def get_model(wipe: str = "default") -> PlausibilityModel:
+    """Return the model for ``wipe``.
+
+    The first call reads the wipe files; later calls only check their
+    modification times every ``RELOAD_INTERVAL`` seconds and rebuild in the
+    background when they changed.
+    """
+    with _lock:
+        state = _models.get(wipe)
+        if state is None:
+            state = _models[wipe] = _WipeModel(wipe)
+            return state.model
+        now = time.monotonic()
+        if state.pending is None and now - state.checked >= RELOAD_INTERVAL:
+            state.checked = now
+            stamp = _stamp(wipe)
+            if stamp != state.stamp:
+                state.pending = []
+                state.thread = threading.Thread(
+                    target=_rebuild, args=(wipe, state, stamp),
+                    name="plausibility-reload", daemon=True,
+                )
+                state.thread.start()
+        return state.model
+
+
+def suspicious_stats(scan: dict, wipe: str = "default") -> list:
+    """Stats in ``scan`` that the ``wipe`` model considers implausible."""
+    species = normalize_species_name(scan["species"])
+    return get_model(wipe).suspicious(species, scan["stats"])
@@ -6,14 +6,20 @@ import os
 import re
 import time
 from copy import deepcopy
-from difflib import get_close_matches
+
+from species_lexicon import get_resolver
 
 HISTORY_FILE = "progress_history.json"
+# one JSON object per scanned egg, replayed by simulator.py
+SCAN_LOG_FILE = "scan_log.jsonl"
 
 PROGRESS_FILE = "breeding_progress.json"
 WIPE_DIR = "wipes"
 RULES_FILE = "rules.json"
 
+# female counts where automated species move on to top-stat females / war
+AUTOMATED_THRESHOLDS = (5, 96)
+
 # default container for progress tracking per species
 DEFAULT_PROGRESS_TEMPLATE = {
     "top_stats": {},
@@ -35,6 +41,11 @@ def get_history_file(wipe: str = "default") -> str:
     return os.path.join(WIPE_DIR, wipe, HISTORY_FILE)
 
 
+def get_scan_log_file(wipe: str = "default") -> str:
+    """Return the recorded scan stream path for a given wipe."""
+    return os.path.join(WIPE_DIR, wipe, SCAN_LOG_FILE)
+
+
 def ensure_wipe_dir(wipe: str = "default") -> None:
     """Create wipe directory and empty files if missing."""
     os.makedirs(os.path.join(WIPE_DIR, wipe), exist_ok=True)
@@ -85,18 +96,89 @@ def save_history(hist, wipe: str = "default"):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(hist, f, indent=2)
 
-def record_history(species: str, category: str, stat: str, value: int, wipe: str = "default") -> None:
+# callable(entry, wipe) taking history entries instead of writing them;
+# installed by ``set_history_sink`` so a background writer can batch them
+_history_sink = None
+
+
+# callables(entry, wipe) told about every history entry, e.g. the plausibility model
+_history_observers = []
+
+
+def add_history_observer(observer) -> None:
+    if observer not in _history_observers:
+        _history_observers.append(observer)
+
+
+def set_history_sink(sink):
+    """Route ``record_history`` entries to ``sink``; returns the previous sink."""
+    global _history_sink
+    previous, _history_sink = _history_sink, sink
+    return previous
+
+def append_history(entries, wipe: str = "default") -> None:
+    """Append ``(species, category, stat, value, ts)`` entries with one load and save."""
     hist = load_history(wipe)
-    species_hist = hist.setdefault(species, {"top_stats": {}, "mutation_thresholds": {}})
-    cat_hist = species_hist.setdefault(category, {}).setdefault(stat, [])
-    cat_hist.append({"ts": int(time.time()), "value": value})
+    for species, category, stat, value, ts in entries:
+        species_hist = hist.setdefault(species, {"top_stats": {}, "mutation_thresholds": {}})
+        cat_hist = species_hist.setdefault(category, {}).setdefault(stat, [])
+        cat_hist.append({"ts": ts, "value": value})
     save_history(hist, wipe)
 
+def append_scan_log(records, wipe: str = "default") -> None:
+    """Append scan records (see ``scan_record``) to the wipe's scan log."""
+    ensure_wipe_dir(wipe)
+    with open(get_scan_log_file(wipe), "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+def scan_record(egg, species, sex, stats, ts=None) -> dict:
+    """Compact form of one scanned egg: stats as ``[base, mutation]`` pairs."""
+    return {
+        "ts": round(time.time() if ts is None else ts, 3),
+        "egg": egg,
+        "species": species,
+        "sex": sex,
+        "stats": {
+            stat: [v.get("base", 0), v.get("mutation", 0)] for stat, v in stats.items()
+        },
+    }
+
+def record_history(species: str, category: str, stat: str, value: int, wipe: str = "default") -> None:
+    entry = (species, category, stat, value, int(time.time()))
+    for observer in _history_observers:
+        observer(entry, wipe)
+    if _history_sink is not None:
+        _history_sink(entry, wipe)
+        return
+    append_history([entry], wipe)
+
+def _history_recorder(sink):
+    """``record_history``, or a stand-in handing entries to ``sink`` only.
+
+    The update functions take a ``sink`` so a caller such as the simulator
+    keeps its entries away from the installed sink and the observers.
+    """
+    if sink is None:
+        return record_history
+
+    def record(species, category, stat, value, wipe="default"):
+        sink((species, category, stat, value, int(time.time())), wipe)
+    return record
+
 def normalize_species_name(raw_name):
     """
     1) Strip off gender, CS prefix, parens, punctuation
     2) Fuzzy‐match the cleaned name against rules.json keys (if within ~20%)
+
+    Matching goes through the cached ``species_lexicon`` resolver, which is
+    rebuilt only when rules.json changes and remembers raw names it has seen.
     """
+    resolver = get_resolver(RULES_FILE)
+    known = resolver.resolved.get(raw_name)
+    if known is not None:
+        return known
+
     # ─── Basic cleaning ─────────────────────────────
     parts = re.sub(r"\(.*?\)", "", raw_name)
     parts = re.sub(r"\b(male|female)\b", "", parts, flags=re.IGNORECASE)
@@ -104,21 +186,14 @@ def normalize_species_name(raw_name):
     cleaned = re.sub(r"[^\w\s]", "", parts).strip()
 
     # ─── Fuzzy match to existing species keys ───────
-    try:
-        with open(RULES_FILE, "r", encoding="utf-8") as f:
-            rules = json.load(f)
-        candidates = list(rules.keys())
-        # cutoff=0.8 catches up to ~2–3 char differences
-        matches = get_close_matches(cleaned, candidates, n=1, cutoff=0.8)
-        if matches:
-            return matches[0]
-    except Exception:
-        pass
-
-    return cleaned
-
-def update_top_stats(egg, scan_stats, progress, wipe: str = "default"):
-    s = normalize_species_name(egg)
+    # cutoff=0.8 catches up to ~2–3 char differences
+    species = resolver.match(cleaned) or cleaned
+    resolver.remember(raw_name, species)
+    return species
+
+def update_top_stats(egg, scan_stats, progress, wipe: str = "default", species=None, sink=None):
+    s = species or normalize_species_name(egg)
+    record = _history_recorder(sink)
     updated = False
     log.debug(f"Evaluating top stats for {s}")
     ensure_species(progress, s)
@@ -131,15 +206,17 @@ def update_top_stats(egg, scan_stats, progress, wipe: str = "default"):
         if base > current:
             log.info(f"New top stat for {stat}: {base} (was {current})")
             progress[s]["top_stats"][stat] = base
-            record_history(s, "top_stats", stat, base, wipe)
+            record(s, "top_stats", stat, base, wipe)
             updated = True
 
     return updated
 
-def update_mutation_thresholds(egg, scan_stats, config, progress, sex, wipe: str = "default"):
+def update_mutation_thresholds(egg, scan_stats, config, progress, sex, wipe: str = "default",
+                               species=None, sink=None):
     if sex != "male":
         return False
-    s = normalize_species_name(egg)
+    s = species or normalize_species_name(egg)
+    record = _history_recorder(sink)
     updated = False
     log.debug(f"Evaluating mutation thresholds for {s}")
     ensure_species(progress, s)
@@ -153,13 +230,14 @@ def update_mutation_thresholds(egg, scan_stats, config, progress, sex, wipe: str
         if mut > current:
             log.info(f"New threshold for {stat}: {mut} (was {current})")
             progress[s]["mutation_thresholds"][stat] = mut
-            record_history(s, "mutation_thresholds", stat, mut, wipe)
+            record(s, "mutation_thresholds", stat, mut, wipe)
             updated = True
 
     return updated
 
-def update_stud(egg, scan_stats, config, progress, wipe: str = "default"):
-    s = normalize_species_name(egg)
+def update_stud(egg, scan_stats, config, progress, wipe: str = "default", species=None, sink=None):
+    s = species or normalize_species_name(egg)
+    record = _history_recorder(sink)
     ensure_species(progress, s)
 
     merge_stats = config.get("stat_merge_stats", [])
@@ -203,14 +281,14 @@ def update_stud(egg, scan_stats, config, progress, wipe: str = "default"):
             stat: val for stat, val in new_stud.items() if val > 0
         }
         for stat, val in progress[s]["top_stats"].items():
-            record_history(s, "top_stats", stat, val, wipe)
+            record(s, "top_stats", stat, val, wipe)
         return True
 
     return False
 
-def update_mutation_stud(egg, scan_stats, config, progress):
+def update_mutation_stud(egg, scan_stats, config, progress, species=None):
     """Update mutation stud bases when mutations equal thresholds."""
-    s = normalize_species_name(egg)
+    s = species or normalize_species_name(egg)
     ensure_species(progress, s)
 
     mutation_stats = config.get("mutation_stats", [])
@@ -232,27 +310,32 @@ def update_mutation_stud(egg, scan_stats, config, progress):
 
     return updated
 
-def increment_female_count(egg, progress, sex):
+def increment_female_count(egg, progress, sex, species=None):
     """Increment female count for a species if sex is female."""
     if sex != "female":
         return 0
-    s = normalize_species_name(egg)
+    s = species or normalize_species_name(egg)
     ensure_species(progress, s)
     progress[s]["female_count"] += 1
     log.info(f"Female count for {s} is now {progress[s]['female_count']}")
     return progress[s]["female_count"]
 
 
-def apply_automated_modes(female_count, modes):
-    """Return mode set adjusted for automated breeding rules."""
+def apply_automated_modes(female_count, modes, thresholds=AUTOMATED_THRESHOLDS):
+    """Return mode set adjusted for automated breeding rules.
+
+    ``thresholds`` are the female counts at which automated species switch
+    from all females to top-stat females, and from that to war only.
+    """
     modes = set(modes)
     if "automated" not in modes:
         return modes
 
-    if female_count < 5:
+    all_females_until, war_from = thresholds
+    if female_count < all_females_until:
         modes.update({"mutations", "stat_merge", "all_females"})
         modes.discard("top_stat_females")
-    elif female_count < 96:
+    elif female_count < war_from:
         modes.update({"mutations", "stat_merge", "top_stat_females"})
         modes.discard("all_females")
     else:
@@ -260,7 +343,8 @@ def apply_automated_modes(female_count, modes):
 
     return modes
 
-def adjust_rules_for_females(species, progress, rules, default_template=None):
+def adjust_rules_for_females(species, progress, rules, default_template=None,
+                             thresholds=AUTOMATED_THRESHOLDS):
     """Adjust breeding rules based on female counts."""
     if species not in rules:
         if default_template:
@@ -270,13 +354,14 @@ def adjust_rules_for_females(species, progress, rules, default_template=None):
         modes = set(rules[species].get("modes", []))
         modes.add("automated")
         rules[species]["modes"] = list(modes)
+        get_resolver(RULES_FILE).add(species)
 
     ensure_species(progress, species)
     count = progress[species].get("female_count", 0)
     modes = set(rules[species].get("modes", []))
     before = modes.copy()
 
-    modes = apply_automated_modes(count, modes)
+    modes = apply_automated_modes(count, modes, thresholds)
 
     if modes != before:
         rules[species]["modes"] = list(modes)
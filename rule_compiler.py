@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Per-species rules compiled into a compact keep/destroy evaluator.
+
+``breeding_logic.should_keep_egg`` re-derives the enabled modes, walks nested
+``.get`` chains and builds reason strings for every egg.  ``compile_rules``
+does that work once per species: stats become positions in a fixed order,
+thresholds and stud values become tuples and the enabled modes a bitmask.
+``CompiledRules.evaluate`` then only compares numbers, and
+``evaluate_batch`` does the same comparisons over NumPy arrays of many eggs
+(``breeding_logic.decide_batch``).
+
+Compiled evaluators are cached per species and rebuilt when a fingerprint of
+the species' rules entry or progress entry changes, so edits from the GUI,
+``adjust_rules_for_females`` or the ``update_*`` functions are picked up on
+the next egg.  ``should_keep_egg`` stays the reference implementation; the
+tests check both agree.
+"""
+import numpy as np
+
+from progress_tracker import AUTOMATED_THRESHOLDS, apply_automated_modes
+
+# column order of the stat vectors; matches the popup's stat rows
+STAT_ORDER = ("health", "stamina", "weight", "melee", "food", "oxygen")
+# result keys of should_keep_egg, in order
+MODES = ("mutations", "all_females", "stat_merge", "top_stat_females", "war")
+MODE_BITS = {mode: 1 << i for i, mode in enumerate(MODES)}
+MUTATIONS, ALL_FEMALES, STAT_MERGE, TOP_STAT_FEMALES, WAR = (MODE_BITS[m] for m in MODES)
+FEMALE_MODES = ALL_FEMALES | TOP_STAT_FEMALES | WAR
+RULE_STATS = ("mutation_stats", "stat_merge_stats", "top_stat_females_stats", "war_stats")
+PROGRESS_STATS = ("top_stats", "mutation_thresholds", "stud", "mutation_stud")
+
+
+def modes_mask(modes) -> int:
+    mask = 0
+    for mode in modes:
+        mask |= MODE_BITS.get(mode, 0)
+    return mask
+
+
+def modes_from_mask(mask: int) -> list:
+    return [mode for mode in MODES if mask & MODE_BITS[mode]]
+
+
+class CompiledRules:
+    """Thresholds of one species, laid out for ``evaluate``."""
+
+    __slots__ = (
+        "species", "order", "index", "enabled",
+        "mut_idx", "mut_thresh", "mut_stud",
+        "merge_idx", "merge_top", "merge_stud", "has_stud", "stud_count",
+        "tsf_idx", "tsf_stud",
+        "war_idx", "war_top", "war_thresh",
+    )
+
+    def __init__(self, species: str, rules: dict, entry: dict,
+                 thresholds=AUTOMATED_THRESHOLDS):
+        self.species = species
+        # stats named in the rules but missing from STAT_ORDER go at the end
+        extra = []
+        for key in RULE_STATS:
+            for stat in rules.get(key, []):
+                if stat not in STAT_ORDER and stat not in extra:
+                    extra.append(stat)
+        self.order = STAT_ORDER + tuple(extra)
+        self.index = {stat: i for i, stat in enumerate(self.order)}
+
+        enabled = set(rules.get("modes", []))
+        # mutations and stat_merge are always active
+        enabled.update({"mutations", "stat_merge"})
+        enabled = apply_automated_modes(entry.get("female_count", 0), enabled, thresholds)
+        self.enabled = modes_mask(enabled)
+
+        top = entry.get("top_stats", {})
+        mut_thresholds = entry.get("mutation_thresholds", {})
+        stud = entry.get("stud", {})
+        mutation_stud = entry.get("mutation_stud", {})
+
+        tracked = rules.get("mutation_stats", [])
+        self.mut_idx = tuple(self.index[st] for st in tracked)
+        self.mut_thresh = tuple(mut_thresholds.get(st, 0) for st in tracked)
+        self.mut_stud = tuple(mutation_stud.get(st, 0) for st in tracked)
+
+        tracked = rules.get("stat_merge_stats", [])
+        self.merge_idx = tuple(self.index[st] for st in tracked)
+        self.merge_top = tuple(top.get(st, 0) for st in tracked)
+        self.merge_stud = tuple(stud.get(st, 0) for st in tracked)
+        self.has_stud = bool(stud)
+        self.stud_count = sum(s >= t for s, t in zip(self.merge_stud, self.merge_top))
+
+        tracked = rules.get("top_stat_females_stats", [])
+        self.tsf_idx = tuple(self.index[st] for st in tracked)
+        self.tsf_stud = tuple(stud.get(st, 0) for st in tracked)
+
+        tracked = rules.get("war_stats", [])
+        self.war_idx = tuple(self.index[st] for st in tracked)
+        self.war_top = tuple(top.get(st, 0) for st in tracked)
+        self.war_thresh = tuple(mut_thresholds.get(st, 0) for st in tracked)
+
+    def vectors(self, stats: dict):
+        """``(bases, mutations)`` of a scan's stats dict in ``order``."""
+        bases = [stats.get(st, {}).get("base", 0) for st in self.order]
+        muts = [stats.get(st, {}).get("mutation", 0) for st in self.order]
+        return bases, muts
+
+    def evaluate(self, bases, muts, female: bool, updated_stud: bool = False) -> int:
+        """Bitmask of the modes this egg passes; zero means destroy."""
+        enabled = self.enabled
+        passed = 0
+        if female:
+            if not enabled & FEMALE_MODES:
+                return 0
+            if enabled & ALL_FEMALES:
+                passed |= ALL_FEMALES
+            if enabled & TOP_STAT_FEMALES and self.tsf_idx and all(
+                bases[i] >= s for i, s in zip(self.tsf_idx, self.tsf_stud)
+            ):
+                passed |= TOP_STAT_FEMALES
+        else:
+            if enabled & MUTATIONS:
+                ok = True
+                better = False
+                for i, th, stud in zip(self.mut_idx, self.mut_thresh, self.mut_stud):
+                    m = muts[i]
+                    if m < th:
+                        ok = False
+                        break
+                    if m > th or bases[i] > stud:
+                        better = True
+                if ok and better:
+                    passed |= MUTATIONS
+            if enabled & STAT_MERGE:
+                if updated_stud:
+                    passed |= STAT_MERGE
+                else:
+                    matches = sum(bases[i] >= t for i, t in zip(self.merge_idx, self.merge_top))
+                    if (
+                        (matches > 0 and not self.has_stud)
+                        or matches > self.stud_count
+                        or (matches == self.stud_count and matches > 0 and any(
+                            bases[i] > s for i, s in zip(self.merge_idx, self.merge_stud)
+                        ))
+                    ):
+                        passed |= STAT_MERGE
+        if enabled & WAR and all(
+            bases[i] >= t and muts[i] >= th
+            for i, t, th in zip(self.war_idx, self.war_top, self.war_thresh)
+        ):
+            passed |= WAR
+        return passed
+
+    def evaluate_batch(self, bases, muts, female, updated_stud=None):
+        """``evaluate`` over ``(N, k)`` base/mutation arrays in ``order``.
+
+        ``female`` and ``updated_stud`` are boolean arrays of length N;
+        returns an ``(N,)`` array of mode bitmasks.
+        """
+        enabled = self.enabled
+        female = np.asarray(female, dtype=bool)
+        male = ~female
+        passed = np.zeros(len(female), dtype=np.int64)
+        if enabled & FEMALE_MODES:
+            if enabled & ALL_FEMALES:
+                passed[female] |= ALL_FEMALES
+            if enabled & TOP_STAT_FEMALES and self.tsf_idx:
+                ok = (bases[:, list(self.tsf_idx)] >= np.array(self.tsf_stud)).all(axis=1)
+                passed[female & ok] |= TOP_STAT_FEMALES
+        if enabled & MUTATIONS:
+            idx = list(self.mut_idx)
+            m, th = muts[:, idx], np.array(self.mut_thresh)
+            ok = (m >= th).all(axis=1)
+            better = (m > th).any(axis=1) | (
+                (m == th) & (bases[:, idx] > np.array(self.mut_stud))
+            ).any(axis=1)
+            passed[male & ok & better] |= MUTATIONS
+        if enabled & STAT_MERGE:
+            idx = list(self.merge_idx)
+            b = bases[:, idx]
+            matches = (b >= np.array(self.merge_top)).sum(axis=1)
+            ok = (
+                (matches > self.stud_count)
+                | ((matches > 0) & (not self.has_stud))
+                | ((matches == self.stud_count) & (matches > 0)
+                   & (b > np.array(self.merge_stud)).any(axis=1))
+            )
+            if updated_stud is not None:
+                ok |= np.asarray(updated_stud, dtype=bool)
+            passed[male & ok] |= STAT_MERGE
+        if enabled & WAR:
+            idx = list(self.war_idx)
+            ok = (
+                (bases[:, idx] >= np.array(self.war_top))
+                & (muts[:, idx] >= np.array(self.war_thresh))
+            ).all(axis=1)
+            passed[ok] |= WAR
+        return passed
+
+
+def fingerprint(rules: dict, entry: dict) -> tuple:
+    """Everything ``CompiledRules`` reads from a rules and a progress entry."""
+    return (
+        tuple(rules.get("modes", ())),
+        *(tuple(rules.get(key, ())) for key in RULE_STATS),
+        entry.get("female_count", 0),
+        *(tuple(entry.get(key, {}).items()) for key in PROGRESS_STATS),
+    )
+
+
+# species -> (fingerprint, CompiledRules)
+_compiled = {}
+
+
+def compile_rules(species: str, rules: dict, progress: dict) -> CompiledRules:
+    """Return the cached evaluator for ``species``, recompiled if its inputs changed."""
+    entry = progress.get(species, {})
+    key = fingerprint(rules, entry)
+    cached = _compiled.get(species)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    compiled = CompiledRules(species, rules, entry)
+    _compiled[species] = (key, compiled)
+    return compiled
+
+
+def clear_compiled() -> None:
+    _compiled.clear()
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
+import ctypes
+import ctypes.util
 import os
 import re
+import threading
 import time
-from collections import Counter
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from logger import get_logger
 log = get_logger("scanner")
@@ -21,12 +25,495 @@ except Exception:  # pragma: no cover - handled via OCR_AVAILABLE
     pytesseract = None
     log.warning("pytesseract not available; scanning disabled.")
 
+try:
+    import tesserocr  # type: ignore
+except Exception:  # optional persistent backend
+    tesserocr = None
+
 import pyautogui
 
-OCR_AVAILABLE = cv2 is not None and pytesseract is not None
+from digit_recognizer import TEMPLATE_FILE, load_templates, read_glyphs
+from species_lexicon import get_lexicon
+from plausibility import suspicious_stats
+from timing import get_delay, record_latency, report_failure
+from input_backend import get_input
+
+OCR_AVAILABLE = cv2 is not None and (pytesseract is not None or tesserocr is not None)
 if not OCR_AVAILABLE:
     log.warning("OCR libraries missing. Scanning features will be unavailable.")
 
+
+def _parse_tess_config(config: str):
+    """Split a Tesseract CLI config string into ``(oem, psm, variables)``."""
+    oem, psm, variables = 3, 3, {}
+    tokens = config.split()
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        if tok == "--oem" and i + 1 < len(tokens):
+            oem = int(tokens[i + 1])
+            i += 1
+        elif tok == "--psm" and i + 1 < len(tokens):
+            psm = int(tokens[i + 1])
+            i += 1
+        elif tok == "-c" and i + 1 < len(tokens):
+            key, _, value = tokens[i + 1].partition("=")
+            variables[key] = value
+            i += 1
+        i += 1
+    return oem, psm, variables
+
+
+class PytesseractEngine:
+    """OCR through the ``tesseract`` binary; one process per call."""
+
+    name = "pytesseract"
+
+    def image_to_string(self, img, config=""):
+        return pytesseract.image_to_string(img, config=config)
+
+    def image_to_data(self, img, config=""):
+        return pytesseract.image_to_data(
+            img, config=config, output_type=pytesseract.Output.DICT
+        )
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine:
+    """In-process OCR through ``tesserocr`` with warm API handles.
+
+    Loading traineddata is the expensive part of a Tesseract call, so one
+    ``PyTessBaseAPI`` is kept per OCR engine mode and reused for the whole
+    session.  Handles are not thread safe and are therefore kept per thread.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all = []
+        self._all_lock = threading.Lock()
+
+    def _api(self, config):
+        oem, psm, variables = _parse_tess_config(config)
+        handles = getattr(self._local, "handles", None)
+        if handles is None:
+            handles = self._local.handles = {}
+        api = handles.get(oem)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(oem=oem)
+            handles[oem] = api
+            with self._all_lock:
+                self._all.append(api)
+            log.debug("tesserocr handle created (oem=%d)", oem)
+        api.SetPageSegMode(psm)
+        # variables persist between calls, so reset the whitelist explicitly
+        api.SetVariable("tessedit_char_whitelist", variables.pop("tessedit_char_whitelist", ""))
+        for key, value in variables.items():
+            api.SetVariable(key, value)
+        return api
+
+    @staticmethod
+    def _set_image(api, img):
+        img = np.ascontiguousarray(img)
+        h, w = img.shape[:2]
+        bpp = 1 if img.ndim == 2 else img.shape[2]
+        api.SetImageBytes(img.tobytes(), w, h, bpp, w * bpp)
+
+    def image_to_string(self, img, config=""):
+        api = self._api(config)
+        self._set_image(api, img)
+        return api.GetUTF8Text()
+
+    def image_to_data(self, img, config=""):
+        api = self._api(config)
+        self._set_image(api, img)
+        api.Recognize()
+        data = {"text": [], "left": [], "top": [], "width": [], "height": [], "conf": []}
+        level = tesserocr.RIL.WORD
+        it = api.GetIterator()
+        if it is not None:
+            for word in tesserocr.iterate_level(it, level):
+                box = word.BoundingBox(level)
+                if box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                data["text"].append(word.GetUTF8Text(level) or "")
+                data["left"].append(x1)
+                data["top"].append(y1)
+                data["width"].append(x2 - x1)
+                data["height"].append(y2 - y1)
+                data["conf"].append(word.Confidence(level))
+        return data
+
+    def close(self):
+        with self._all_lock:
+            for api in self._all:
+                api.End()
+            self._all.clear()
+        self._local = threading.local()
+
+
+_pool = None
+
+
+def get_pool(workers: int):
+    """Return the shared OCR thread pool, or ``None`` when ``workers`` is 0.
+
+    Tesseract calls run outside the GIL, so a small pool lets the species
+    and stat reads of one scan overlap.  The pool is reused between scans
+    and rebuilt only when the configured size changes.
+    """
+    global _pool
+    if workers <= 0:
+        return None
+    if _pool is None or _pool._max_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the OCR thread pool."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+
+class PyAutoGUICapture:
+    """Screen capture through ``pyautogui.screenshot`` (PIL)."""
+
+    name = "pyautogui"
+
+    def grab(self, region) -> np.ndarray:
+        rgb = np.asarray(pyautogui.screenshot(region=region))
+        if cv2 is not None and hasattr(cv2, "cvtColor"):
+            return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        return np.ascontiguousarray(rgb[..., ::-1])
+
+    def close(self):
+        pass
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("funcs", ctypes.c_void_p * 6),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class XShmCapture:
+    """X11 MIT-SHM capture straight into preallocated NumPy buffers.
+
+    One shared-memory ``XImage`` is created per region size and reused, so a
+    grab is a single ``XShmGetImage`` round trip with no allocation.  On a
+    24/32-bit visual the pixels are BGRX, so the returned ``[..., :3]`` view
+    is already BGR and needs no colour conversion.
+    """
+
+    name = "xshm"
+    _ZPIXMAP = 2
+    _IPC_PRIVATE = 0
+    _IPC_CREAT = 0o1000
+    _IPC_RMID = 0
+    _ALL_PLANES = 0xFFFFFFFF
+
+    def __init__(self):
+        x11 = ctypes.util.find_library("X11")
+        xext = ctypes.util.find_library("Xext")
+        if not x11 or not xext or not os.environ.get("DISPLAY"):
+            raise OSError("X11 shared-memory capture unavailable")
+        self._x11 = ctypes.CDLL(x11)
+        self._xext = ctypes.CDLL(xext)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._declare()
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        if not self._xext.XShmQueryExtension(self._display):
+            self._x11.XCloseDisplay(self._display)
+            raise OSError("X server lacks the MIT-SHM extension")
+        screen = self._x11.XDefaultScreen(self._display)
+        self._root = self._x11.XDefaultRootWindow(self._display)
+        self._visual = self._x11.XDefaultVisual(self._display, screen)
+        self._depth = self._x11.XDefaultDepth(self._display, screen)
+        self._buffers = {}
+
+    def _declare(self):
+        c = ctypes
+        x11, xext, libc = self._x11, self._xext, self._libc
+        x11.XOpenDisplay.restype = c.c_void_p
+        x11.XOpenDisplay.argtypes = [c.c_char_p]
+        x11.XCloseDisplay.argtypes = [c.c_void_p]
+        x11.XDefaultScreen.argtypes = [c.c_void_p]
+        x11.XDefaultRootWindow.restype = c.c_ulong
+        x11.XDefaultRootWindow.argtypes = [c.c_void_p]
+        x11.XDefaultVisual.restype = c.c_void_p
+        x11.XDefaultVisual.argtypes = [c.c_void_p, c.c_int]
+        x11.XDefaultDepth.argtypes = [c.c_void_p, c.c_int]
+        x11.XSync.argtypes = [c.c_void_p, c.c_int]
+        x11.XFree.argtypes = [c.c_void_p]
+        xext.XShmQueryExtension.argtypes = [c.c_void_p]
+        xext.XShmCreateImage.restype = c.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [
+            c.c_void_p, c.c_void_p, c.c_uint, c.c_int, c.c_void_p,
+            c.POINTER(_XShmSegmentInfo), c.c_uint, c.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [c.c_void_p, c.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [c.c_void_p, c.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            c.c_void_p, c.c_ulong, c.POINTER(_XImage), c.c_int, c.c_int, c.c_ulong,
+        ]
+        libc.shmget.argtypes = [c.c_int, c.c_size_t, c.c_int]
+        libc.shmat.restype = c.c_void_p
+        libc.shmat.argtypes = [c.c_int, c.c_void_p, c.c_int]
+        libc.shmdt.argtypes = [c.c_void_p]
+        libc.shmctl.argtypes = [c.c_int, c.c_int, c.c_void_p]
+
+    def _buffer(self, w, h):
+        buf = self._buffers.get((w, h))
+        if buf is not None:
+            return buf
+        info = _XShmSegmentInfo()
+        image = self._xext.XShmCreateImage(
+            self._display, self._visual, self._depth, self._ZPIXMAP, None,
+            ctypes.byref(info), w, h,
+        )
+        if not image or image.contents.bits_per_pixel != 32:
+            raise OSError("unsupported X visual for shared-memory capture")
+        size = image.contents.bytes_per_line * h
+        info.shmid = self._libc.shmget(self._IPC_PRIVATE, size, self._IPC_CREAT | 0o600)
+        if info.shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        info.shmaddr = self._libc.shmat(info.shmid, None, 0)
+        if info.shmaddr in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        image.contents.data = info.shmaddr
+        info.readOnly = 0
+        self._xext.XShmAttach(self._display, ctypes.byref(info))
+        self._x11.XSync(self._display, 0)
+        # segment is freed automatically once both sides detach
+        self._libc.shmctl(info.shmid, self._IPC_RMID, None)
+
+        raw = (ctypes.c_ubyte * size).from_address(info.shmaddr)
+        stride = image.contents.bytes_per_line
+        array = np.frombuffer(raw, dtype=np.uint8).reshape(h, stride // 4, 4)[:, :w]
+        buf = self._buffers[(w, h)] = (image, info, array)
+        return buf
+
+    def grab(self, region) -> np.ndarray:
+        x, y, w, h = (int(v) for v in region)
+        image, _info, array = self._buffer(w, h)
+        if not self._xext.XShmGetImage(
+            self._display, self._root, image, x, y, self._ALL_PLANES
+        ):
+            raise OSError("XShmGetImage failed")
+        return array[..., :3]
+
+    def close(self):
+        for image, info, _array in self._buffers.values():
+            self._xext.XShmDetach(self._display, ctypes.byref(info))
+            self._libc.shmdt(info.shmaddr)
+            image.contents.data = None
+            self._x11.XFree(image)
+        self._buffers.clear()
+        if self._display:
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+CAPTURE_BACKENDS = {"xshm": XShmCapture, "pyautogui": PyAutoGUICapture}
+_captures = {}
+
+
+def get_capture(name: str = "auto"):
+    """Return a cached screen-capture backend.
+
+    ``"auto"`` tries X11 shared memory first and falls back to pyautogui when
+    it is unavailable (e.g. on Windows or without ``$DISPLAY``).
+    """
+    if name in _captures:
+        return _captures[name]
+    order = ["xshm", "pyautogui"] if name == "auto" else [name, "pyautogui"]
+    for candidate in order:
+        try:
+            backend = CAPTURE_BACKENDS[candidate]()
+        except Exception as e:
+            log.debug("capture backend %s unavailable: %s", candidate, e)
+            continue
+        log.info("Capture backend: %s", backend.name)
+        _captures[name] = backend
+        return backend
+    raise RuntimeError("No screen-capture backend available")
+
+
+def close_captures() -> None:
+    """Release capture buffers and display connections."""
+    for backend in set(_captures.values()):
+        backend.close()
+    _captures.clear()
+
+
+OCR_ENGINES = {"tesserocr": TesserocrEngine, "pytesseract": PytesseractEngine}
+_BACKENDS = {"tesserocr": tesserocr, "pytesseract": pytesseract}
+_engines = {}
+
+
+def get_engine(name: str = "auto"):
+    """Return a cached OCR engine, preferring the persistent backend.
+
+    ``name`` is ``"auto"``, ``"tesserocr"`` or ``"pytesseract"``.  When the
+    requested backend is not installed the other one is used instead.
+    """
+    order = ["tesserocr", "pytesseract"]
+    if name in order:
+        order.remove(name)
+        order.insert(0, name)
+    for candidate in order:
+        if _BACKENDS[candidate] is None:
+            continue
+        if candidate not in _engines:
+            _engines[candidate] = OCR_ENGINES[candidate]()
+            log.info("OCR engine: %s", candidate)
+        return _engines[candidate]
+    raise RuntimeError("No OCR backend available")
+
+
+def close_engines() -> None:
+    """Release all persistent OCR handles."""
+    for engine in _engines.values():
+        engine.close()
+    _engines.clear()
+
+STAT_WHITELIST = "0123456789()l|"
+
+# Blank rows inserted between stat crops when stitching them for batched OCR
+BATCH_GAP = 24
+
+# Minimum glyph match score for a template read to skip Tesseract
+TEMPLATE_THRESHOLD = 0.85
+_templates = {}
+
+# Popup readiness probe: polling interval, mean pixel difference from the
+# empty-slot grab that counts as "popup shown", and the largest difference
+# between consecutive grabs that still counts as "settled"
+PROBE_POLL = 0.01
+PROBE_DIFF = 8.0
+PROBE_STABLE_DIFF = 2.0
+
+# Histogram bins used for popup presence signatures
+SIGNATURE_BINS = 16
+
+# Crops are downsampled by this factor before hashing for the OCR cache
+HASH_SCALE = 0.5
+OCR_CACHE_SIZE = 512
+_ocr_cache = None
+
+
+class OCRCache:
+    """Bounded LRU map from crop hashes to parsed OCR results."""
+
+    def __init__(self, maxsize: int = OCR_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def get_ocr_cache(settings=None) -> OCRCache:
+    """Return the shared OCR cache, resized from ``settings`` if needed."""
+    global _ocr_cache
+    size = (settings or {}).get("ocr", {}).get("cache_size", OCR_CACHE_SIZE)
+    if _ocr_cache is None or _ocr_cache.maxsize != size:
+        _ocr_cache = OCRCache(size)
+    return _ocr_cache
+
+
+def crop_hash(crop: np.ndarray) -> tuple:
+    """Cheap perceptual hash: downsampled grayscale thresholded at its mean.
+
+    Pixel-identical crops and crops differing only by faint noise map to the
+    same key, while the digits themselves stay distinguishable.
+    """
+    gray = crop if crop.ndim == 2 else crop.mean(axis=2)
+    if cv2 is not None and hasattr(cv2, "resize"):
+        h, w = gray.shape
+        small = cv2.resize(
+            gray.astype(np.float32),
+            (max(1, int(w * HASH_SCALE)), max(1, int(h * HASH_SCALE))),
+            interpolation=cv2.INTER_AREA,
+        )
+    else:
+        step = int(round(1 / HASH_SCALE))
+        small = gray[::step, ::step]
+    bits = small > small.mean()
+    return bits.shape, np.packbits(bits).tobytes()
+
 def normalize_stat_text(text: str) -> str:
     """Cleanup OCR text for numeric parsing."""
     # Many fonts cause Tesseract to misread ``l``/``I``/``|`` as ``1``.  We
@@ -48,44 +535,159 @@ def baseline_up(img):
     _, bw = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
     return cv2.cvtColor(bw, cv2.COLOR_GRAY2BGR)
 
-def enhance_and_ocr(image: np.ndarray, runs: int = 3) -> list:
-    """
-    Main + Extra-3 fallback:
-    Upscale→Sharpen→Otsu→Adaptive Mean Threshold→OCR (multiple runs)
-    """
-    scale = 4
-    up = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-    gray = cv2.cvtColor(up, cv2.COLOR_BGR2GRAY)
+def _sharpen(gray):
     kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
-    sharp = cv2.filter2D(gray, -1, kernel)
-    _, otsu = cv2.threshold(sharp, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    adaptive = cv2.adaptiveThreshold(
-        otsu, 255,
+    return cv2.filter2D(gray, -1, kernel)
+
+def _otsu(gray, invert=False):
+    mode = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
+    _, bw = cv2.threshold(gray, 0, 255, mode + cv2.THRESH_OTSU)
+    return bw
+
+def _prep_adaptive(gray):
+    """Sharpen→Otsu→Adaptive Mean Threshold (the original fallback)."""
+    return cv2.adaptiveThreshold(
+        _otsu(_sharpen(gray)), 255,
         cv2.ADAPTIVE_THRESH_MEAN_C,
         cv2.THRESH_BINARY,
         11, 2
     )
-    cfg = "--psm 7 -c tessedit_char_whitelist=0123456789()l|"
+
+def _prep_otsu(gray):
+    return _otsu(_sharpen(gray))
+
+def _prep_closed(gray):
+    """Otsu followed by a small closing to rejoin broken strokes."""
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    return cv2.morphologyEx(_otsu(gray), cv2.MORPH_CLOSE, kernel)
+
+def _prep_inverted(gray):
+    return _otsu(cv2.GaussianBlur(gray, (3, 3), 0), invert=True)
+
+# Fallback variants in the order they are tried: (preprocess, scale, psm).
+# Each differs in scale, thresholding, morphology or page segmentation so a
+# second read is genuinely independent of the first.
+FALLBACK_VARIANTS = [
+    (_prep_adaptive, 4, 7),
+    (_prep_otsu, 3, 7),
+    (_prep_closed, 4, 7),
+    (_prep_inverted, 2, 8),
+    (_prep_adaptive, 3, 13),
+]
+
+# A single fallback read at or above this Tesseract confidence is accepted
+FALLBACK_CONFIDENCE = 90.0
+
+# Primary reads of low values (<= 10) below this confidence get the fallback
+MIN_CONFIDENCE = 80.0
+
+def ocr_with_conf(img, config, engine=None):
+    """OCR ``img`` via ``image_to_data`` and return ``(text, confidence)``.
+
+    Words are joined left to right; the confidence is that of the weakest
+    word (0-100), or 0 when nothing was read.
+    """
+    data = (engine or get_engine()).image_to_data(img, config=config)
+    words = []
+    for i, text in enumerate(data.get("text", [])):
+        text = (text or "").strip()
+        if text:
+            words.append((data["left"][i], text, float(data["conf"][i])))
+    if not words:
+        return "", 0.0
+    words.sort()
+    return "".join(w[1] for w in words), min(w[2] for w in words)
+
+def otsu_threshold(plane: np.ndarray) -> int:
+    """Otsu threshold of a uint8 ``plane`` computed from its histogram.
+
+    Gives the same value as ``cv2.threshold(..., THRESH_OTSU)`` but works on
+    non-contiguous slices without copying them first.
+    """
+    hist = np.bincount(plane.ravel(), minlength=256).astype(np.float64)
+    w0 = np.cumsum(hist)
+    w1 = w0[-1] - w0
+    m0 = np.cumsum(hist * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (m0[-1] * w0 / w0[-1] - m0) ** 2 / (w0 * w1)
+    between[~np.isfinite(between)] = 0
+    return int(between.argmax())
+
+class FramePlanes:
+    """Upscaled, blurred grayscale plane of a whole captured frame.
+
+    ``baseline_up`` used to resize, convert and blur each stat crop on its
+    own.  Here the frame is processed once and every ROI is sliced out of
+    the shared plane and thresholded with its own Otsu level.
+    """
+
+    def __init__(self, gray: np.ndarray, scale: int = 3):
+        self.scale = scale
+        up = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        self.blur = cv2.GaussianBlur(up, (5, 5), 0)
+
+    def binarize(self, x, y, w, h) -> np.ndarray:
+        """Otsu-binarized upscaled ROI at frame coordinates ``(x, y, w, h)``."""
+        k = self.scale
+        roi = self.blur[y*k:(y+h)*k, x*k:(x+w)*k]
+        return np.where(roi > otsu_threshold(roi), 255, 0).astype(np.uint8)
+
+def enhance_and_ocr(image: np.ndarray, runs: int = len(FALLBACK_VARIANTS), engine=None) -> list:
+    """
+    Fallback OCR over up to ``runs`` distinct preprocessing variants.
+
+    Stops as soon as two variants parse to the same value or one parses with
+    at least ``FALLBACK_CONFIDENCE``.  Returns ``[(base, mutation, conf)]``
+    for every variant that produced a number, in the order they were tried.
+    """
+    engine = engine or get_engine()
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
     results = []
-    for i in range(runs):
-        raw = pytesseract.image_to_string(adaptive, config=cfg).strip()
+    seen = set()
+    for i, (prep, scale, psm) in enumerate(FALLBACK_VARIANTS[:runs]):
+        up = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        cfg = f"--psm {psm} -c tessedit_char_whitelist={STAT_WHITELIST}"
+        raw, conf = ocr_with_conf(prep(up), cfg, engine)
         norm = normalize_stat_text(raw)
-        log.debug(f"[enhance_and_ocr] Run {i+1} → raw: {raw!r} | normalized: {norm!r}")
-        results.append(norm)
+        log.debug(
+            "[enhance_and_ocr] %s x%d psm %d → raw: %r | normalized: %r | conf %.0f",
+            prep.__name__, scale, psm, raw, norm, conf,
+        )
+        parsed = parse_fallback_text(norm)
+        if parsed is None:
+            continue
+        results.append((*parsed, conf))
+        if parsed in seen or conf >= FALLBACK_CONFIDENCE:
+            log.debug("[enhance_and_ocr] stopping after %d variants", i + 1)
+            break
+        seen.add(parsed)
     return results
 
-def ocr_number(img, oem, psm):
+def ocr_number(img, oem, psm, engine=None):
     """
     Primary OCR pass: Otsu→Tesseract→normalize→extract digits.
     If text ends with ')' but only a single digit inside, treat as failure → return (None,0).
     Only split out base+mut when there are at least two digits before the ')'.
+    Returns ``(base, mutation, confidence)`` with Tesseract's word confidence.
+    """
+    if img.ndim == 3:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    else:
+        # single-channel input is already binarized by FramePlanes
+        bw = img
+    cfg = f"--oem {oem} --psm {psm} -c tessedit_char_whitelist={STAT_WHITELIST}"
+    raw, conf = ocr_with_conf(bw, cfg, engine)
+    log.debug("OCR raw text: %r (conf %.0f)", raw, conf)
+    return (*parse_stat_text(raw), conf)
+
+def parse_stat_text(raw, normalize=True):
+    """Split stat text into ``(base, mutation)``.
+
+    Tesseract output is normalized first; template reads only ever contain
+    digits and parentheses so they can skip that step.
     """
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    cfg = f"--oem {oem} --psm {psm} -c tessedit_char_whitelist=0123456789()l|"
-    raw = pytesseract.image_to_string(bw, config=cfg)
-    log.debug("OCR raw text: %r", raw)
-    text = normalize_stat_text(raw)
+    text = normalize_stat_text(raw) if normalize else raw.strip()
     log.debug("OCR normalized text: %r", text)
 
     # handle "512)" → base=51, mut=2
@@ -108,22 +710,242 @@ def ocr_number(img, oem, psm):
         return int(nums[0]), 0
     return None, 0
 
-def scan_once(settings, debug=False):
-    log.debug("scan_once: start")
-    if not OCR_AVAILABLE:
-        log.error("scan_once called but OCR libraries are unavailable")
-        return "ocr_unavailable"
-    x, y = settings["slot_x"], settings["slot_y"]
-    if not pyautogui.onScreen(x, y):
-        log.warning("Slot off-screen, skipping scan.")
-        return "no_egg"
+def get_templates(path: str = TEMPLATE_FILE):
+    """Return the digit template bank stored at ``path`` (cached)."""
+    if path not in _templates:
+        _templates[path] = load_templates(path)
+        log.debug("Loaded %d digit templates from %s", len(_templates[path]), path)
+    return _templates[path]
 
-    pyautogui.moveTo(x, y)
-    pyautogui.click(x, y, interval=settings.get("action_delay", 0.0))
-    time.sleep(settings.get("popup_delay", 0.0))
-    log.debug("Clicked slot at (%d,%d)", x, y)
+def template_number(prim, bank, threshold=TEMPLATE_THRESHOLD):
+    """Read a stat with the template recognizer.
+
+    Returns ``(base, mutation, confidence)`` with the match score scaled to
+    Tesseract's 0-100 range, or ``None`` when the match is not confident
+    enough and Tesseract should be used instead.
+    """
+    text, score = read_glyphs(prim, bank)
+    log.debug("template read → %r (score %.3f)", text, score)
+    if score < threshold:
+        return None
+    base, mut = parse_stat_text(text, normalize=False)
+    if base is None:
+        return None
+    return base, mut, score * 100
+
+def parse_fallback_text(cleaned):
+    """Parse normalized fallback text into ``(base, mutation)`` or ``None``."""
+    mutation_match = re.search(r"\((\d{1,2})\)", cleaned)
+    nums = re.findall(r"\d+", cleaned)
+
+    base, mut = None, 0
+    if len(nums) >= 2:
+        base, mut = int(nums[0]), int(nums[1])
+    elif len(nums) == 1:
+        rawnum = nums[0]
+        mut = int(mutation_match.group(1)) if mutation_match else 0
+        # jammed-case fallback: "512)"
+        if mut == 0 and len(rawnum) >= 3:
+            bc, mc = int(rawnum[:-1]), int(rawnum[-1])
+            if bc <= 99:
+                base, mut = bc, mc
+            else:
+                base, mut = int(rawnum), 0
+        else:
+            base = int(rawnum)
+
+    if base is None:
+        return None
+    return base, mut
+
+def fallback_stat(crop, engine=None):
+    """Run the ``enhance_and_ocr`` fallback and pick a value.
 
-    # Calculate the bounding rectangle containing the species ROI and all stat ROIs
+    A value read by two variants wins; otherwise the most confident read is
+    used.  Returns ``(base, mutation, confidence)`` or ``None`` when no
+    variant produced a number.
+    """
+    reads = enhance_and_ocr(crop, engine=engine)
+    log.debug("enhanced reads → %r", reads)
+    if not reads:
+        return None
+    counts = Counter((b, m) for b, m, _ in reads)
+    value, count = counts.most_common(1)[0]
+    if count >= 2:
+        conf = max(c for b, m, c in reads if (b, m) == value)
+        return (*value, conf)
+    return max(reads, key=lambda r: r[2])
+
+def stitch_crops(prims):
+    """Stack binarized stat crops into one image for a single OCR call.
+
+    Every crop is flipped to dark text on a white background and separated by
+    ``BATCH_GAP`` blank rows.  Returns the canvas and a ``{stat: (top, bottom)}``
+    map of the row band each stat occupies.
+    """
+    rows = []
+    for stat, prim in prims.items():
+        bw = prim if prim.ndim == 2 else cv2.cvtColor(prim, cv2.COLOR_BGR2GRAY)
+        border = np.concatenate((bw[0], bw[-1], bw[:, 0], bw[:, -1]))
+        if border.mean() < 128:
+            bw = 255 - bw
+        rows.append((stat, bw))
+
+    width = max(bw.shape[1] for _, bw in rows) + 2 * BATCH_GAP
+    height = sum(bw.shape[0] for _, bw in rows) + BATCH_GAP * (len(rows) + 1)
+    canvas = np.full((height, width), 255, dtype=np.uint8)
+    spans = {}
+    y = BATCH_GAP
+    for stat, bw in rows:
+        h, w = bw.shape
+        canvas[y:y+h, BATCH_GAP:BATCH_GAP+w] = bw
+        spans[stat] = (y, y + h)
+        y += h + BATCH_GAP
+    return canvas, spans
+
+def assign_words(data, spans):
+    """Map ``image_to_data`` words back onto stats by vertical position.
+
+    Words are joined left to right within each stat's row band.  A word whose
+    centre falls in a gap is attached to the nearest band.  Returns
+    ``{stat: (text, confidence)}`` using the weakest word's confidence.
+    """
+    words = {stat: [] for stat in spans}
+    confs = data.get("conf")
+    for i, text in enumerate(data.get("text", [])):
+        text = (text or "").strip()
+        if not text:
+            continue
+        centre = data["top"][i] + data["height"][i] / 2
+        stat = min(
+            spans,
+            key=lambda st: 0 if spans[st][0] <= centre < spans[st][1]
+            else min(abs(centre - spans[st][0]), abs(centre - spans[st][1])),
+        )
+        conf = float(confs[i]) if confs else 0.0
+        words[stat].append((data["left"][i], text, conf))
+    return {
+        stat: (
+            "".join(w[1] for w in sorted(ws)),
+            min((w[2] for w in ws), default=0.0),
+        )
+        for stat, ws in words.items()
+    }
+
+def ocr_batch(prims, oem, engine=None):
+    """OCR every stat crop with a single Tesseract invocation.
+
+    Returns ``{stat: (base, mutation, confidence)}`` parsed the same way
+    as ``ocr_number``.
+    """
+    if not prims:
+        return {}
+    canvas, spans = stitch_crops(prims)
+    cfg = f"--oem {oem} --psm 6 -c tessedit_char_whitelist={STAT_WHITELIST}"
+    data = (engine or get_engine()).image_to_data(canvas, config=cfg)
+    texts = assign_words(data, spans)
+    log.debug("batched OCR texts → %r", texts)
+    return {stat: (*parse_stat_text(txt), conf) for stat, (txt, conf) in texts.items()}
+
+def grab_region(region, backend: str = "auto") -> np.ndarray:
+    """Capture ``region`` (x, y, w, h) of the screen as a BGR array.
+
+    With the shared-memory backend the result is a view into a reused buffer
+    and is overwritten by the next grab of the same size; copy it to keep it.
+    """
+    return get_capture(backend).grab(region)
+
+def wait_for_popup(region, baseline, timeout, poll=PROBE_POLL, backend="auto", timings=None,
+                   onset_timeout=None):
+    """Poll ``region`` until the popup has rendered and settled.
+
+    The popup counts as ready once the region differs from ``baseline`` (the
+    empty-slot pixels grabbed before clicking) and two consecutive grabs
+    agree.  Returns the seconds waited, or ``None`` when ``timeout`` expired
+    first, in which case the caller simply carries on as after a fixed sleep.
+    When a ``timings`` dict is given, the seconds until the first change are
+    stored under ``"onset"``.  With ``onset_timeout`` the wait also gives up
+    when the region has not changed at all within that many seconds.
+    """
+    start = time.monotonic()
+    base = baseline.astype(np.int16)
+    prev = None
+    onset = False
+    while True:
+        frame = grab_region(region, backend).astype(np.int16)
+        changed = np.abs(frame - base).mean() > PROBE_DIFF
+        if changed and not onset:
+            onset = True
+            if timings is not None:
+                timings["onset"] = time.monotonic() - start
+        if changed and prev is not None and np.abs(frame - prev).mean() <= PROBE_STABLE_DIFF:
+            return time.monotonic() - start
+        prev = frame if changed else None
+        elapsed = time.monotonic() - start
+        if elapsed >= timeout or (not onset and onset_timeout is not None and elapsed >= onset_timeout):
+            return None
+        time.sleep(min(poll, timeout - elapsed))
+
+def probe_region(settings):
+    """The species ROI as ``(x, y, w, h)``, or ``None`` when probing is off."""
+    sp = settings["species_roi"]
+    if not settings.get("popup_probe", True) or sp["w"] <= 0 or sp["h"] <= 0:
+        return None
+    return (sp["x"], sp["y"], sp["w"], sp["h"])
+
+def grab_probe(settings):
+    """Snapshot of the probe region to compare later frames against."""
+    probe = probe_region(settings)
+    if probe is None:
+        return None
+    return grab_region(probe, settings.get("capture_backend", "auto")).copy()
+
+def wait_for_settle(settings, baseline):
+    """Wait after keep/destroy until the slot has changed and settled.
+
+    ``baseline`` is a ``grab_probe`` snapshot taken before the action.  The
+    wait is bounded by ``scan_loop_delay`` and the measured time feeds the
+    timing tuner; without a probe this is a plain sleep.
+    """
+    limit = get_delay(settings, "scan_loop_delay")
+    if baseline is None:
+        time.sleep(limit)
+        return None
+    waited = wait_for_popup(
+        probe_region(settings), baseline, limit,
+        backend=settings.get("capture_backend", "auto"),
+    )
+    if waited is None:
+        report_failure(settings, "scan_loop_delay")
+    else:
+        record_latency(settings, "scan_loop_delay", waited)
+    return waited
+
+def popup_signature(crop: np.ndarray) -> list:
+    """Normalized coarse histogram of ``crop`` used to tell popups apart.
+
+    The green channel stands in for luminance so no colour conversion is
+    needed; a 16-bin histogram of a species ROI takes a few microseconds.
+    """
+    chan = crop[..., 1] if crop.ndim == 3 else crop
+    hist = np.bincount((chan >> 4).ravel(), minlength=SIGNATURE_BINS)
+    return (hist / max(1, chan.size)).tolist()
+
+def popup_present(crop: np.ndarray, signatures) -> bool | None:
+    """Compare ``crop`` with the calibrated empty/present signatures.
+
+    Returns ``True``/``False``, or ``None`` when no signatures are calibrated
+    and the caller must fall back to reading the species text.
+    """
+    if not signatures or "empty" not in signatures or "present" not in signatures:
+        return None
+    sig = np.asarray(popup_signature(crop))
+    d_empty = np.abs(sig - np.asarray(signatures["empty"])).sum()
+    d_present = np.abs(sig - np.asarray(signatures["present"])).sum()
+    return bool(d_present < d_empty)
+
+def roi_region(settings):
+    """Bounding rectangle (x, y, w, h) of the species ROI and all stat ROIs."""
     sx, sy, sw, sh = settings["species_roi"].values()
     bounds = [
         (sx, sy, sx + sw, sy + sh),
@@ -136,90 +958,253 @@ def scan_once(settings, debug=False):
     min_y = min(b[1] for b in bounds)
     max_x = max(b[2] for b in bounds)
     max_y = max(b[3] for b in bounds)
+    return (min_x, min_y, max_x - min_x, max_y - min_y)
 
-    region = (min_x, min_y, max_x - min_x, max_y - min_y)
-    full = cv2.cvtColor(
-        np.array(pyautogui.screenshot(region=region)), cv2.COLOR_RGB2BGR
-    )
+def is_valid_species(species: str) -> bool:
+    """Species line must read "CS" and "male"/"female" to be an egg."""
+    sl = species.lower()
+    return "cs" in sl and ("male" in sl or "female" in sl)
+
+def read_species(crop_sp, settings, engine, cache, lexicon=None):
+    """OCR the species line, reusing cached text for identical crops.
+
+    With a ``lexicon`` the text, cached or fresh, is snapped onto the known
+    species.  Only text that yields a valid species line is cached, so the
+    OCR cache is the one memo of species-line crops.
+    """
+    sp_key = ("species", crop_hash(crop_sp))
+    text = cache.get(sp_key)
+    cached = text is not None
+    if not cached:
+        if crop_sp.ndim == 3:
+            crop_sp = cv2.cvtColor(crop_sp, cv2.COLOR_BGR2GRAY)
+        sp_txt = engine.image_to_string(
+            crop_sp,
+            config=f"--oem {settings['ocr']['oem']} --psm 7"
+        )
+        text = sp_txt.splitlines()[0].strip() if sp_txt.splitlines() else ""
+    log.debug("Species OCR: %r", text)
+    species = lexicon.snap(text) if lexicon is not None else text
+    # only valid lines are cached so a rescan of a garbled crop retries OCR
+    if is_valid_species(species) and not cached:
+        cache.put(sp_key, text)
+    return species
+
+def finish_stat(stat, crop, prim, settings, engine, primary=None):
+    """Primary OCR for one stat plus the fallback for missing/low reads.
+
+    ``primary`` is the already known ``(base, mutation, confidence)`` from a
+    batched read; when omitted ``ocr_number`` is run on ``prim``.  Low values
+    only go to the fallback when Tesseract was not confident about them.
+    """
+    if primary is None:
+        primary = ocr_number(prim, settings["ocr"]["oem"], settings["ocr"]["psm"], engine)
+    b, m, conf = primary
+    log.debug("%s primary → base=%r, mut=%r, conf=%.0f", stat, b, m, conf)
+
+    # Fallback if missing, or suspiciously low and not confidently read
+    min_conf = settings["ocr"].get("min_confidence", MIN_CONFIDENCE)
+    if stat != "speed" and (b is None or (b <= 10 and conf < min_conf)):
+        log.debug("%s → enhance_and_ocr fallback", stat)
+        fb = fallback_stat(crop, engine)
+        if fb is not None:
+            b, m, conf = fb
+            log.debug("%s fallback chosen → base=%r, mut=%r", stat, b, m)
+    return b, m, conf
+
+def scan_once(settings, debug=False):
+    """Click the slot and OCR the popup once.
+
+    Returns ``"no_egg"``/``"ocr_unavailable"`` or
+    ``{"species": str, "stats": {stat: {"base", "mutation", "confidence"}}}``
+    where ``confidence`` is the 0-100 score of the read that was used.
+    """
+    log.debug("scan_once: start")
+    if not OCR_AVAILABLE:
+        log.error("scan_once called but OCR libraries are unavailable")
+        return "ocr_unavailable"
+    engine = get_engine(settings["ocr"].get("engine", "auto"))
+    x, y = settings["slot_x"], settings["slot_y"]
+    mouse = get_input(settings.get("input_backend", "auto"))
+    if not mouse.onScreen(x, y):
+        log.warning("Slot off-screen, skipping scan.")
+        return "no_egg"
+
+    probe = probe_region(settings)
+    backend = settings.get("capture_backend", "auto")
+    baseline = grab_probe(settings)
+    signatures = settings.get("popup_signatures")
+    # the slot looks empty before the click; if the probe never moves off it
+    # there is no popup to wait for
+    empty_before = baseline is not None and popup_present(baseline, signatures) is False
+
+    mouse.moveTo(x, y)
+    mouse.click(x, y, interval=get_delay(settings, "action_delay", 0.0))
+    log.debug("Clicked slot at (%d,%d)", x, y)
+    popup_delay = get_delay(settings, "popup_delay", 0.0)
+    if probe is not None:
+        timings = {}
+        waited = wait_for_popup(
+            probe, baseline, popup_delay, backend=backend, timings=timings,
+            onset_timeout=get_delay(settings, "action_delay") if empty_before else None,
+        )
+        log.debug("Popup ready after %s", "timeout" if waited is None else f"{waited:.3f}s")
+        if empty_before and "onset" not in timings:
+            log.debug("Probe never left the empty-slot signature; skipping OCR")
+            return "no_egg"
+        if "onset" in timings:
+            record_latency(settings, "action_delay", timings["onset"])
+        # a timeout only means the delay was too short once the frame turns
+        # out to hold an egg; empty slots never show a popup
+        timed_out = waited is None
+        if not timed_out:
+            record_latency(settings, "popup_delay", waited)
+    else:
+        timed_out = False
+        time.sleep(popup_delay)
+
+    region = roi_region(settings)
+    min_x, min_y = region[:2]
+    full = grab_region(region, backend)
+
+    cache = get_ocr_cache(settings)
+    pool = get_pool(settings["ocr"].get("workers", 0))
+    lexicon = get_lexicon() if settings["ocr"].get("species_lexicon", True) else None
 
     # Species OCR
     sx, sy, sw, sh = settings["species_roi"].values()
     sx -= min_x
     sy -= min_y
-    crop_sp = full[sy:sy+sh, sx:sx+sw]
-    sp_txt = pytesseract.image_to_string(
-        cv2.cvtColor(crop_sp, cv2.COLOR_BGR2GRAY),
-        config=f"--oem {settings['ocr']['oem']} --psm 7"
-    )
-    species = sp_txt.splitlines()[0].strip() if sp_txt.splitlines() else ""
-    log.debug("Species OCR: %r", species)
-      # ─── Invalid‐species guard: must read “CS” and “male”/“female” ─────────
-    sl = species.lower()
-    if "cs" not in sl or not ("male" in sl or "female" in sl):
-        log.info(f"Invalid species OCR ({species!r}), skipping slot")
+    if popup_present(full[sy:sy+sh, sx:sx+sw], signatures) is False:
+        log.debug("Popup signature matches empty slot; skipping OCR")
         return "no_egg"
+
+    # One colour conversion for the whole frame; every ROI is a view into it
+    gray = cv2.cvtColor(full, cv2.COLOR_BGR2GRAY)
+    crop_sp = gray[sy:sy+sh, sx:sx+sw]
+    species_job = (
+        pool.submit(read_species, crop_sp, settings, engine, cache, lexicon)
+        if pool else None
+    )
+    if species_job is None:
+        species = read_species(crop_sp, settings, engine, cache, lexicon)
+        if not is_valid_species(species):
+            log.info(f"Invalid species OCR ({species!r}), skipping slot")
+            return "no_egg"
+
     # Stat OCR
-    stats = {}
+    crops = {}
     for stat, roi in settings["stat_rois"].items():
         x0, y0, w0, h0 = roi.values()
         x0 -= min_x
         y0 -= min_y
-        crop = full[y0:y0+h0, x0:x0+w0]
-
-        prim = baseline_up(crop)
-        b, m = ocr_number(prim, settings["ocr"]["oem"], settings["ocr"]["psm"])
-        log.debug("%s primary → base=%r, mut=%r", stat, b, m)
-
-        # Fallback if missing or suspiciously low
-        parsed = []
-        if stat != "speed" and (b is None or b <= 10):
-            log.debug("%s → enhance_and_ocr fallback", stat)
-            enhanced = enhance_and_ocr(crop, runs=3)
-            log.debug("%s enhanced texts → %r", stat, enhanced)
-            for txt in enhanced:
-                cleaned = normalize_stat_text(txt)
-                mutation_match = re.search(r"\((\d{1,2})\)", cleaned)
-                nums = re.findall(r"\d+", cleaned)
-
-                base, mut = None, 0
-                if len(nums) >= 2:
-                    base, mut = int(nums[0]), int(nums[1])
-                elif len(nums) == 1:
-                    rawnum = nums[0]
-                    mut = int(mutation_match.group(1)) if mutation_match else 0
-                    # jammed-case fallback: "512)"
-                    if mut == 0 and len(rawnum) >= 3:
-                        try:
-                            bc, mc = int(rawnum[:-1]), int(rawnum[-1])
-                            if bc <= 99:
-                                base, mut = bc, mc
-                            else:
-                                base, mut = int(rawnum), 0
-                        except:
-                            base, mut = int(rawnum), 0
-                    else:
-                        base = int(rawnum)
-
-                if base is not None:
-                    parsed.append((base, mut))
-
-            if parsed:
-                (b, m), _ = Counter(parsed).most_common(1)[0]
-                log.debug("%s fallback chosen → base=%r, mut=%r", stat, b, m)
-
-        stats[stat] = {"base": 0 if b is None else b, "mutation": 0 if m is None else m}
-
-    return {"species": species, "stats": stats}
+        crops[stat] = gray[y0:y0+h0, x0:x0+w0]
 
-def is_invalid(scan):
-    """Return True when OCR produced obviously bogus values."""
+    stats = {}
+    keys = {}
+    for stat, crop in crops.items():
+        keys[stat] = ("stat", crop_hash(crop))
+        hit = cache.get(keys[stat])
+        if hit is not None:
+            stats[stat] = {"base": hit[0], "mutation": hit[1], "confidence": hit[2]}
+            log.debug("%s cache hit → base=%r, mut=%r", stat, hit[0], hit[1])
+    todo = {stat: crop for stat, crop in crops.items() if stat not in stats}
+
+    prims = {}
+    if todo:
+        planes = FramePlanes(gray)
+        for stat in todo:
+            x0, y0, w0, h0 = settings["stat_rois"][stat].values()
+            prims[stat] = planes.binarize(x0 - min_x, y0 - min_y, w0, h0)
+
+    # Template matches are trusted; only the remaining stats go to Tesseract
+    bank = get_templates(settings["ocr"].get("template_file", TEMPLATE_FILE))
+    threshold = settings["ocr"].get("template_threshold", TEMPLATE_THRESHOLD)
+    results = {}
+    if len(bank):
+        for stat, prim in prims.items():
+            hit = template_number(prim, bank, threshold)
+            if hit is not None:
+                results[stat] = hit
+    pending = [stat for stat in todo if stat not in results]
+
+    primary = {}
+    if settings["ocr"].get("batched", False):
+        primary = ocr_batch(
+            {stat: prims[stat] for stat in pending}, settings["ocr"]["oem"], engine
+        )
+
+    def work(stat):
+        return finish_stat(
+            stat, todo[stat], prims[stat], settings, engine, primary.get(stat)
+        )
+
+    if pool:
+        results.update(zip(pending, pool.map(work, pending)))
+    else:
+        results.update((stat, work(stat)) for stat in pending)
+
+    if species_job is not None:
+        species = species_job.result()
+        if not is_valid_species(species):
+            log.info(f"Invalid species OCR ({species!r}), skipping slot")
+            return "no_egg"
+
+    for stat, (b, m, conf) in results.items():
+        # only plausible reads are cached so is_invalid rescans retry OCR
+        if b is not None and b <= 99:
+            cache.put(keys[stat], (b, 0 if m is None else m, conf))
+        stats[stat] = {
+            "base": 0 if b is None else b,
+            "mutation": 0 if m is None else m,
+            "confidence": conf,
+        }
+
+    if timed_out:
+        report_failure(settings, "popup_delay")
+    log.debug("OCR cache: %r", cache.stats())
+    return {"species": species, "stats": {stat: stats[stat] for stat in crops}}
+
+def invalid_stats(scan):
+    """Return the stats whose values are obviously bogus."""
     # Values of 0 are legitimate, so we only guard against excessively
     # large numbers which indicate an OCR failure.
-    too_big = any(v["base"] > 99 for v in scan["stats"].values())
-    return too_big
+    return [stat for stat, v in scan["stats"].items() if v["base"] > 99]
+
+def is_invalid(scan):
+    """Return True when OCR produced obviously bogus values."""
+    return bool(invalid_stats(scan))
+
+def reread_stats(settings, stats):
+    """Re-read ``stats`` from one fresh frame of the still-open popup.
+
+    No click or popup wait is needed; only the listed ROIs are cropped and
+    they go straight to the alternate-preprocessing fallback.  Returns
+    ``{stat: (base, mutation, confidence)}`` for the stats that produced a
+    number.
+    """
+    engine = get_engine(settings["ocr"].get("engine", "auto"))
+    region = roi_region(settings)
+    full = grab_region(region, settings.get("capture_backend", "auto"))
+    fixed = {}
+    for stat in stats:
+        x0, y0, w0, h0 = settings["stat_rois"][stat].values()
+        x0 -= region[0]
+        y0 -= region[1]
+        fb = fallback_stat(full[y0:y0+h0, x0:x0+w0], engine)
+        log.debug("%s re-read → %r", stat, fb)
+        if fb is not None:
+            fixed[stat] = fb
+    return fixed
 
 def scan_slot(settings, debug=False):
-    """OCR a single slot with validation and optional re-scans."""
+    """OCR a single slot with validation and targeted re-reads.
+
+    Stats that are bogus (base above 99) or implausible for the species
+    according to the wipe's recorded progress are re-read once.  Only bogus
+    values that survive the re-read reject the scan; an implausible value
+    that reads the same twice is accepted.
+    """
     if not OCR_AVAILABLE:
         log.error("scan_slot called but OCR libraries are unavailable")
         return "ocr_unavailable"
@@ -228,23 +1213,100 @@ def scan_slot(settings, debug=False):
     if result in ("no_egg", "ocr_unavailable"):
         return result
 
-    if not is_invalid(result):
+    bad = invalid_stats(result)
+    if settings.get("plausibility_check", True):
+        wipe = settings.get("current_wipe", "default")
+        bad += [stat for stat in suspicious_stats(result, wipe) if stat not in bad]
+    if not bad:
         return result
 
-    log.warning("Initial scan invalid; performing additional passes")
-    batch = [scan_once(settings, debug) for _ in range(3)]
-    if any(x == "no_egg" for x in batch):
-        return "no_egg"
+    log.warning("Initial scan suspicious for %s; re-reading those stats", ", ".join(bad))
+    changed = False
+    for stat, (b, m, conf) in reread_stats(settings, bad).items():
+        before = result["stats"][stat]
+        changed |= (b, m) != (before["base"], before["mutation"])
+        result["stats"][stat] = {"base": b, "mutation": m, "confidence": conf}
+    # a value that reads the same twice (e.g. a real new top stat) says
+    # nothing about the popup delay
+    if changed:
+        report_failure(settings, "popup_delay")
 
-    final = {"species": batch[0]["species"], "stats": {}}
-    for stat in batch[0]["stats"]:
-        vals = [
-            (r["stats"][stat]["base"], r["stats"][stat]["mutation"]) for r in batch
-        ]
-        best = max(set(vals), key=vals.count)
-        final["stats"][stat] = {"base": best[0], "mutation": best[1]}
-
-    if is_invalid(final):
+    if is_invalid(result):
         log.warning("Rescans still produced invalid data; treating as no egg")
         return "no_egg"
-    return final
+    return result
+
+def grid_slots(settings):
+    """Screen positions of the calibrated slot grid, in inventory order.
+
+    ``slot_grid`` holds ``columns``/``rows`` and the ``dx``/``dy`` spacing
+    from the first slot at ``slot_x``/``slot_y``; without it the grid is
+    just that one slot.
+    """
+    grid = settings.get("slot_grid") or {}
+    x0, y0 = settings["slot_x"], settings["slot_y"]
+    dx, dy = grid.get("dx", 0), grid.get("dy", 0)
+    return [
+        (x0 + c * dx, y0 + r * dy)
+        for r in range(grid.get("rows", 1))
+        for c in range(grid.get("columns", 1))
+    ]
+
+def slot_settings(settings, index):
+    """Shallow copy of ``settings`` aimed at grid slot ``index``.
+
+    When the popup is drawn next to the slot (``popup_follows_slot``) the
+    species and stat ROIs move with it; otherwise they stay put.
+    """
+    x, y = grid_slots(settings)[index]
+    cfg = dict(settings)
+    cfg["slot_x"], cfg["slot_y"] = x, y
+    if (settings.get("slot_grid") or {}).get("popup_follows_slot", False):
+        ox, oy = x - settings["slot_x"], y - settings["slot_y"]
+
+        def shift(roi):
+            return {**roi, "x": roi["x"] + ox, "y": roi["y"] + oy}
+
+        cfg["species_roi"] = shift(settings["species_roi"])
+        cfg["stat_rois"] = {stat: shift(r) for stat, r in settings["stat_rois"].items()}
+    return cfg
+
+def occupied_slots(settings):
+    """Indices of grid slots holding an egg, judged from one screenshot.
+
+    Every slot cell is compared against the ``slot_grid.signatures`` taken
+    during calibration.  Without signatures all slots are returned.
+    """
+    slots = grid_slots(settings)
+    grid = settings.get("slot_grid") or {}
+    signatures = grid.get("signatures")
+    size = grid.get("slot_size")
+    if not signatures or not size:
+        return list(range(len(slots)))
+    w, h = size
+    left = min(x for x, _ in slots) - w // 2
+    top = min(y for _, y in slots) - h // 2
+    width = max(x for x, _ in slots) - left + w - w // 2
+    height = max(y for _, y in slots) - top + h - h // 2
+    frame = grab_region((left, top, width, height), settings.get("capture_backend", "auto"))
+    occupied = []
+    for i, (x, y) in enumerate(slots):
+        cx, cy = x - w // 2 - left, y - h // 2 - top
+        if popup_present(frame[cy:cy+h, cx:cx+w], signatures) is not False:
+            occupied.append(i)
+    log.debug("Occupied slots: %s of %d", occupied, len(slots))
+    return occupied
+
+def scan_grid(settings, debug=False):
+    """Scan every occupied grid slot.
+
+    Returns ``[(slot_cfg, scan)]`` in inventory order for the slots that
+    held a readable egg; ``slot_cfg`` is the ``slot_settings`` copy to act on.
+    """
+    batch = []
+    for index in occupied_slots(settings):
+        cfg = slot_settings(settings, index)
+        scan = scan_slot(cfg, debug)
+        if isinstance(scan, dict):
+            batch.append((cfg, scan))
+    return batch
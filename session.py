@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""Headless scan → decide → update → act engine.
+
+``ScanSession`` runs the live breeding loop without any UI.  Each pass goes
+through explicit stages – ``scan``, ``decide``, ``update``, ``act`` and
+``settle`` – and reports to a ``SessionCallbacks`` object, so the settings
+editor, the Discord bot and the command line all drive the same loop.  Time
+spent per stage is tracked for profiling (``timing_report()``).
+
+During ``run()`` progress, rules and history writes and all callbacks go
+through a ``BackgroundWriter`` (unless ``pipeline`` is off in the settings):
+the keep/destroy click and the next scan never wait for disk or Tk.  Progress
+stays in memory between eggs and is only re-read when another writer (e.g.
+the species tab) changed the file.
+
+A result only reaches progress and rules once its keep or destroy was
+confirmed on screen.  A dry run applies every decision to a private copy of
+progress and rules instead and never writes anything.
+
+Run headless with::
+
+    python session.py                   # until Ctrl+C
+    python session.py --max-eggs 200    # stop after 200 eggs
+    python session.py --once --dry-run  # scan and decide a single pass
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from copy import deepcopy
+
+from logger import get_logger
+log = get_logger("session")
+
+from actions import destroy_egg, keep_egg
+from background_writer import BackgroundWriter
+from breeding_logic import decide_egg, should_keep_egg
+from input_backend import close_inputs
+from progress_tracker import (
+    adjust_rules_for_females,
+    append_history,
+    append_scan_log,
+    get_progress_file,
+    increment_female_count,
+    load_progress,
+    normalize_species_name,
+    save_progress,
+    scan_record,
+    set_history_sink,
+    update_mutation_stud,
+    update_mutation_thresholds,
+    update_stud,
+)
+from scanner import (
+    close_captures,
+    close_engines,
+    grab_probe,
+    scan_grid,
+    scan_slot,
+    shutdown_pool,
+    wait_for_settle,
+)
+from species_lexicon import get_resolver
+from timing import store_profile
+
+SETTINGS_FILE = "settings.json"
+RULES_FILE = "rules.json"
+STAGES = ("scan", "decide", "update", "act", "settle")
+ALL_ACTIONS = ("keep", "destroy")
+
+
+def _discard_history(entry, wipe):
+    pass
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class SessionCallbacks:
+    """UI hooks for ``ScanSession``; the defaults only log."""
+
+    def log(self, msg: str) -> None:
+        log.info(msg)
+
+    def status(self, state: str) -> None:
+        """``state`` is one of Running, Paused or Stopped."""
+
+    def new_species(self, species: str):
+        """Return a rules entry for ``species`` or ``None`` for the default template."""
+        return None
+
+    def species_added(self, species: str) -> None:
+        pass
+
+    def egg_processed(self, result: dict) -> None:
+        pass
+
+
+class ScanSession:
+    """The live loop: scan, decide, update progress, keep or destroy."""
+
+    def __init__(self, settings, rules, callbacks=None,
+                 settings_file=SETTINGS_FILE, rules_file=RULES_FILE, gui_lock=None,
+                 dry_run=False):
+        self.settings = settings
+        # a dry run decides and updates as usual, but on copies that are never saved
+        self.dry_run = dry_run
+        self.rules = deepcopy(rules) if dry_run else rules
+        self.callbacks = callbacks or SessionCallbacks()
+        self.settings_file = settings_file
+        self.rules_file = rules_file
+        self.running = False
+        self.paused = False
+        self.eggs = 0
+        self.summary = {"studs": [], "mutations": []}
+        # stage -> [calls, total seconds]
+        self.timings = {stage: [0, 0.0] for stage in STAGES}
+        # held from the slot click to the settled slot of each pass, so other
+        # click chains (drop all, auto-eat) never land inside one
+        self.gui_lock = gui_lock if gui_lock is not None else nullcontext()
+        # set while run() pipelines persistence and callbacks
+        self.writer = None
+        # guards progress and rules against the writer's snapshots
+        self._lock = threading.RLock()
+        # wipe -> {"data", "gen", "saved", "mtime"}; gen counts updates,
+        # saved is the gen last written and mtime the file's after that write
+        self._progress = {}
+        self._history = []
+        self._scans = []
+        # history sink for the update functions; None means record_history
+        self._sink = _discard_history if dry_run else None
+
+    # ─── helpers ────────────────────────────────────
+    def _timed(self, stage, start):
+        entry = self.timings[stage]
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+
+    def timing_report(self) -> dict:
+        """``{stage: {"calls": n, "mean_ms": ms}}`` for the stages run so far."""
+        return {
+            stage: {"calls": n, "mean_ms": total * 1000 / n}
+            for stage, (n, total) in self.timings.items() if n
+        }
+
+    def _defer(self, fn, *args, key=None):
+        """Run ``fn`` on the writer while pipelining, otherwise right away."""
+        if self.writer is None:
+            fn(*args)
+        else:
+            self.writer.submit(fn, *args, key=key)
+
+    def _log(self, msg):
+        self._defer(self.callbacks.log, msg)
+
+    def save_rules(self):
+        if not self.dry_run:
+            self._defer(self._write_rules, key="rules")
+
+    def _write_rules(self):
+        with self._lock:
+            text = json.dumps(self.rules, indent=2)
+        with open(self.rules_file, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def load_progress(self, wipe):
+        """In-memory progress for ``wipe``; re-read when the file changed under us."""
+        with self._lock:
+            entry = self._progress.get(wipe)
+            path = get_progress_file(wipe)
+            if entry is None or (entry["gen"] == entry["saved"] and _mtime(path) != entry["mtime"]):
+                data = load_progress(wipe)
+                entry = {"data": data, "gen": 0, "saved": 0, "mtime": _mtime(path)}
+                self._progress[wipe] = entry
+            return entry["data"]
+
+    def save_progress(self, wipe):
+        with self._lock:
+            # an unsaved gen also keeps a dry run's copy from being re-read
+            self._progress[wipe]["gen"] += 1
+        if not self.dry_run:
+            self._defer(self._write_progress, wipe, key=("progress", wipe))
+
+    def _write_progress(self, wipe):
+        with self._lock:
+            entry = self._progress[wipe]
+            gen = entry["gen"]
+            # the loop keeps mutating the live dict while this one is written
+            data = entry["data"] if self.writer is None else deepcopy(entry["data"])
+        save_progress(data, wipe)
+        with self._lock:
+            entry["saved"] = gen
+            entry["mtime"] = _mtime(get_progress_file(wipe))
+
+    def _queue_history(self, entry, wipe):
+        with self._lock:
+            self._history.append((entry, wipe))
+        self._defer(self._write_history, key="history")
+
+    def _queue_scan(self, result):
+        record = scan_record(result["egg"], result["species"], result["sex"], result["stats"])
+        with self._lock:
+            self._scans.append((record, result["wipe"]))
+        self._defer(self._write_scans, key="scans")
+
+    def _write_scans(self):
+        with self._lock:
+            queued, self._scans = self._scans, []
+        by_wipe = {}
+        for record, wipe in queued:
+            by_wipe.setdefault(wipe, []).append(record)
+        for wipe, records in by_wipe.items():
+            append_scan_log(records, wipe)
+
+    def _write_history(self):
+        with self._lock:
+            queued, self._history = self._history, []
+        by_wipe = {}
+        for entry, wipe in queued:
+            by_wipe.setdefault(wipe, []).append(entry)
+        for wipe, entries in by_wipe.items():
+            append_history(entries, wipe)
+
+    def debug_enabled(self) -> bool:
+        debug_cfg = self.settings.get("debug_mode", False)
+        if isinstance(debug_cfg, dict):
+            return debug_cfg.get("breeding_logic", False)
+        return bool(debug_cfg)
+
+    def species_config(self, normalized):
+        """Rules entry for ``normalized``, adding new species on the way."""
+        config = self.rules.get(normalized)
+        if config is not None:
+            return config, False
+        cfg = None
+        if self.settings.get("monitored_scan", True):
+            if self.writer is not None:
+                # keep the log in order before blocking on the prompt
+                self.writer.flush()
+            self.callbacks.log(f"⏸ New species detected: {normalized}")
+            self.callbacks.status("Paused")
+            cfg = self.callbacks.new_species(normalized)
+            self.callbacks.status("Running")
+        if cfg is None:
+            cfg = deepcopy(self.settings.get("default_species_template", {}))
+        modes = set(cfg.get("modes", []))
+        modes.add("automated")
+        cfg["modes"] = list(modes)
+        with self._lock:
+            self.rules[normalized] = cfg
+        # the rules file is written later; match against the new key now
+        get_resolver().add(normalized)
+        self.save_rules()
+        self._log(f"✔ Added {normalized} to rules")
+        return cfg, True
+
+    # ─── stages ─────────────────────────────────────
+    def scan(self):
+        """Return ``[(slot_cfg, scan)]`` for the eggs on screen."""
+        if self.settings.get("multi_slot", False):
+            return scan_grid(self.settings)
+        scan = scan_slot(self.settings)
+        return [] if scan == "no_egg" else [(self.settings, scan)]
+
+    def decide(self, scan) -> dict:
+        egg = scan["species"]
+        sex = "female" if "female" in egg.lower() else "male"
+        normalized = normalize_species_name(egg)
+        config, new_species = self.species_config(normalized)
+        wipe = self.settings.get("current_wipe", "default")
+        progress = self.load_progress(wipe)
+        # the compiled evaluator skips the reason strings debug output needs
+        evaluate = should_keep_egg if self.debug_enabled() else decide_egg
+        decision, reasons = evaluate(
+            {"egg": egg, "sex": sex, "stats": scan["stats"]},
+            config,
+            progress
+        )
+        return {
+            "egg": egg,
+            "sex": sex,
+            "species": normalized,
+            "stats": scan["stats"],
+            "config": config,
+            "progress": progress,
+            "wipe": wipe,
+            "decision": decision,
+            "reasons": reasons,
+            "new_species": new_species,
+        }
+
+    def update(self, result: dict, apply: bool = True) -> None:
+        """Apply ``result`` to progress and rules, then save and report it.
+
+        With ``apply`` false the result is only reported: its action was not
+        carried out, so the egg is still in the inventory.
+        """
+        result["applied"] = apply
+        if apply:
+            with self._lock:
+                self._apply(result)
+            self.save_progress(result["wipe"])
+            # the stream simulator.py replays with other rules
+            if self.settings.get("record_scans", False) and not self.dry_run:
+                self._queue_scan(result)
+        if result["new_species"]:
+            self._defer(self.callbacks.species_added, result["species"])
+        self._defer(self._report, result)
+
+    def _apply(self, result: dict) -> None:
+        egg, sex, stats = result["egg"], result["sex"], result["stats"]
+        normalized, config = result["species"], result["config"]
+        progress, wipe = result["progress"], result["wipe"]
+        reasons = result["reasons"]
+
+        # Track kept females and adjust rules automatically
+        if result["decision"] == "keep" and sex == "female":
+            count = increment_female_count(egg, progress, sex)
+            if adjust_rules_for_females(normalized, progress, self.rules, self.settings.get("default_species_template")):
+                self.save_rules()
+                self._log(f"⚙ Rules updated for {normalized} (females={count})")
+
+        # update thresholds only if mutations rule passed
+        if reasons.get("mutations"):
+            updated_thresholds = update_mutation_thresholds(
+                egg, stats, config, progress, sex, wipe, sink=self._sink
+            )
+        else:
+            updated_thresholds = False
+
+        # and only then update stud logic
+        updated_stud = (
+            update_stud(egg, stats, config, progress, wipe, sink=self._sink)
+            if sex == "male"
+            else False
+        )
+        updated_mstud = (
+            update_mutation_stud(egg, stats, config, progress)
+            if sex == "male"
+            else False
+        )
+
+        # record for summary
+        if updated_thresholds:
+            curr = progress[normalized]["mutation_thresholds"].copy()
+            self.summary["mutations"].append((normalized, curr))
+        if updated_stud:
+            self.summary["studs"].append((normalized, stats))
+
+        result.update({
+            "updated_thresholds": updated_thresholds,
+            "updated_stud": updated_stud,
+            "updated_mutation_stud": updated_mstud,
+        })
+
+    def _report(self, result: dict) -> None:
+        egg, reasons = result["egg"], result["reasons"]
+        self.callbacks.log(f"→ {egg}: {result['decision'].upper()}")
+        for k, v in reasons.items():
+            if k != "_debug" and v:
+                self.callbacks.log(f"  ✔ {k}")
+        if self.debug_enabled() and "_debug" in reasons:
+            for k, v in reasons["_debug"].items():
+                self.callbacks.log(f"    debug[{k}]: {v}")
+        self.callbacks.egg_processed(result)
+
+    def act(self, decision, cfg, popup_open=True) -> bool:
+        """Keep or destroy the egg in the slot ``cfg`` points at.
+
+        Returns ``False`` when the action could not be confirmed on screen.
+        """
+        if decision == "keep":
+            ok = keep_egg(cfg, popup_open)
+            self._log("✔ Egg auto-kept via double-click" if ok else "⚠ Keep not confirmed")
+        else:
+            ok = destroy_egg(cfg)
+            self._log("✖ Egg destroyed via right-click chain" if ok else "⚠ Destroy not confirmed")
+        return ok
+
+    # ─── loop ───────────────────────────────────────
+    def step(self, actions=ALL_ACTIONS) -> list:
+        """Run one pass and return its results (empty when no egg was found).
+
+        ``actions`` limits which decisions are carried out; the test-scan
+        button only keeps.  Only carried out decisions update progress, and a
+        dry run acts on nothing but updates its private copies as if it had.
+        """
+        with self.gui_lock:
+            return self._step(actions)
+
+    def _step(self, actions):
+        start = time.perf_counter()
+        batch = self.scan()
+        self._timed("scan", start)
+        if not batch:
+            return []
+
+        results = []
+        for cfg, scan in batch:
+            start = time.perf_counter()
+            results.append((cfg, self.decide(scan)))
+            self._timed("decide", start)
+        self.eggs += len(results)
+        if self.dry_run:
+            done = [r for _, r in results if r["decision"] in ALL_ACTIONS]
+            todo = []
+        else:
+            done = []
+            todo = [(cfg, r) for cfg, r in results if r["decision"] in actions]
+
+        if todo:
+            # the popup of the last scanned slot is still open
+            last = batch[-1][0]
+            before = grab_probe(last)
+            start = time.perf_counter()
+            # act on the last slot first: the inventory closes the gap
+            # behind a removed egg, which would shift every later slot
+            for i, (cfg, result) in enumerate(reversed(todo)):
+                if not self.act(result["decision"], cfg, popup_open=i == 0 and cfg is last):
+                    # the inventory no longer matches the scans
+                    self._log("↻ Action unconfirmed; rescanning")
+                    break
+                done.append(result)
+            self._timed("act", start)
+
+        # in inventory order, overlapping the slot settling
+        for _, result in results:
+            start = time.perf_counter()
+            self.update(result, apply=any(r is result for r in done))
+            self._timed("update", start)
+
+        if todo:
+            start = time.perf_counter()
+            wait_for_settle(last, before)
+            self._timed("settle", start)
+        return [r for _, r in results]
+
+    def run(self, max_eggs=None, duration=None, actions=ALL_ACTIONS) -> None:
+        """Loop until ``stop()``, ``max_eggs`` eggs or ``duration`` seconds."""
+        self.running = True
+        self.paused = False
+        self.callbacks.status("Running")
+        self.callbacks.log("▶️ Live scanning started (F8 to run, F9 to pause/resume, ESC to exit)")
+        if self.settings.get("pipeline", True):
+            self.writer = BackgroundWriter("session-writer")
+            previous_sink = set_history_sink(self._queue_history)
+        started = time.monotonic()
+        try:
+            while self.running:
+                if self.paused:
+                    time.sleep(0.1)
+                    continue
+                if not self.step(actions):
+                    self._log("→ No egg detected.")
+                    time.sleep(self.settings.get("scan_loop_delay", 0.5))
+                if max_eggs is not None and self.eggs >= max_eggs:
+                    break
+                if duration is not None and time.monotonic() - started >= duration:
+                    break
+        finally:
+            if self.writer is not None:
+                set_history_sink(previous_sink)
+            self.close()
+
+    def stop(self) -> None:
+        self.running = False
+
+    def close(self) -> None:
+        self.running = False
+        if self.writer is not None:
+            # everything queued still reaches disk and the UI
+            self.writer.close()
+            self.writer = None
+        if store_profile(self.settings):
+            with open(self.settings_file, "w", encoding="utf-8") as f:
+                json.dump(self.settings, f, indent=2)
+            self.callbacks.log("⏱ Timing profile saved")
+        shutdown_pool()
+        close_engines()
+        close_captures()
+        close_inputs()
+        log.info("Stage timings: %r", self.timing_report())
+        self.callbacks.log("⏹ Scanning stopped.")
+        self.callbacks.status("Stopped")
+
+
+class ConsoleCallbacks(SessionCallbacks):
+    def log(self, msg):
+        print(msg, flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the egg scan loop without the settings editor.")
+    parser.add_argument("--settings", default=SETTINGS_FILE, help="settings file (default: %(default)s)")
+    parser.add_argument("--rules", default=RULES_FILE, help="rules file (default: %(default)s)")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    parser.add_argument("--max-eggs", type=int, help="stop after this many eggs")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--dry-run", action="store_true", help="decide but never keep or destroy")
+    args = parser.parse_args(argv)
+
+    with open(args.settings, "r", encoding="utf-8") as f:
+        settings = json.load(f)
+    with open(args.rules, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    session = ScanSession(
+        settings, rules, ConsoleCallbacks(), args.settings, args.rules, dry_run=args.dry_run,
+    )
+    try:
+        if args.once:
+            try:
+                if not session.step():
+                    print("→ No egg detected.")
+            finally:
+                session.close()
+        else:
+            session.run(args.max_eggs, args.duration)
+    except KeyboardInterrupt:
+        pass  # the session has already closed itself
+    for stage, stats in session.timing_report().items():
+        print(f"{stage:>7}: {stats['calls']:5d} calls, {stats['mean_ms']:8.1f} ms avg")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Replay a recorded scan stream with alternative rules ("what-if").
+
+With ``record_scans`` on, the live loop appends every egg it decides to
+``wipes/<wipe>/scan_log.jsonl``.  ``simulate`` replays such a stream through
+the breeding logic and the ``progress_tracker`` update functions with changed
+rules and reports how many eggs would have been kept, how studs, top stats
+and mutation thresholds would have evolved, and when targets are reached.
+
+A scenario is a JSON object::
+
+    {"name": "stamina females",
+     "rules": {"*": {"top_stat_females_stats": ["health", "melee", "stamina"]}},
+     "automated_thresholds": [10, 80]}
+
+``rules`` entries are merged into each species' rules (``"*"`` applies to
+every species); ``automated_thresholds`` replaces the female counts (5, 96)
+at which automated species switch modes.
+
+Replays are fast because eggs are evaluated in batches: the compiled rules of
+a species (``rule_compiler``) are run over the upcoming eggs at once.  Eggs
+before the first one that changes progress are settled in bulk (destroyed,
+or kept females counted), and only that egg goes through the real update
+functions before the rules are recompiled.  Progress is copy-on-write, so
+scenarios share the starting progress and only copy the species they touch.
+
+A replay touches no shared state: the update functions get the recorded
+species and a private history sink, so a live session in the same process
+keeps its name resolution, history and plausibility model to itself.
+
+    python simulator.py --scenario stamina.json --target '{"*": {"mutation_thresholds": {"melee": 20}}}'
+"""
+import argparse
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from copy import deepcopy
+
+import numpy as np
+
+from logger import get_logger
+log = get_logger("simulator")
+
+import progress_tracker
+from progress_tracker import (
+    AUTOMATED_THRESHOLDS,
+    adjust_rules_for_females,
+    ensure_species,
+    get_scan_log_file,
+    increment_female_count,
+    load_progress,
+    update_mutation_stud,
+    update_mutation_thresholds,
+    update_stud,
+)
+from rule_compiler import MODE_BITS, MODES, MUTATIONS, STAT_ORDER, CompiledRules
+
+# eggs evaluated ahead after a progress change; doubles while nothing changes
+WINDOW = 64
+MAX_WINDOW = 65536
+
+
+class SpeciesStream:
+    """The recorded eggs of one species as arrays."""
+
+    __slots__ = ("species", "index", "eggs", "bases", "muts", "female", "ts")
+
+    def __init__(self, species, index, eggs, bases, muts, female, ts):
+        self.species = species
+        self.index = np.asarray(index, dtype=np.int64)
+        self.eggs = eggs
+        self.bases = np.asarray(bases, dtype=np.int64).reshape(-1, len(STAT_ORDER))
+        self.muts = np.asarray(muts, dtype=np.int64).reshape(-1, len(STAT_ORDER))
+        self.female = np.asarray(female, dtype=bool)
+        self.ts = np.asarray(ts, dtype=float)
+
+    def __len__(self):
+        return len(self.female)
+
+
+class ScanStream:
+    """A recorded scan stream, split by species."""
+
+    def __init__(self, records):
+        columns = {}
+        count = 0
+        for i, rec in enumerate(records):
+            col = columns.setdefault(rec["species"], ([], [], [], [], [], []))
+            stats = rec["stats"]
+            col[0].append(i)
+            col[1].append(rec["egg"])
+            col[2].append([stats.get(st, (0, 0))[0] for st in STAT_ORDER])
+            col[3].append([stats.get(st, (0, 0))[1] for st in STAT_ORDER])
+            col[4].append(rec["sex"] == "female")
+            col[5].append(rec.get("ts", 0.0))
+            count = i + 1
+        self.count = count
+        self.species = {
+            name: SpeciesStream(name, *col) for name, col in columns.items()
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "ScanStream":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+
+class CowProgress(dict):
+    """Progress that copies a species entry from ``base`` on first access.
+
+    The update functions mutate nested dicts in place, so any access hands
+    out this scenario's own copy and ``base`` is never modified.
+    """
+
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+
+    def __missing__(self, key):
+        if key in self.base:
+            value = self[key] = deepcopy(self.base[key])
+            return value
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self.base
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def scenario_rules(rules: dict, overrides: dict) -> dict:
+    """Copy of ``rules`` with the scenario's per-species overrides merged in."""
+    rules = deepcopy(rules)
+    for species, entry in rules.items():
+        entry.update(deepcopy(overrides.get("*", {})))
+        entry.update(deepcopy(overrides.get(species, {})))
+    for species, entry in overrides.items():
+        if species != "*" and species not in rules:
+            rules[species] = deepcopy(entry)
+    return rules
+
+
+def progress_changes(compiled: CompiledRules, bases, muts):
+    """Male eggs that would change progress even when destroyed.
+
+    ``update_stud`` and ``update_mutation_stud`` run for every male egg;
+    their conditions are evaluated here for the whole batch.
+    """
+    idx = list(compiled.mut_idx)
+    changes = (
+        (muts[:, idx] == np.array(compiled.mut_thresh))
+        & (bases[:, idx] > np.array(compiled.mut_stud))
+    ).any(axis=1)
+    idx = list(compiled.merge_idx)
+    b = bases[:, idx]
+    matches = (b >= np.array(compiled.merge_top)).sum(axis=1)
+    changes |= (matches > compiled.stud_count) | (
+        (matches == compiled.stud_count) & (matches > 0)
+        & (b > np.array(compiled.merge_stud)).any(axis=1)
+    )
+    return changes
+
+
+def target_reached(entry: dict, target: dict) -> bool:
+    """``target`` is ``{"female_count": n, "top_stats": {...}, ...}``."""
+    for key, want in target.items():
+        if key == "female_count":
+            if entry.get("female_count", 0) < want:
+                return False
+        elif any(entry.get(key, {}).get(stat, 0) < v for stat, v in want.items()):
+            return False
+    return True
+
+
+class _OtherThreads(logging.Filter):
+    """Drop INFO and below logged by one thread; other threads log as usual."""
+
+    def __init__(self, thread: int):
+        super().__init__()
+        self.thread = thread
+
+    def filter(self, record) -> bool:
+        return record.thread != self.thread or record.levelno >= logging.WARNING
+
+
+@contextmanager
+def _quiet():
+    """Silence this thread's per-update INFO logging while replaying."""
+    quiet = _OtherThreads(threading.get_ident())
+    progress_tracker.log.addFilter(quiet)
+    try:
+        yield
+    finally:
+        progress_tracker.log.removeFilter(quiet)
+
+
+def _females_until_change(name, rules, state, thresholds, target):
+    """Kept females after which the modes or the target may change, or ``None``."""
+    count = state.get(name, {}).get("female_count", 0)
+    bounds = []
+    if "automated" in rules[name].get("modes", []):
+        bounds += [t for t in thresholds if t > count]
+    if target is not None and target.get("female_count", 0) > count:
+        bounds.append(target["female_count"])
+    return min(bounds) - count if bounds else None
+
+
+def _replay_species(s, rules, state, thresholds, target, default_template):
+    name = s.species
+    if name not in rules:
+        cfg = deepcopy(default_template or {})
+        cfg["modes"] = list(set(cfg.get("modes", [])) | {"automated"})
+        rules[name] = cfg
+    n = len(s)
+    kept = kept_females = 0
+    modes = dict.fromkeys(MODES, 0)
+    trajectory = {"top_stats": [], "mutation_thresholds": [], "stud": []}
+    hit = None
+    if target is not None and target_reached(state.get(name, {}), target):
+        hit = {"egg_index": None, "eggs": 0, "seconds": 0.0}
+
+    # egg being processed, for history entries recorded by the update functions
+    current = [0]
+
+    def sink(entry, wipe):
+        i = current[0]
+        trajectory[entry[1]].append((int(s.index[i]), float(s.ts[i]), entry[2], entry[3]))
+
+    pos = 0
+    window = WINDOW
+    compiled = None
+    while pos < n:
+        if compiled is None:
+            compiled = CompiledRules(name, rules[name], state.get(name, {}), thresholds)
+            extra = len(compiled.order) - len(STAT_ORDER)
+            females_left = _females_until_change(
+                name, rules, state, thresholds, target if hit is None else None,
+            )
+        end = min(n, pos + window)
+        b, m, f = s.bases[pos:end], s.muts[pos:end], s.female[pos:end]
+        if extra:
+            b = np.pad(b, ((0, 0), (0, extra)))
+            m = np.pad(m, ((0, 0), (0, extra)))
+        masks = compiled.evaluate_batch(b, m, f)
+        kept_female = f & (masks != 0)
+        events = ~f & ((masks != 0) | progress_changes(compiled, b, m))
+        if females_left is not None:
+            females = np.flatnonzero(kept_female)
+            if len(females) >= females_left:
+                events[females[females_left - 1]] = True
+        events = np.flatnonzero(events)
+        stop = int(events[0]) if len(events) else len(masks)
+
+        # kept females before the event only raise the female count
+        bulk = masks[:stop][kept_female[:stop]]
+        if len(bulk):
+            kept += len(bulk)
+            kept_females += len(bulk)
+            for mode in MODES:
+                modes[mode] += int(np.count_nonzero(bulk & MODE_BITS[mode]))
+            ensure_species(state, name)
+            state[name]["female_count"] += len(bulk)
+            if females_left is not None:
+                females_left -= len(bulk)
+        if not len(events):
+            pos = end
+            window = min(window * 2, MAX_WINDOW)
+            continue
+
+        i = pos + stop
+        mask = int(masks[stop])
+        pos = i + 1
+        window = WINDOW
+        compiled = None
+        current[0] = i
+
+        female = bool(s.female[i])
+        sex = "female" if female else "male"
+        egg = s.eggs[i]
+        stats = {
+            st: {"base": int(s.bases[i, j]), "mutation": int(s.muts[i, j])}
+            for j, st in enumerate(STAT_ORDER)
+        }
+        if mask:
+            kept += 1
+            for mode in MODES:
+                if mask & MODE_BITS[mode]:
+                    modes[mode] += 1
+        # same order of updates as ScanSession.update
+        if mask and female:
+            kept_females += 1
+            increment_female_count(egg, state, sex, species=name)
+            adjust_rules_for_females(name, state, rules, default_template, thresholds)
+        config = rules[name]
+        if mask & MUTATIONS:
+            update_mutation_thresholds(egg, stats, config, state, sex, species=name, sink=sink)
+        if not female:
+            if update_stud(egg, stats, config, state, species=name, sink=sink):
+                trajectory["stud"].append(
+                    (int(s.index[i]), float(s.ts[i]), dict(state[name]["stud"]))
+                )
+            update_mutation_stud(egg, stats, config, state, species=name)
+
+        if hit is None and target is not None and target_reached(state[name], target):
+            hit = {
+                "egg_index": int(s.index[i]),
+                "eggs": i + 1,
+                "seconds": float(s.ts[i] - s.ts[0]),
+            }
+
+    entry = state.get(name, {})
+    return {
+        "eggs": n,
+        "kept": kept,
+        "kept_females": kept_females,
+        "modes": modes,
+        "female_count": entry.get("female_count", 0),
+        "stud": dict(entry.get("stud", {})),
+        "top_stats": dict(entry.get("top_stats", {})),
+        "mutation_thresholds": dict(entry.get("mutation_thresholds", {})),
+        "mutation_stud": dict(entry.get("mutation_stud", {})),
+        "trajectory": trajectory,
+        "target": hit,
+    }
+
+
+def simulate(stream, rules, progress=None, scenario=None, targets=None, default_template=None) -> dict:
+    """Replay ``stream`` under ``scenario``; neither ``rules`` nor ``progress`` change.
+
+    ``targets`` maps species (or ``"*"``) to a ``target_reached`` target;
+    each species reports the egg at which its target was first met.
+    """
+    scenario = scenario or {}
+    targets = targets or {}
+    rules = scenario_rules(rules, scenario.get("rules", {}))
+    thresholds = tuple(scenario.get("automated_thresholds", AUTOMATED_THRESHOLDS))
+    state = CowProgress(progress or {})
+    report = {
+        "name": scenario.get("name", "baseline"),
+        "eggs": stream.count,
+        "kept": 0,
+        "kept_females": 0,
+        "modes": dict.fromkeys(MODES, 0),
+        "species": {},
+    }
+    with _quiet():
+        for name, s in stream.species.items():
+            result = _replay_species(
+                s, rules, state, thresholds,
+                targets.get(name, targets.get("*")), default_template,
+            )
+            report["species"][name] = result
+            report["kept"] += result["kept"]
+            report["kept_females"] += result["kept_females"]
+            for mode, count in result["modes"].items():
+                report["modes"][mode] += count
+    return report
+
+
+def compare(stream, rules, scenarios, progress=None, targets=None, default_template=None) -> list:
+    """Reports for the current rules followed by each scenario."""
+    return [
+        simulate(stream, rules, progress, scenario, targets, default_template)
+        for scenario in [{"name": "baseline"}, *scenarios]
+    ]
+
+
+def format_report(reports: list) -> str:
+    base = reports[0]
+    lines = []
+    for rep in reports:
+        delta = rep["kept"] - base["kept"]
+        lines.append(
+            f"{rep['name']}: kept {rep['kept']}/{rep['eggs']} ({delta:+d})"
+            f", females {rep['kept_females']}"
+        )
+        lines.append("  " + ", ".join(f"{m} {c}" for m, c in rep["modes"].items()))
+        for species, res in rep["species"].items():
+            line = f"  {species}: kept {res['kept']}/{res['eggs']}"
+            if res["target"] is not None:
+                t = res["target"]
+                line += f", target after {t['eggs']} eggs ({t['seconds'] / 3600:.1f} h)"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded scans with alternative rules.")
+    parser.add_argument("--settings", default="settings.json")
+    parser.add_argument("--rules", default="rules.json")
+    parser.add_argument("--wipe", help="wipe whose scan log to replay (default: current_wipe)")
+    parser.add_argument("--stream", help="scan log to replay instead of the wipe's")
+    parser.add_argument("--scenario", action="append", default=[],
+                        help="JSON file with one scenario or a list of them")
+    parser.add_argument("--target", help="JSON targets, e.g. '{\"*\": {\"female_count\": 50}}'")
+    parser.add_argument("--from-progress", action="store_true",
+                        help="start from the wipe's current progress instead of empty progress")
+    parser.add_argument("--json", help="also write the full reports to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.settings, "r", encoding="utf-8") as f:
+        settings = json.load(f)
+    with open(args.rules, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    wipe = args.wipe or settings.get("current_wipe", "default")
+    scenarios = []
+    for path in args.scenario:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        scenarios.extend(data if isinstance(data, list) else [data])
+
+    stream = ScanStream.load(args.stream or get_scan_log_file(wipe))
+    progress = load_progress(wipe) if args.from_progress else {}
+    reports = compare(
+        stream, rules, scenarios, progress,
+        json.loads(args.target) if args.target else None,
+        settings.get("default_species_template"),
+    )
+    print(format_report(reports))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
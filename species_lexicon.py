@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Snap noisy species-line OCR onto the set of known species.
+
+The popup's species line reads like ``"CS Rex Male"``.  OCR often garbles a
+letter or two, which used to make the scan look invalid and cost a full
+rescan.  ``SpeciesLexicon`` matches each part of the line against what it
+can be: the ``CS`` prefix, the sex token and the species names from
+``rules.json``/``extra_tames.json`` (via a BK-tree edit-distance index).
+
+``SpeciesResolver`` backs ``progress_tracker.normalize_species_name``: the
+same ``difflib`` fuzzy match against the rules keys, but over candidates
+pre-filtered by the BK-tree and with a memo of raw names already resolved.
+"""
+import json
+import os
+import re
+from difflib import get_close_matches
+
+from logger import get_logger
+log = get_logger("species_lexicon")
+
+RULES_FILE = "rules.json"
+EXTRA_TAMES_FILE = "extra_tames.json"
+# difflib similarity a rules key needs to replace the cleaned name
+CUTOFF = 0.8
+# remembered raw names (raw → canonical species)
+MAX_RESOLVED = 4096
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance between ``a`` and ``b``."""
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree for edit-distance lookups."""
+
+    def __init__(self, words=()):
+        self.root = None
+        self.size = 0
+        for w in words:
+            self.add(w)
+
+    def add(self, word: str) -> None:
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            d = levenshtein(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def closest(self, word: str, max_dist: int):
+        """Return ``(match, distance)`` for the nearest word within ``max_dist``."""
+        best = (None, max_dist + 1)
+        stack = [self.root] if self.root else []
+        while stack:
+            node_word, children = stack.pop()
+            d = levenshtein(word, node_word)
+            if d < best[1]:
+                best = (node_word, d)
+            limit = min(max_dist, best[1])
+            for dist, child in children.items():
+                if d - limit <= dist <= d + limit:
+                    stack.append(child)
+        return best if best[0] is not None else (None, None)
+
+    def within(self, word: str, max_dist: int) -> list:
+        """Return every ``(match, distance)`` within ``max_dist`` of ``word``."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_word, children = stack.pop()
+            d = levenshtein(word, node_word)
+            if d <= max_dist:
+                found.append((node_word, d))
+            for dist, child in children.items():
+                if d - max_dist <= dist <= d + max_dist:
+                    stack.append(child)
+        return found
+
+
+def _load_keys(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return list(data) if isinstance(data, dict) else []
+
+
+class SpeciesLexicon:
+    """Known species names, indexed for snapping OCR text onto them."""
+
+    def __init__(self, names):
+        self.names = {}
+        for name in names:
+            key = name.lower().strip()
+            # keys recorded from unsnapped OCR ("Cs  Tek Stegosaurus 223")
+            if key and not key.startswith("cs ") and not any(c.isdigit() for c in key):
+                self.names.setdefault(key, name)
+        self.tree = BKTree(self.names)
+
+    def match(self, text: str):
+        """Return the canonical species closest to ``text`` or ``None``."""
+        key = text.lower().strip()
+        if not key:
+            return None
+        if key in self.names:
+            return self.names[key]
+        word, dist = self.tree.closest(key, max(1, len(key) // 4))
+        if word is None:
+            return None
+        log.debug("species %r snapped to %r (distance %d)", text, self.names[word], dist)
+        return self.names[word]
+
+    def snap(self, raw: str) -> str:
+        """Rewrite a raw species line as ``"CS <Species> <Male|Female>"``.
+
+        Unknown species keep their cleaned OCR text.  When neither the ``CS``
+        prefix nor the sex can be recognised the raw text is returned.
+        """
+        tokens = re.sub(r"[^\w\s]", " ", raw).split()
+        cs = False
+        sex = None
+        rest = []
+        for i, tok in enumerate(tokens):
+            low = tok.lower()
+            # "rn" is how OCR most often misreads the "m" in "male"
+            sex_tok = low.replace("rn", "m")
+            if i == 0 and len(low) == 2 and levenshtein(low, "cs") <= 1:
+                cs = True
+            elif sex is None and levenshtein(sex_tok, "female") <= 1:
+                sex = "Female"
+            elif sex is None and levenshtein(sex_tok, "male") <= 1:
+                sex = "Male"
+            elif not low.isdigit():
+                rest.append(tok)
+        if not cs or sex is None:
+            return raw
+        name = " ".join(rest)
+        species = self.match(name) or name
+        return f"CS {species} {sex}"
+
+
+class SpeciesResolver:
+    """``get_close_matches(name, keys, n=1, cutoff)`` over an edit-distance index.
+
+    A difflib ratio of at least ``cutoff`` bounds the edit distance: with
+    ``M`` matched characters and ``T`` the combined length, the distance is
+    at most ``T - 2M <= (1 - cutoff) * T`` and ``T <= 2 * len(name) / cutoff``.
+    Only keys within that distance are handed to difflib, so the result is
+    the same as matching against every key.
+    """
+
+    def __init__(self, names, cutoff: float = CUTOFF):
+        self.cutoff = cutoff
+        self.names = set(names)
+        self.tree = BKTree(self.names)
+        self.resolved = {}
+
+    def max_distance(self, word: str) -> int:
+        return int(2 * (1 - self.cutoff) * len(word) / self.cutoff + 1e-9)
+
+    def match(self, word: str):
+        """Return the closest key with a difflib ratio ≥ ``cutoff`` or ``None``."""
+        if word in self.names:
+            return word
+        if not word:
+            return None
+        candidates = [w for w, _ in self.tree.within(word, self.max_distance(word))]
+        matches = get_close_matches(word, candidates, n=1, cutoff=self.cutoff)
+        return matches[0] if matches else None
+
+    def add(self, name: str) -> None:
+        """Index a species added to the rules in memory."""
+        if name not in self.names:
+            self.names.add(name)
+            self.tree.add(name)
+            # earlier raw names may be closer to the new key
+            self.resolved.clear()
+
+    def remember(self, raw: str, species: str) -> None:
+        if len(self.resolved) >= MAX_RESOLVED:
+            self.resolved.pop(next(iter(self.resolved)))
+        self.resolved[raw] = species
+
+
+_lexicon = None
+_lexicon_stamp = None
+_resolver = None
+_resolver_stamp = None
+# bumped by ``invalidate_species_index`` when rules change in memory
+_rules_generation = 0
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_lexicon(rules_file: str = RULES_FILE, extra_file: str = EXTRA_TAMES_FILE) -> SpeciesLexicon:
+    """Return the shared lexicon, rebuilt when either source file changes."""
+    global _lexicon, _lexicon_stamp
+    stamp = (rules_file, _mtime(rules_file), extra_file, _mtime(extra_file))
+    if _lexicon is None or stamp != _lexicon_stamp:
+        _lexicon = SpeciesLexicon(_load_keys(rules_file) + _load_keys(extra_file))
+        _lexicon_stamp = stamp
+        log.debug("species lexicon rebuilt with %d names", len(_lexicon.names))
+    return _lexicon
+
+
+def invalidate_species_index() -> None:
+    """Drop the cached resolver after species were added, renamed or removed in memory."""
+    global _rules_generation
+    _rules_generation += 1
+
+
+def get_resolver(rules_file: str = RULES_FILE) -> SpeciesResolver:
+    """Return the shared resolver, rebuilt when the rules change on disk or in memory."""
+    global _resolver, _resolver_stamp
+    stamp = (rules_file, _mtime(rules_file), _rules_generation)
+    if _resolver is None or stamp != _resolver_stamp:
+        _resolver = SpeciesResolver(_load_keys(rules_file))
+        _resolver_stamp = stamp
+        log.debug("species resolver rebuilt with %d names", len(_resolver.names))
+    return _resolver
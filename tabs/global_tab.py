@@ -61,7 +61,7 @@ def build_global_tab(app):
         )
         spin.grid(row=row, column=1, sticky="w", padx=5, pady=2)
         tip_map = {
-            "Popup Delay": "Time to wait after clicking before reading the popup",
+            "Popup Delay": "Longest time to wait for the popup after clicking before reading it",
             "Action Delay": "Interval between automated mouse actions",
             "Scan Loop Delay": "Pause between each scan cycle",
         }
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, simpledialog
-import time
-from scanner import scan_slot
+from session import ScanSession, SessionCallbacks
 from utils.helpers import add_tooltip
 from utils.calibration import run_calibration as calibration_wizard
 from utils.dialogs import show_error
@@ -10,13 +9,6 @@ FONT = ("Segoe UI", 10)
 
 # Prevent pytest from treating this UI module as a test
 __test__ = False
-from breeding_logic import should_keep_egg
-from progress_tracker import (
-    load_progress, save_progress,
-    update_mutation_thresholds,
-    update_stud, update_mutation_stud,
-    normalize_species_name
-)
 
 
 def prompt_new_species(app, species):
@@ -95,62 +87,31 @@ def build_test_tab(app):
 
 
 
+class _ConsoleCallbacks(SessionCallbacks):
+    """Print session output; ask about new species like the live loop does."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def log(self, msg):
+        print(msg)
+
+    def new_species(self, species):
+        return prompt_new_species(self.app, species)
+
+
 def test_scan_egg(app):
     if getattr(app, "scanning_paused", False):
         print("🔁 Scanning is paused. Press F9 to resume.")
         return
 
-    scan = scan_slot(app.settings)
-    if scan == "no_egg":
-        print("→ No egg detected.")
-        return
-
-    egg = scan["species"]
-    stats = scan["stats"]
-    sex = "female" if "female" in egg.lower() else "male"
-    normalized = normalize_species_name(egg)
-
-    config = app.rules.get(normalized, app.settings.get("default_species_template", {}))
-    wipe = app.settings.get("current_wipe", "default")
-    progress = load_progress(wipe)
-
-    updated_thresholds = update_mutation_thresholds(egg, stats, config, progress, sex, wipe)
-    updated_stud = False
-    updated_mutation_stud = False
-    if sex == "male":
-        updated_stud = update_stud(egg, stats, config, progress, wipe)
-        updated_mutation_stud = update_mutation_stud(egg, stats, config, progress)
-
-    scan.update({
-        "egg": egg,
-        "sex": sex,
-        "stats": stats,
-        "updated_thresholds": updated_thresholds,
-        "updated_stud": updated_stud,
-        "updated_mutation_stud": updated_mutation_stud,
-    })
-
-    decision, reasons = should_keep_egg(scan, config, progress)
-    save_progress(progress, wipe)
-
-    print(f"→ Scanned Egg: {egg} | DECISION: {decision.upper()}")
-    for k, v in reasons.items():
-        if k != "_debug" and v:
-            print(f"  ✔ {k}")
-    debug_cfg = app.settings.get("debug_mode", False)
-    debug_enabled = (
-        debug_cfg.get("breeding_logic", False)
-        if isinstance(debug_cfg, dict)
-        else bool(debug_cfg)
-    )
-    if debug_enabled and "_debug" in reasons:
-        for k, v in reasons["_debug"].items():
-            print(f"    debug[{k}]: {v}")
-
-    if decision == "keep":
-        import pyautogui
-        pyautogui.doubleClick(app.settings["slot_x"], app.settings["slot_y"])
-        print("✔ Egg auto-kept via double-click")
+    session = ScanSession(app.settings, app.rules, _ConsoleCallbacks(app))
+    try:
+        # manual scans only ever keep; destroying stays a live-loop decision
+        if not session.step(actions=("keep",)):
+            print("→ No egg detected.")
+    finally:
+        session.close()
 
 
 def clear_log(app):
@@ -9,6 +9,7 @@ FONT = ("Segoe UI", 10)
 import json
 from progress_tracker import normalize_species_name
 import progress_tracker
+from species_lexicon import invalidate_species_index
 
 ALWAYS_ON_MODES = ["mutations", "stat_merge"]
 DEFAULT_MODES = ["all_females", "top_stat_females", "war", "automated"]
@@ -280,6 +281,7 @@ def delete_species(app):
         del app.rules[s]
         with open("rules.json", "w", encoding="utf-8") as f:
             json.dump(app.rules, f, indent=2)
+        invalidate_species_index()
     app.selected_species.set("")
     app._last_species = None
     refresh_species_dropdown(app)
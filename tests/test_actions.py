@@ -0,0 +1,113 @@
+import os
+import sys
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Provide dummy pyautogui so the modules import without a display
+sys.modules.setdefault("pyautogui", types.SimpleNamespace())
+
+import actions
+from input_backend import RecordingInput
+
+SETTINGS = {
+    "slot_x": 100,
+    "slot_y": 100,
+    "destroy_offsets": [20, 10],
+    "destroy_this_offsets": [80, 10],
+    "species_roi": {"x": 0, "y": 0, "w": 10, "h": 4},
+    "action_timeout": 0.05,
+}
+
+
+class FakeScreen(RecordingInput):
+    """Input backend whose probe regions react to the recorded actions."""
+
+    EFFECTS = {
+        ("rightClick", None): "menu",
+        ("moveTo", 120): "submenu",
+        ("click", None): "closed",
+        ("doubleClick", 100): "kept",
+        ("press", "esc"): "escaped",
+    }
+
+    def __init__(self, ignore=()):
+        super().__init__()
+        self.shown = set()
+        self.ignore = set(ignore)
+
+    def _record(self, op, args, start):
+        super()._record(op, args, start)
+        effect = self.EFFECTS.get((op, args[0]))
+        if effect and effect not in self.ignore:
+            self.shown.add(effect)
+
+    def grab(self, region, backend="auto"):
+        x = region[0]
+        lit = (
+            (x == 114 and "menu" in self.shown)
+            or (x == 174 and "submenu" in self.shown and "closed" not in self.shown)
+            or (x == 0 and "kept" not in self.shown)
+        )
+        return np.full((region[3], region[2], 3), 200 if lit else 0, np.uint8)
+
+
+def install(monkeypatch, screen):
+    monkeypatch.setattr(actions, "get_input", lambda name="auto": screen)
+    monkeypatch.setattr(actions, "grab_region", screen.grab)
+    monkeypatch.setattr("scanner.grab_region", screen.grab)
+    monkeypatch.setattr(actions.time, "sleep", lambda s: None)
+
+
+def test_destroy_chain_confirms_each_step(monkeypatch):
+    screen = FakeScreen()
+    install(monkeypatch, screen)
+    assert actions.destroy_egg(SETTINGS) is True
+    assert [op for op, _ in screen.calls] == ["moveTo", "rightClick", "moveTo", "moveTo", "click"]
+
+
+def test_destroy_aborts_when_menu_never_opens(monkeypatch):
+    screen = FakeScreen(ignore={"menu"})
+    install(monkeypatch, screen)
+    assert actions.destroy_egg(SETTINGS) is False
+    names = [op for op, _ in screen.calls]
+    # one retry after closing the stray menu, and "This" is never clicked
+    assert names.count("rightClick") == 2
+    assert "press" in names
+    assert "click" not in names
+
+
+def test_keep_confirms_popup_closing(monkeypatch):
+    screen = FakeScreen()
+    install(monkeypatch, screen)
+    assert actions.keep_egg(SETTINGS) is True
+
+    screen = FakeScreen(ignore={"kept"})
+    install(monkeypatch, screen)
+    assert actions.keep_egg(SETTINGS) is False
+    assert [op for op, _ in screen.calls] == ["doubleClick"]
+
+
+def test_without_probe_falls_back_to_sleep(monkeypatch):
+    screen = FakeScreen(ignore={"menu", "submenu", "closed"})
+    install(monkeypatch, screen)
+    sleeps = []
+    monkeypatch.setattr(actions.time, "sleep", sleeps.append)
+    settings = dict(SETTINGS, action_probe=False)
+    assert actions.destroy_egg(settings) is True
+    # the original chain: a pause after each menu step, none after the clicks
+    assert sleeps == [actions.ACTION_SLEEP, actions.ACTION_SLEEP]
+    assert actions.keep_egg(settings) is True
+    assert len(sleeps) == 2
+    assert actions.slot_box(SETTINGS) == (94, 94, 12, 12)
+
+
+def test_step_latencies_tune_their_own_knob(monkeypatch):
+    screen = FakeScreen()
+    install(monkeypatch, screen)
+    recorded = []
+    monkeypatch.setattr(actions, "record_latency", lambda s, knob, v: recorded.append(knob))
+    assert actions.destroy_egg(SETTINGS) is True
+    assert recorded == ["action_timeout"] * 3
@@ -0,0 +1,40 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from background_writer import BackgroundWriter
+
+
+def test_tasks_run_in_order():
+    writer = BackgroundWriter()
+    done = []
+    for i in range(5):
+        writer.submit(done.append, i)
+    assert writer.flush(1.0)
+    writer.close()
+    assert done == [0, 1, 2, 3, 4]
+
+
+def test_keyed_tasks_coalesce():
+    writer = BackgroundWriter()
+    gate = threading.Event()
+    done = []
+    writer.submit(gate.wait)
+    for i in range(3):
+        writer.submit(done.append, ("save", i), key="save")
+    writer.submit(done.append, "log")
+    assert writer.pending() == 3
+    gate.set()
+    writer.close(1.0)
+    assert done == [("save", 2), "log"]
+
+
+def test_failing_task_does_not_stop_the_writer():
+    writer = BackgroundWriter()
+    done = []
+    writer.submit(lambda: 1 / 0)
+    writer.submit(done.append, "after")
+    writer.close(1.0)
+    assert done == ["after"]
@@ -0,0 +1,92 @@
+import logging
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import breeding_logic
+from decision_trace import Comparison, DecisionTrace
+
+
+def decide(scan, rules, progress):
+    with patch("breeding_logic.normalize_species_name", return_value="Rex"):
+        return breeding_logic.should_keep_egg(scan, rules, progress)
+
+
+def test_trace_reads_like_the_old_debug_dict():
+    scan = {
+        "egg": "CS Rex Male",
+        "sex": "male",
+        "stats": {"melee": {"base": 30, "mutation": 3}, "health": {"base": 20, "mutation": 1}},
+    }
+    rules = {
+        "modes": ["war"],
+        "mutation_stats": ["melee", "health"],
+        "stat_merge_stats": ["melee", "health"],
+        "war_stats": ["melee", "health"],
+    }
+    progress = {"Rex": {
+        "mutation_thresholds": {"melee": 2, "health": 1},
+        "mutation_stud": {"health": 25},
+        "top_stats": {"melee": 25, "health": 22},
+        "stud": {"melee": 20, "health": 22},
+    }}
+    decision, res = decide(scan, rules, progress)
+    trace = res["_debug"]
+    assert decision == "keep"
+    assert trace.items() == [
+        ("mutations", "melee=3>2 | health=1=1"),
+        ("stat_merge", "melee base 30>20"),
+        ("war", "failed: health: base 20<22"),
+        ("final", "keep"),
+    ]
+    assert trace["final"] == "keep"
+    assert "top_stat_females" not in trace
+    assert trace.get("all_females", "") == ""
+    assert str(trace) == "mutations: melee=3>2 | health=1=1; stat_merge: melee base 30>20"
+
+
+def test_trace_is_machine_queryable():
+    scan = {"egg": "CS Rex Female", "sex": "female", "stats": {"melee": {"base": 10}}}
+    rules = {"modes": ["top_stat_females"], "top_stat_females_stats": ["melee", "health"]}
+    progress = {"Rex": {"female_count": 10, "stud": {"melee": 12, "health": 0}}}
+    decision, res = decide(scan, rules, progress)
+    trace = res["_debug"]
+    assert decision == "destroy"
+    assert trace.comparisons("top_stat_females", "<") == [
+        Comparison("top_stat_females", "melee", "base", 10, 12, "<"),
+    ]
+    assert trace.passed == {"top_stat_females": False}
+    assert trace["top_stat_females"] == "mismatched: melee=10<12"
+
+
+def test_special_outcomes():
+    _, res = decide({"egg": "garbage", "sex": "male", "stats": {}}, {}, {})
+    assert res["_debug"].items() == [
+        ("invalid_species", "name did not contain CS and male/female"),
+        ("final", "rescan"),
+    ]
+    _, res = decide({"egg": "CS Rex Female", "sex": "female", "stats": {}}, {"modes": []}, {})
+    assert dict(res["_debug"].items()) == {"auto_destroy": "no female modes enabled", "final": "destroy"}
+
+
+def test_trace_formats_only_when_logged():
+    calls = []
+    real_reason = DecisionTrace.reason
+
+    def counting_reason(self, key):
+        calls.append(key)
+        return real_reason(self, key)
+
+    scan = {"egg": "CS Rex Male", "sex": "male", "stats": {"melee": {"mutation": 3}}}
+    rules = {"modes": ["mutations"], "mutation_stats": ["melee"]}
+    level = breeding_logic.kept_log.level
+    breeding_logic.kept_log.setLevel(logging.WARNING)
+    try:
+        with patch.object(DecisionTrace, "reason", counting_reason):
+            decision, _ = decide(scan, rules, {})
+    finally:
+        breeding_logic.kept_log.setLevel(level)
+    assert decision == "keep"
+    assert calls == []
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import digit_recognizer
+
+cv2 = digit_recognizer.cv2
+pytestmark = pytest.mark.skipif(
+    not hasattr(cv2, "connectedComponentsWithStats"), reason="OpenCV required"
+)
+
+
+def render(text):
+    """Draw ``text`` as white glyphs on black, upscaled like baseline_up."""
+    img = np.zeros((30, 20 * len(text) + 10), np.uint8)
+    for i, ch in enumerate(text):
+        cv2.putText(img, ch, (5 + 20 * i, 23), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 255, 2)
+    return cv2.resize(img, None, fx=3, fy=3, interpolation=cv2.INTER_NEAREST)
+
+
+def trained_bank():
+    bank = digit_recognizer.TemplateBank()
+    assert bank.learn(render("0123456789()"), "0123456789()")
+    return bank
+
+
+def test_read_glyphs_matches_learned_font():
+    text, score = digit_recognizer.read_glyphs(render("45(2)"), trained_bank())
+    assert text == "45(2)"
+    assert score > 0.95
+
+
+def test_read_glyphs_handles_inverted_polarity():
+    text, _ = digit_recognizer.read_glyphs(255 - render("187"), trained_bank())
+    assert text == "187"
+
+
+def test_learn_rejects_mismatched_label():
+    bank = digit_recognizer.TemplateBank()
+    assert bank.learn(render("45"), "451") is False
+    assert len(bank) == 0
+
+
+def test_templates_round_trip(tmp_path):
+    path = tmp_path / "templates.json"
+    digit_recognizer.save_templates(trained_bank(), str(path))
+    bank = digit_recognizer.load_templates(str(path))
+    assert len(bank) == 12
+    assert digit_recognizer.read_glyphs(render("30"), bank)[0] == "30"
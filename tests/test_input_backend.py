@@ -0,0 +1,102 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import input_backend
+from input_backend import InputBackend, PyAutoGUIInput, RecordingInput
+
+
+class PrimitiveInput(InputBackend):
+    """Backend logging the low-level events the public calls turn into."""
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def _move(self, x, y):
+        self.events.append(("move", x, y))
+
+    def _button(self, button, down):
+        self.events.append((button, "down" if down else "up"))
+
+    def _key(self, key, down):
+        self.events.append((key, "down" if down else "up"))
+
+    def size(self):
+        return (800, 600)
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoKeys(InputBackend):
+        def _move(self, x, y):
+            pass
+
+        def _button(self, button, down):
+            pass
+
+        def size(self):
+            return (800, 600)
+
+    with pytest.raises(TypeError):
+        NoKeys()
+
+
+def test_clicks_expand_to_button_events():
+    mouse = PrimitiveInput()
+    mouse.doubleClick(10, 20)
+    mouse.rightClick()
+    mouse.press("esc")
+    assert mouse.events == [
+        ("move", 10, 20),
+        ("left", "down"), ("left", "up"), ("left", "down"), ("left", "up"),
+        ("right", "down"), ("right", "up"),
+        ("esc", "down"), ("esc", "up"),
+    ]
+    assert mouse.onScreen(799, 0) and not mouse.onScreen(800, 10)
+
+
+def test_recording_backend_tracks_calls_and_latency():
+    mouse = RecordingInput()
+    mouse.moveTo(1, 2)
+    mouse.click(1, 2)
+    mouse.click()
+    assert mouse.calls == [("moveTo", (1, 2)), ("click", (1, 2)), ("click", (None, None))]
+    stats = mouse.latency_stats()
+    assert stats["click"]["calls"] == 2
+    assert stats["moveTo"]["mean_ms"] >= 0
+
+
+def test_pyautogui_backend_skips_global_pause(monkeypatch):
+    calls = []
+    fake = types.SimpleNamespace(**{
+        name: (lambda n: lambda *a, **k: calls.append((n, a, k)))(name)
+        for name in ("moveTo", "mouseDown", "mouseUp", "keyDown", "keyUp")
+    })
+    monkeypatch.setitem(sys.modules, "pyautogui", fake)
+    mouse = PyAutoGUIInput()
+    mouse.click(5, 6)
+    mouse.press("f9")
+    assert [c[0] for c in calls] == ["moveTo", "mouseDown", "mouseUp", "keyDown", "keyUp"]
+    assert all(k.get("_pause") is False for _, _, k in calls)
+
+
+def test_get_input_falls_back(monkeypatch):
+    def broken():
+        raise OSError("no display")
+
+    monkeypatch.setattr(input_backend, "_inputs", {})
+    monkeypatch.setitem(input_backend.INPUT_BACKENDS, "xtest", broken)
+    monkeypatch.setitem(input_backend.INPUT_BACKENDS, "pyautogui", RecordingInput)
+    mouse = input_backend.get_input("auto")
+    assert isinstance(mouse, RecordingInput)
+    assert input_backend.get_input("auto") is mouse
+    input_backend.close_inputs()
+    assert input_backend._inputs == {}
+
+    monkeypatch.setitem(input_backend.INPUT_BACKENDS, "pyautogui", broken)
+    with pytest.raises(RuntimeError):
+        input_backend.get_input("auto")
@@ -0,0 +1,105 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import plausibility
+import progress_tracker
+from plausibility import PlausibilityModel
+
+PROGRESS = {
+    "Rex": {
+        "top_stats": {"health": 45, "melee": 40, "speed": 0},
+        "mutation_thresholds": {"health": 4},
+    },
+}
+HISTORY = {
+    "Rex": {
+        "top_stats": {
+            "health": [{"ts": 1, "value": 30}, {"ts": 2, "value": 38}, {"ts": 3, "value": 45}],
+        },
+        "mutation_thresholds": {"melee": [{"ts": 1, "value": 6}]},
+    },
+}
+
+
+def test_ranges_follow_recorded_tops():
+    model = PlausibilityModel.from_progress(PROGRESS, HISTORY)
+    # largest historical step (30 → 38) widens the upper margin
+    assert model.ranges["Rex"]["health"] == (15, 53)
+    assert model.ranges["Rex"]["melee"] == (20, 44)
+    assert "speed" not in model.ranges["Rex"]
+    assert model.mutation_limits["Rex"] == {"health": 7, "melee": 9, "*": 9}
+
+
+def test_suspicious_flags_dropped_digits_and_mutations():
+    model = PlausibilityModel.from_progress(PROGRESS, HISTORY)
+    stats = {
+        "health": {"base": 4, "mutation": 0},
+        "melee": {"base": 41, "mutation": 2},
+        "stamina": {"base": 30, "mutation": 12},
+        "speed": {"base": 0, "mutation": 0},
+    }
+    assert model.suspicious("Rex", stats) == ["health", "stamina"]
+
+
+def test_unknown_species_is_never_suspicious():
+    model = PlausibilityModel.from_progress(PROGRESS, HISTORY)
+    assert model.suspicious("Dodo", {"health": {"base": 3, "mutation": 40}}) == []
+
+
+def test_get_model_reloads_changed_files_in_background(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_tracker, "WIPE_DIR", str(tmp_path))
+    monkeypatch.setattr(plausibility, "normalize_species_name", lambda name: "Rex")
+    monkeypatch.setattr(plausibility, "_models", {})
+    monkeypatch.setattr(plausibility, "RELOAD_INTERVAL", 0.0)
+    progress_tracker.save_progress(PROGRESS, "w1")
+    scan = {"species": "CS Rex Male", "stats": {"melee": {"base": 50, "mutation": 0}}}
+    assert plausibility.suspicious_stats(scan, "w1") == ["melee"]
+
+    progress_tracker.save_progress({"Rex": {"top_stats": {"melee": 48}}}, "w1")
+    path = progress_tracker.get_progress_file("w1")
+    os.utime(path, ns=(1, 1))
+    plausibility.get_model("w1")
+    plausibility._models["w1"].thread.join()
+    assert plausibility.suspicious_stats(scan, "w1") == []
+
+
+def test_recorded_history_updates_model_without_reading_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_tracker, "WIPE_DIR", str(tmp_path))
+    monkeypatch.setattr(plausibility, "normalize_species_name", lambda name: "Rex")
+    monkeypatch.setattr(plausibility, "_models", {})
+    progress_tracker.save_progress(PROGRESS, "w1")
+    scan = {"species": "CS Rex Male", "stats": {"melee": {"base": 50, "mutation": 0}}}
+    assert plausibility.suspicious_stats(scan, "w1") == ["melee"]
+
+    reads = []
+    monkeypatch.setattr(plausibility, "_read_json", lambda path: reads.append(path) or {})
+    previous = progress_tracker.set_history_sink(lambda entry, wipe: None)
+    try:
+        progress_tracker.record_history("Rex", "top_stats", "melee", 47, "w1")
+    finally:
+        progress_tracker.set_history_sink(previous)
+    assert plausibility.suspicious_stats(scan, "w1") == []
+    assert reads == []
+
+
+def test_failed_reload_keeps_model_and_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_tracker, "WIPE_DIR", str(tmp_path))
+    monkeypatch.setattr(plausibility, "_models", {})
+    monkeypatch.setattr(plausibility, "RELOAD_INTERVAL", 0.0)
+    model = plausibility.get_model("w1")
+
+    def broken(wipe):
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(plausibility, "_build", broken)
+    progress_tracker.save_progress(PROGRESS, "w1")
+    assert plausibility.get_model("w1") is model
+    state = plausibility._models["w1"]
+    state.thread.join()
+    assert state.pending is None
+    first = state.thread
+    plausibility.get_model("w1")
+    assert state.thread is not first
+    state.thread.join()
@@ -145,3 +145,37 @@ def test_record_history_custom_wipe(tmp_path):
         with open(hist_file, encoding='utf-8') as f:
             data = json.load(f)
         assert data['Rex']['top_stats']['melee'][0]['value'] == 5
+
+
+def test_history_sink_receives_entries(tmp_path):
+    seen = []
+    previous = progress_tracker.set_history_sink(lambda entry, wipe: seen.append((entry, wipe)))
+    try:
+        with patch('progress_tracker.WIPE_DIR', str(tmp_path / 'wipes')):
+            progress_tracker.record_history('Rex', 'top_stats', 'melee', 5, 'w')
+            assert not (tmp_path / 'wipes' / 'w').exists()
+            progress_tracker.append_history([entry for entry, _ in seen], 'w')
+            with open(tmp_path / 'wipes' / 'w' / 'progress_history.json', encoding='utf-8') as f:
+                data = json.load(f)
+    finally:
+        progress_tracker.set_history_sink(previous)
+    assert seen[0][0][:4] == ('Rex', 'top_stats', 'melee', 5) and seen[0][1] == 'w'
+    assert data['Rex']['top_stats']['melee'][0]['value'] == 5
+
+
+def test_normalize_species_name_reads_rules_once(tmp_path, monkeypatch):
+    import species_lexicon
+    rules = tmp_path / 'rules.json'
+    rules.write_text(json.dumps({'Giganotosaurus': {}, 'Rex': {}}))
+    monkeypatch.setattr(progress_tracker, 'RULES_FILE', str(rules))
+    monkeypatch.setattr(species_lexicon, '_resolver', None)
+    loads = []
+    real_load = species_lexicon._load_keys
+    monkeypatch.setattr(species_lexicon, '_load_keys', lambda path: loads.append(path) or real_load(path))
+
+    assert progress_tracker.normalize_species_name('CS Gigan0tosaurus Female') == 'Giganotosaurus'
+    assert progress_tracker.normalize_species_name('CS Rex (Male)') == 'Rex'
+    assert progress_tracker.normalize_species_name('CS Unknownus Male') == 'Unknownus'
+    assert progress_tracker.normalize_species_name('CS Gigan0tosaurus Female') == 'Giganotosaurus'
+    assert len(loads) == 1
+    assert species_lexicon.get_resolver(str(rules)).resolved['CS Rex (Male)'] == 'Rex'
@@ -0,0 +1,138 @@
+import os
+import random
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import breeding_logic
+import rule_compiler
+from rule_compiler import MODES, STAT_ORDER, compile_rules
+
+ALL_MODES = ["mutations", "all_females", "stat_merge", "top_stat_females", "war", "automated"]
+
+
+def random_case(rng):
+    stats = list(STAT_ORDER) + ["torpor"]
+
+    def pick():
+        return rng.sample(stats, rng.randint(0, 4))
+
+    def values(hi):
+        return {st: rng.randint(0, hi) for st in rng.sample(stats, rng.randint(0, 5))}
+
+    rules = {
+        "modes": rng.sample(ALL_MODES, rng.randint(0, 4)),
+        "mutation_stats": pick(),
+        "stat_merge_stats": pick(),
+        "top_stat_females_stats": pick(),
+        "war_stats": pick(),
+    }
+    progress = {"Rex": {
+        "female_count": rng.choice([0, 4, 5, 50, 95, 96, 120]),
+        "top_stats": values(50),
+        "mutation_thresholds": values(4),
+        "stud": values(50),
+        "mutation_stud": values(50),
+    }} if rng.random() < 0.9 else {}
+    sex = rng.choice(["male", "female"])
+    scan = {
+        "egg": f"CS Rex {sex.title()}",
+        "sex": sex,
+        "stats": {
+            st: {"base": rng.randint(0, 50), "mutation": rng.randint(0, 5)}
+            for st in rng.sample(stats, rng.randint(0, 7))
+        },
+    }
+    if rng.random() < 0.2:
+        scan["updated_stud"] = True
+    return scan, rules, progress
+
+
+def test_decide_egg_matches_reference():
+    rng = random.Random(1234)
+    rule_compiler.clear_compiled()
+    with patch("breeding_logic.normalize_species_name", return_value="Rex"):
+        for _ in range(2000):
+            scan, rules, progress = random_case(rng)
+            expected, ref = breeding_logic.should_keep_egg(scan, rules, progress)
+            decision, res = breeding_logic.decide_egg(scan, rules, progress)
+            assert decision == expected, (scan, rules, progress)
+            assert {m: res[m] for m in MODES} == {m: ref[m] for m in MODES}, (scan, rules, progress)
+            assert res["_debug"]["final"] == ref["_debug"]["final"]
+
+
+def test_invalid_species_rescans():
+    scan = {"egg": "garbage", "sex": "male", "stats": {}}
+    decision, res = breeding_logic.decide_egg(scan, {}, {})
+    assert decision == "rescan"
+    assert not any(res[m] for m in MODES)
+
+
+def test_compiled_rules_cached_until_inputs_change():
+    rule_compiler.clear_compiled()
+    rules = {"modes": ["mutations"], "mutation_stats": ["melee"]}
+    progress = {"Rex": {"mutation_thresholds": {"melee": 2}}}
+    compiled = compile_rules("Rex", rules, progress)
+    assert compile_rules("Rex", rules, progress) is compiled
+
+    progress["Rex"]["mutation_thresholds"]["melee"] = 3
+    recompiled = compile_rules("Rex", rules, progress)
+    assert recompiled is not compiled
+    assert recompiled.mut_thresh == (3,)
+
+    rules["mutation_stats"].append("health")
+    assert compile_rules("Rex", rules, progress).mut_idx == (
+        STAT_ORDER.index("melee"), STAT_ORDER.index("health"),
+    )
+
+
+def test_unknown_stats_get_extra_columns():
+    rules = {"modes": ["war"], "war_stats": ["torpor"]}
+    compiled = rule_compiler.CompiledRules("Rex", rules, {"top_stats": {"torpor": 10}})
+    assert compiled.order == STAT_ORDER + ("torpor",)
+    bases, muts = compiled.vectors({"torpor": {"base": 12, "mutation": 0}})
+    assert compiled.evaluate(bases, muts, female=False) & rule_compiler.WAR
+
+
+def test_decide_batch_matches_scalar_path():
+    import numpy as np
+
+    rng = random.Random(99)
+    rule_compiler.clear_compiled()
+    cases = [random_case(rng) for _ in range(1500)]
+    with patch("breeding_logic.normalize_species_name", return_value="Rex"):
+        for scan, rules, progress in cases:
+            matrix = np.array([[
+                [scan["stats"].get(st, {}).get("base", 0), scan["stats"].get(st, {}).get("mutation", 0)]
+                for st in STAT_ORDER
+            ]])
+            # the matrix has no column for stats outside STAT_ORDER
+            scan["stats"].pop("torpor", None)
+            expected, ref = breeding_logic.should_keep_egg(scan, rules, progress)
+            keep, passed = breeding_logic.decide_batch(
+                "Rex", matrix, [scan["sex"]], {"Rex": rules}, progress,
+                updated_stud=[bool(scan.get("updated_stud"))],
+            )
+            assert keep[0] == (expected == "keep"), (scan, rules, progress)
+            assert {m: bool(passed[m][0]) for m in MODES} == {m: ref[m] for m in MODES}
+
+
+def test_decide_batch_groups_species():
+    import numpy as np
+
+    rules = {
+        "Rex": {"modes": ["mutations"], "mutation_stats": ["melee"]},
+        "Ovis": {"modes": ["all_females"]},
+    }
+    progress = {"Rex": {"mutation_thresholds": {"melee": 2}}}
+    stats = np.zeros((4, len(STAT_ORDER), 2), dtype=int)
+    melee = STAT_ORDER.index("melee")
+    stats[:, melee, 1] = [3, 1, 0, 0]
+    keep, passed = breeding_logic.decide_batch(
+        ["Rex", "Rex", "Ovis", "Ovis"], stats,
+        np.array([False, False, True, False]), rules, progress,
+    )
+    assert keep.tolist() == [True, False, True, False]
+    assert passed["mutations"].tolist() == [True, False, False, False]
+    assert passed["all_females"].tolist() == [False, False, True, False]
@@ -2,6 +2,8 @@ import sys
 import types
 import numpy as np
 import os
+import time
+import pytest
 
 # Ensure project root on path for importing scanner when tests executed from subdirectory
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -25,6 +27,7 @@ sys.modules['pyautogui'] = types.SimpleNamespace(
 sys.modules.setdefault('cv2', types.SimpleNamespace())
 
 import scanner
+from input_backend import RecordingInput
 
 
 def test_is_invalid_all_zero_stats():
@@ -68,3 +71,579 @@ def test_scan_once_no_ocr(monkeypatch):
     assert reloaded.OCR_AVAILABLE is False
     assert reloaded.scan_once(settings) == 'ocr_unavailable'
 
+
+def test_stitch_crops_inverts_and_spans():
+    light_on_dark = np.zeros((4, 6), dtype=np.uint8)
+    light_on_dark[1:3, 2:4] = 255
+    dark_on_light = np.full((3, 5), 255, dtype=np.uint8)
+    canvas, spans = scanner.stitch_crops({"health": light_on_dark, "melee": dark_on_light})
+    gap = scanner.BATCH_GAP
+    assert spans == {"health": (gap, gap + 4), "melee": (2 * gap + 4, 2 * gap + 7)}
+    top, bottom = spans["health"]
+    # text pixels end up dark on a white canvas
+    assert canvas[top + 1, gap + 2] == 0
+    assert canvas[top, gap] == 255
+    assert canvas.shape == (3 * gap + 7, 6 + 2 * gap)
+
+
+def test_assign_words_maps_rows_by_position():
+    spans = {"health": (10, 30), "melee": (50, 70)}
+    data = {
+        "text": ["(2)", "45", "", "38", "7"],
+        "left": [40, 10, 0, 10, 30],
+        "top": [12, 12, 0, 52, 40],
+        "height": [15, 15, 0, 15, 12],
+    }
+    texts = scanner.assign_words(data, spans)
+    # "7" sits in the gap but closer to the melee band
+    assert texts == {"health": ("45(2)", 0.0), "melee": ("387", 0.0)}
+    data["conf"] = [90, 80, -1, 70, 60]
+    assert scanner.assign_words(data, spans)["melee"] == ("387", 60.0)
+
+
+def test_parse_stat_text_variants():
+    assert scanner.parse_stat_text("45(2)") == (45, 2)
+    assert scanner.parse_stat_text("512)") == (51, 2)
+    assert scanner.parse_stat_text("5)") == (None, 0)
+    assert scanner.parse_stat_text("") == (None, 0)
+
+
+def test_parse_tess_config():
+    cfg = "--oem 1 --psm 7 -c tessedit_char_whitelist=0123456789()l|"
+    oem, psm, variables = scanner._parse_tess_config(cfg)
+    assert (oem, psm) == (1, 7)
+    assert variables == {"tessedit_char_whitelist": "0123456789()l|"}
+
+
+def test_get_engine_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setattr(scanner, "_engines", {})
+    monkeypatch.setitem(scanner._BACKENDS, "tesserocr", None)
+    monkeypatch.setitem(scanner._BACKENDS, "pytesseract", types.SimpleNamespace())
+    engine = scanner.get_engine("tesserocr")
+    assert engine.name == "pytesseract"
+    assert scanner.get_engine() is engine
+
+
+def test_ocr_cache_lru_and_counters():
+    cache = scanner.OCRCache(maxsize=2)
+    cache.put("a", (45, 0))
+    cache.put("b", (30, 1))
+    assert cache.get("a") == (45, 0)
+    cache.put("c", (12, 0))  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == (12, 0)
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 2, "hit_rate": 2 / 3}
+
+
+def test_crop_hash_ignores_faint_noise():
+    crop = np.zeros((20, 40, 3), dtype=np.uint8)
+    crop[5:15, 10:14] = 200
+    noisy = crop.copy()
+    noisy[0, 0] = 3
+    other = crop.copy()
+    other[5:15, 20:24] = 200
+    assert scanner.crop_hash(crop) == scanner.crop_hash(noisy)
+    assert scanner.crop_hash(crop) != scanner.crop_hash(other)
+
+
+class FakeEngine:
+    """OCR engine stub returning canned text for species and stat reads."""
+
+    name = "fake"
+
+    def __init__(self, species="CS Rex Male", stat_text="45(2)", conf=95):
+        self.species = species
+        self.stat_text = stat_text
+        self.conf = conf
+        self.calls = 0
+
+    def image_to_string(self, img, config=""):
+        self.calls += 1
+        return self.stat_text if "whitelist" in config else self.species
+
+    def image_to_data(self, img, config=""):
+        self.calls += 1
+        return {
+            "text": [self.stat_text], "left": [0], "top": [0], "height": [10],
+            "conf": [self.conf],
+        }
+
+
+def scanner_lexicon(names):
+    from species_lexicon import SpeciesLexicon
+    return SpeciesLexicon(names)
+
+
+def _scan_env(monkeypatch, engine, **ocr):
+    cv2 = pytest.importorskip("cv2")
+    if not hasattr(cv2, "resize"):
+        pytest.skip("OpenCV required")
+    rng = np.random.default_rng(0)
+    monkeypatch.setattr(scanner, "cv2", cv2)
+    monkeypatch.setattr(scanner, "OCR_AVAILABLE", True)
+    monkeypatch.setattr(scanner, "get_engine", lambda name="auto": engine)
+    monkeypatch.setattr(scanner, "_ocr_cache", None)
+    lexicon = scanner_lexicon(["Rex"])
+    monkeypatch.setattr(scanner, "get_lexicon", lambda: lexicon)
+    monkeypatch.setattr(scanner, "suspicious_stats", lambda scan, wipe="default": [])
+    monkeypatch.setattr(scanner, "time", types.SimpleNamespace(
+        sleep=lambda s: None, monotonic=time.monotonic
+    ))
+    # never pick XShm and grab the real display
+    monkeypatch.setattr(scanner, "_captures", {})
+    mouse = RecordingInput()
+    monkeypatch.setattr(scanner, "get_input", lambda name="auto": mouse)
+    monkeypatch.setattr(scanner, "pyautogui", types.SimpleNamespace(
+        screenshot=lambda region=None: rng.integers(
+            0, 255, (region[3], region[2], 3), dtype=np.uint8
+        ),
+    ))
+    return {
+        "slot_x": 5,
+        "slot_y": 5,
+        "species_roi": {"x": 0, "y": 0, "w": 40, "h": 10},
+        "stat_rois": {
+            "health": {"x": 0, "y": 12, "w": 20, "h": 10},
+            "melee": {"x": 20, "y": 12, "w": 20, "h": 10},
+        },
+        "capture_backend": "pyautogui",
+        "ocr": {"oem": 3, "psm": 7, "template_file": "missing.json", **ocr},
+    }
+
+
+def test_scan_once_reads_species_and_stats(monkeypatch):
+    engine = FakeEngine()
+    settings = _scan_env(monkeypatch, engine)
+    result = scanner.scan_once(settings)
+    assert result == {
+        "species": "CS Rex Male",
+        "stats": {
+            "health": {"base": 45, "mutation": 2, "confidence": 95},
+            "melee": {"base": 45, "mutation": 2, "confidence": 95},
+        },
+    }
+    assert [op for op, _ in scanner.get_input().calls] == ["moveTo", "click"]
+
+
+def test_scan_once_thread_pool_matches_sequential(monkeypatch):
+    settings = _scan_env(monkeypatch, FakeEngine(), workers=3)
+    try:
+        pooled = scanner.scan_once(settings)
+    finally:
+        scanner.shutdown_pool()
+    settings["ocr"]["workers"] = 0
+    scanner._ocr_cache = None
+    assert pooled == scanner.scan_once(settings)
+
+
+def test_scan_once_invalid_species_with_pool(monkeypatch):
+    settings = _scan_env(monkeypatch, FakeEngine(species="garbage"), workers=2)
+    try:
+        assert scanner.scan_once(settings) == "no_egg"
+    finally:
+        scanner.shutdown_pool()
+
+
+def test_scan_once_cache_skips_repeat_ocr(monkeypatch):
+    engine = FakeEngine()
+    settings = _scan_env(monkeypatch, engine)
+    frame = np.random.default_rng(1).integers(0, 255, (22, 40, 3), dtype=np.uint8)
+    scanner.pyautogui.screenshot = lambda region=None: frame
+    first = scanner.scan_once(settings)
+    calls = engine.calls
+    assert scanner.scan_once(settings) == first
+    assert engine.calls == calls
+
+
+def test_scan_once_snaps_garbled_species(monkeypatch):
+    settings = _scan_env(monkeypatch, FakeEngine(species="C5 R3x Ma1e"))
+    assert scanner.scan_once(settings)["species"] == "CS Rex Male"
+
+
+def test_read_species_skips_ocr_for_seen_crop():
+    engine = FakeEngine(species="CS Rx Female")
+    lexicon = scanner_lexicon(["Rex"])
+    crop = np.zeros((10, 40), dtype=np.uint8)
+    crop[2:8, 5:30] = 255
+    settings = {"ocr": {"oem": 3}}
+    cache = scanner.OCRCache(8)
+    first = scanner.read_species(crop, settings, engine, cache, lexicon)
+    assert first == "CS Rex Female"
+    assert scanner.read_species(crop, settings, engine, cache, lexicon) == first
+    assert engine.calls == 1
+
+
+def test_read_species_retries_ocr_for_garbled_crop():
+    engine = FakeEngine(species="~~")
+    cache = scanner.OCRCache(8)
+    crop = np.zeros((10, 40), dtype=np.uint8)
+    settings = {"ocr": {"oem": 3}}
+    assert scanner.read_species(crop, settings, engine, cache) == "~~"
+    engine.species = "CS Rex Male"
+    assert scanner.read_species(crop, settings, engine, cache) == "CS Rex Male"
+    assert scanner.read_species(crop, settings, engine, cache) == "CS Rex Male"
+    assert engine.calls == 2
+
+
+def test_wait_for_popup_returns_once_stable(monkeypatch):
+    empty = np.zeros((4, 4, 3), dtype=np.uint8)
+    popup = np.full((4, 4, 3), 200, dtype=np.uint8)
+    fading = np.full((4, 4, 3), 100, dtype=np.uint8)
+    frames = iter([empty, fading, popup, popup])
+    grabs = []
+
+    def grab(region, backend="auto"):
+        grabs.append(region)
+        return next(frames)
+
+    monkeypatch.setattr(scanner, "grab_region", grab)
+    monkeypatch.setattr(scanner.time, "sleep", lambda s: None)
+    timings = {}
+    waited = scanner.wait_for_popup((0, 0, 4, 4), empty, timeout=5.0, timings=timings)
+    assert waited is not None
+    assert 0 <= timings["onset"] <= waited
+    assert len(grabs) == 4
+
+
+def test_wait_for_settle_feeds_timing_tuner(monkeypatch):
+    import timing
+
+    popup = np.full((4, 4, 3), 200, dtype=np.uint8)
+    closed = np.zeros((4, 4, 3), dtype=np.uint8)
+    frames = iter([popup, closed, closed])
+    monkeypatch.setattr(scanner, "grab_region", lambda region, backend="auto": next(frames))
+    monkeypatch.setattr(scanner.time, "sleep", lambda s: None)
+    monkeypatch.setattr(timing, "_tuner", None)
+    settings = {
+        "species_roi": {"x": 0, "y": 0, "w": 4, "h": 4},
+        "scan_loop_delay": 5.0,
+        "timing": {"auto_tune": True},
+    }
+    assert scanner.wait_for_settle(settings, popup) is not None
+    assert len(timing.get_tuner(settings).samples["scan_loop_delay"]) == 1
+
+
+def test_wait_for_popup_times_out_on_empty_slot(monkeypatch):
+    empty = np.zeros((4, 4, 3), dtype=np.uint8)
+    monkeypatch.setattr(scanner, "grab_region", lambda region, backend="auto": empty)
+    assert scanner.wait_for_popup((0, 0, 4, 4), empty, timeout=0.02, poll=0.005) is None
+
+
+def test_get_capture_falls_back_to_pyautogui(monkeypatch):
+    monkeypatch.setattr(scanner, "_captures", {})
+    monkeypatch.delenv("DISPLAY", raising=False)
+    backend = scanner.get_capture("auto")
+    assert backend.name == "pyautogui"
+    assert scanner.get_capture("auto") is backend
+
+
+def test_popup_present_uses_nearest_signature():
+    empty = np.full((10, 30, 3), 20, dtype=np.uint8)
+    popup = empty.copy()
+    popup[3:7, 2:28] = 230
+    sigs = {
+        "empty": scanner.popup_signature(empty),
+        "present": scanner.popup_signature(popup),
+    }
+    assert scanner.popup_present(empty, sigs) is False
+    assert scanner.popup_present(popup, sigs) is True
+    assert scanner.popup_present(popup, None) is None
+
+
+def test_scan_once_skips_ocr_when_slot_empty(monkeypatch):
+    engine = FakeEngine()
+    settings = _scan_env(monkeypatch, engine)
+    frame = np.zeros((22, 40, 3), dtype=np.uint8)
+    scanner.pyautogui.screenshot = lambda region=None: frame
+    busy = np.full((10, 40, 3), 200, dtype=np.uint8)
+    settings["popup_signatures"] = {
+        "empty": scanner.popup_signature(frame[:10]),
+        "present": scanner.popup_signature(busy),
+    }
+    assert scanner.scan_once(settings) == "no_egg"
+    assert engine.calls == 0
+
+
+def test_scan_once_empty_probe_skips_popup_wait(monkeypatch):
+    engine = FakeEngine()
+    settings = _scan_env(monkeypatch, engine)
+    frame = np.zeros((22, 40, 3), dtype=np.uint8)
+    regions = []
+
+    def screenshot(region=None):
+        regions.append(tuple(region))
+        return frame[:region[3], :region[2]]
+
+    scanner.pyautogui.screenshot = screenshot
+    busy = np.full((10, 40, 3), 200, dtype=np.uint8)
+    settings["popup_signatures"] = {
+        "empty": scanner.popup_signature(frame[:10]),
+        "present": scanner.popup_signature(busy),
+    }
+    settings["popup_delay"] = 5.0
+    settings["action_delay"] = 0.01
+    start = time.monotonic()
+    assert scanner.scan_once(settings) == "no_egg"
+    assert time.monotonic() - start < 1.0
+    assert tuple(scanner.roi_region(settings)) not in regions
+    assert engine.calls == 0
+
+
+class ScriptedDataEngine:
+    """Returns one canned ``image_to_data`` word per call."""
+
+    name = "scripted"
+
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.calls = 0
+
+    def image_to_data(self, img, config=""):
+        text, conf = self.reads[self.calls]
+        self.calls += 1
+        return {"text": [text], "left": [0], "top": [0], "height": [10], "conf": [conf]}
+
+
+def _require_cv2(monkeypatch):
+    cv2 = pytest.importorskip("cv2")
+    if not hasattr(cv2, "resize"):
+        pytest.skip("OpenCV required")
+    monkeypatch.setattr(scanner, "cv2", cv2)
+
+
+def test_fallback_stops_when_two_variants_agree(monkeypatch):
+    _require_cv2(monkeypatch)
+    engine = ScriptedDataEngine([("7(2)", 60), ("17(2)", 70), ("17(2)", 65), ("99", 99)])
+    crop = np.zeros((10, 20, 3), dtype=np.uint8)
+    assert scanner.fallback_stat(crop, engine) == (17, 2, 70)
+    assert engine.calls == 3
+
+
+def test_fallback_accepts_single_confident_read(monkeypatch):
+    _require_cv2(monkeypatch)
+    engine = ScriptedDataEngine([("", 0), ("8", 96), ("9", 50)])
+    crop = np.zeros((10, 20, 3), dtype=np.uint8)
+    assert scanner.fallback_stat(crop, engine) == (8, 0, 96)
+    assert engine.calls == 2
+
+
+def test_fallback_without_agreement_uses_most_confident(monkeypatch):
+    _require_cv2(monkeypatch)
+    reads = [("4", 40), ("5", 80), ("6", 30), ("", 0), ("7", 20)]
+    engine = ScriptedDataEngine(reads)
+    crop = np.zeros((10, 20, 3), dtype=np.uint8)
+    assert scanner.fallback_stat(crop, engine) == (5, 0, 80)
+    assert engine.calls == len(scanner.FALLBACK_VARIANTS)
+
+
+def test_scan_slot_rereads_only_invalid_stats(monkeypatch):
+    engine = FakeEngine()
+    settings = _scan_env(monkeypatch, engine)
+    first = {
+        "species": "CS Rex Male",
+        "stats": {
+            "health": {"base": 45, "mutation": 2},
+            "melee": {"base": 452, "mutation": 0},
+        },
+    }
+    monkeypatch.setattr(scanner, "scan_once", lambda s, d=False: first)
+    rereads = []
+
+    def fake_fallback(crop, engine=None):
+        rereads.append(crop.shape)
+        return (38, 1, 88)
+
+    monkeypatch.setattr(scanner, "fallback_stat", fake_fallback)
+    result = scanner.scan_slot(settings)
+    assert result["stats"] == {
+        "health": {"base": 45, "mutation": 2},
+        "melee": {"base": 38, "mutation": 1, "confidence": 88},
+    }
+    assert rereads == [(10, 20, 3)]
+
+
+def test_scan_slot_gives_up_when_reread_still_invalid(monkeypatch):
+    settings = _scan_env(monkeypatch, FakeEngine())
+    bad = {"species": "CS Rex Male", "stats": {"health": {"base": 450, "mutation": 0}}}
+    monkeypatch.setattr(scanner, "scan_once", lambda s, d=False: bad)
+    monkeypatch.setattr(scanner, "fallback_stat", lambda crop, engine=None: None)
+    assert scanner.scan_slot(settings) == "no_egg"
+
+
+def test_scan_slot_rereads_implausible_stats(monkeypatch):
+    from plausibility import PlausibilityModel
+
+    settings = _scan_env(monkeypatch, FakeEngine())
+    model = PlausibilityModel(ranges={"Rex": {"health": (20, 49), "melee": (20, 49)}})
+    monkeypatch.setattr(
+        scanner, "suspicious_stats",
+        lambda scan, wipe="default": model.suspicious("Rex", scan["stats"]),
+    )
+    first = {
+        "species": "CS Rex Male",
+        "stats": {
+            "health": {"base": 45, "mutation": 2},
+            "melee": {"base": 4, "mutation": 0},
+        },
+    }
+    monkeypatch.setattr(scanner, "scan_once", lambda s, d=False: first)
+    monkeypatch.setattr(scanner, "fallback_stat", lambda crop, engine=None: (44, 0, 91))
+    result = scanner.scan_slot(settings)
+    assert result["stats"]["melee"] == {"base": 44, "mutation": 0, "confidence": 91}
+    assert result["stats"]["health"] == {"base": 45, "mutation": 2}
+
+
+def test_scan_slot_backs_off_only_when_reread_differs(monkeypatch):
+    from plausibility import PlausibilityModel
+
+    settings = _scan_env(monkeypatch, FakeEngine())
+    model = PlausibilityModel(ranges={"Rex": {"melee": (20, 49)}})
+    monkeypatch.setattr(
+        scanner, "suspicious_stats",
+        lambda scan, wipe="default": model.suspicious("Rex", scan["stats"]),
+    )
+    failures = []
+    monkeypatch.setattr(scanner, "report_failure", lambda s, knob: failures.append(knob))
+    monkeypatch.setattr(scanner, "scan_once", lambda s, d=False: {
+        "species": "CS Rex Male", "stats": {"melee": {"base": 55, "mutation": 0}},
+    })
+    # a genuine new top stat reads the same twice
+    monkeypatch.setattr(scanner, "fallback_stat", lambda crop, engine=None: (55, 0, 90))
+    assert scanner.scan_slot(settings)["stats"]["melee"]["base"] == 55
+    assert failures == []
+
+    monkeypatch.setattr(scanner, "fallback_stat", lambda crop, engine=None: (45, 0, 90))
+    assert scanner.scan_slot(settings)["stats"]["melee"]["base"] == 45
+    assert failures == ["popup_delay"]
+
+
+def test_popup_timeout_on_empty_slot_is_not_a_failure(monkeypatch):
+    settings = _scan_env(monkeypatch, FakeEngine(species=""))
+    frame = np.zeros((22, 40, 3), dtype=np.uint8)
+    scanner.pyautogui.screenshot = lambda region=None: frame[:region[3], :region[2]]
+    failures = []
+    monkeypatch.setattr(scanner, "report_failure", lambda s, knob: failures.append(knob))
+    assert scanner.scan_once(settings) == "no_egg"
+    assert failures == []
+
+    scanner.get_engine("auto").species = "CS Rex Male"
+    assert scanner.scan_once(settings) != "no_egg"
+    assert failures == ["popup_delay"]
+
+
+def test_confident_low_value_skips_fallback(monkeypatch):
+    engine = FakeEngine(stat_text="8", conf=95)
+    settings = _scan_env(monkeypatch, engine)
+    monkeypatch.setattr(
+        scanner, "fallback_stat", lambda *a, **k: pytest.fail("fallback ran")
+    )
+    result = scanner.scan_once(settings)
+    assert result["stats"]["health"] == {"base": 8, "mutation": 0, "confidence": 95}
+
+
+def test_unconfident_low_value_runs_fallback(monkeypatch):
+    engine = FakeEngine(stat_text="8", conf=40)
+    settings = _scan_env(monkeypatch, engine)
+    monkeypatch.setattr(scanner, "fallback_stat", lambda crop, engine=None: (18, 0, 91))
+    result = scanner.scan_once(settings)
+    assert result["stats"]["health"] == {"base": 18, "mutation": 0, "confidence": 91}
+
+
+def test_otsu_threshold_matches_opencv(monkeypatch):
+    _require_cv2(monkeypatch)
+    rng = np.random.default_rng(3)
+    plane = np.clip(rng.normal(60, 20, (30, 70)), 0, 255).astype(np.uint8)
+    plane[5:20, 10:40] = np.clip(rng.normal(200, 15, (15, 30)), 0, 255)
+    expected, _ = scanner.cv2.threshold(
+        plane, 0, 255, scanner.cv2.THRESH_BINARY + scanner.cv2.THRESH_OTSU
+    )
+    assert scanner.otsu_threshold(plane) == int(expected)
+    # works on strided views too
+    assert scanner.otsu_threshold(plane[::2, 1::3]) >= 0
+
+
+def test_frame_planes_binarize_slices_roi(monkeypatch):
+    _require_cv2(monkeypatch)
+    gray = np.full((20, 40), 30, dtype=np.uint8)
+    gray[4:10, 22:30] = 220
+    planes = scanner.FramePlanes(gray)
+    bw = planes.binarize(20, 2, 12, 10)
+    assert bw.shape == (30, 36)
+    assert set(np.unique(bw)) == {0, 255}
+    assert bw[15, 15] == 255 and bw[0, 0] == 0
+
+
+GRID_SETTINGS = {
+    "slot_x": 100,
+    "slot_y": 200,
+    "species_roi": {"x": 10, "y": 20, "w": 30, "h": 8},
+    "stat_rois": {"health": {"x": 10, "y": 30, "w": 20, "h": 8}},
+    "slot_grid": {"columns": 3, "rows": 2, "dx": 50, "dy": 60},
+}
+
+
+def test_grid_slots_row_major():
+    assert scanner.grid_slots(GRID_SETTINGS) == [
+        (100, 200), (150, 200), (200, 200),
+        (100, 260), (150, 260), (200, 260),
+    ]
+    assert scanner.grid_slots({"slot_x": 5, "slot_y": 6}) == [(5, 6)]
+
+
+def test_slot_settings_moves_rois_only_when_popup_follows():
+    cfg = scanner.slot_settings(GRID_SETTINGS, 4)
+    assert (cfg["slot_x"], cfg["slot_y"]) == (150, 260)
+    assert cfg["species_roi"] is GRID_SETTINGS["species_roi"]
+
+    follow = dict(GRID_SETTINGS, slot_grid={**GRID_SETTINGS["slot_grid"], "popup_follows_slot": True})
+    cfg = scanner.slot_settings(follow, 4)
+    assert cfg["species_roi"] == {"x": 60, "y": 80, "w": 30, "h": 8}
+    assert list(cfg["stat_rois"]["health"].values()) == [60, 90, 20, 8]
+    assert GRID_SETTINGS["species_roi"]["x"] == 10
+
+
+def test_occupied_slots_from_one_screenshot(monkeypatch):
+    settings = dict(GRID_SETTINGS, slot_grid={
+        **GRID_SETTINGS["slot_grid"],
+        "slot_size": [10, 10],
+        "signatures": {
+            "empty": scanner.popup_signature(np.zeros((10, 10, 3), np.uint8)),
+            "present": scanner.popup_signature(np.full((10, 10, 3), 200, np.uint8)),
+        },
+    })
+    grabs = []
+
+    def grab(region, backend="auto"):
+        grabs.append(region)
+        frame = np.zeros((region[3], region[2], 3), np.uint8)
+        # eggs in slots 0 and 4
+        for sx, sy in [(100, 200), (150, 260)]:
+            x, y = sx - 5 - region[0], sy - 5 - region[1]
+            frame[y:y+10, x:x+10] = 200
+        return frame
+
+    monkeypatch.setattr(scanner, "grab_region", grab)
+    assert scanner.occupied_slots(settings) == [0, 4]
+    assert grabs == [(95, 195, 110, 70)]
+    assert scanner.occupied_slots(GRID_SETTINGS) == list(range(6))
+
+
+def test_scan_grid_collects_eggs_in_inventory_order(monkeypatch):
+    monkeypatch.setattr(scanner, "occupied_slots", lambda s: [1, 2, 5])
+    results = {
+        (150, 200): {"species": "CS Rex Male", "stats": {}},
+        (200, 200): "no_egg",
+        (200, 260): {"species": "CS Ovis Female", "stats": {}},
+    }
+    seen = []
+
+    def scan(cfg, debug=False):
+        seen.append((cfg["slot_x"], cfg["slot_y"]))
+        return results[seen[-1]]
+
+    monkeypatch.setattr(scanner, "scan_slot", scan)
+    batch = scanner.scan_grid(GRID_SETTINGS)
+    assert seen == [(150, 200), (200, 200), (200, 260)]
+    assert [(cfg["slot_x"], cfg["slot_y"], s["species"]) for cfg, s in batch] == [
+        (150, 200, "CS Rex Male"), (200, 260, "CS Ovis Female"),
+    ]
@@ -0,0 +1,291 @@
+import json
+import os
+import sys
+import threading
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Provide dummy pyautogui so the modules import without a display
+sys.modules.setdefault("pyautogui", types.SimpleNamespace())
+
+import session
+from progress_tracker import record_history
+from session import ScanSession, SessionCallbacks
+
+STATS = {"health": {"base": 40, "mutation": 0}}
+
+
+def make_scan(species):
+    return {"species": species, "stats": dict(STATS)}
+
+
+class Recorder(SessionCallbacks):
+    def __init__(self, cfg=None):
+        self.logs = []
+        self.states = []
+        self.results = []
+        self.added = []
+        self.cfg = cfg
+
+    def log(self, msg):
+        self.logs.append(msg)
+
+    def status(self, state):
+        self.states.append(state)
+
+    def new_species(self, species):
+        return self.cfg
+
+    def species_added(self, species):
+        self.added.append(species)
+
+    def egg_processed(self, result):
+        self.results.append(result)
+
+
+def install(monkeypatch, batch, decisions, tmp_path):
+    """Patch the screen and the stores; returns the list of performed actions."""
+    acted = []
+    saved = []
+    monkeypatch.setattr(session, "scan_grid", lambda settings: list(batch))
+    monkeypatch.setattr(
+        session, "scan_slot",
+        lambda settings: batch[0][1] if batch else "no_egg",
+    )
+    decide = lambda data, config, progress: (decisions[data["egg"]], {"mutations": False})
+    monkeypatch.setattr(session, "should_keep_egg", decide)
+    monkeypatch.setattr(session, "decide_egg", decide)
+    monkeypatch.setattr(session, "load_progress", lambda wipe: {})
+    monkeypatch.setattr(session, "save_progress", lambda progress, wipe: saved.append(wipe))
+    monkeypatch.setattr(session, "update_stud", lambda *a, **kw: False)
+    monkeypatch.setattr(session, "update_mutation_stud", lambda *a, **kw: False)
+    monkeypatch.setattr(session, "grab_probe", lambda cfg: None)
+    monkeypatch.setattr(session, "wait_for_settle", lambda cfg, before: None)
+    monkeypatch.setattr(
+        session, "keep_egg",
+        lambda cfg, popup_open=True: acted.append(("keep", cfg["slot"], popup_open)) or True,
+    )
+    monkeypatch.setattr(
+        session, "destroy_egg",
+        lambda cfg: acted.append(("destroy", cfg["slot"])) or True,
+    )
+    for name in ("shutdown_pool", "close_engines", "close_captures", "close_inputs"):
+        monkeypatch.setattr(session, name, lambda: None)
+    return acted, saved
+
+
+def new_session(tmp_path, settings=None, rules=None, callbacks=None):
+    settings = dict(settings or {}, slot=0)
+    rules = {"Rex": {"modes": ["automated"]}} if rules is None else rules
+    return ScanSession(
+        settings, rules, callbacks or Recorder(),
+        str(tmp_path / "settings.json"), str(tmp_path / "rules.json"),
+    )
+
+
+def test_step_runs_stages_and_reports(monkeypatch, tmp_path):
+    acted, saved = install(
+        monkeypatch, [({"slot": 0}, make_scan("CS Rex Female"))],
+        {"CS Rex Female": "keep"}, tmp_path,
+    )
+    cb = Recorder()
+    s = new_session(tmp_path, callbacks=cb)
+    monkeypatch.setattr(session, "increment_female_count", lambda *a: 1)
+    monkeypatch.setattr(session, "adjust_rules_for_females", lambda *a: False)
+    results = s.step()
+    assert [r["decision"] for r in results] == ["keep"]
+    assert results[0]["species"] == "Rex" and results[0]["sex"] == "female"
+    assert cb.results == results
+    assert saved == ["default"]
+    assert acted == [("keep", 0, True)]
+    assert s.eggs == 1
+    assert set(s.timing_report()) == {"scan", "decide", "update", "act", "settle"}
+
+
+def test_batch_acts_in_reverse_slot_order(monkeypatch, tmp_path):
+    batch = [({"slot": i}, make_scan(f"CS Rex Male {i}")) for i in range(3)]
+    decisions = {"CS Rex Male 0": "destroy", "CS Rex Male 1": "keep", "CS Rex Male 2": "destroy"}
+    acted, _ = install(monkeypatch, batch, decisions, tmp_path)
+    s = new_session(tmp_path, settings={"multi_slot": True})
+    s.step()
+    assert acted == [("destroy", 2), ("keep", 1, False), ("destroy", 0)]
+
+
+def test_unconfirmed_action_stops_the_batch(monkeypatch, tmp_path):
+    batch = [({"slot": i}, make_scan(f"CS Rex Male {i}")) for i in range(2)]
+    decisions = dict.fromkeys(("CS Rex Male 0", "CS Rex Male 1"), "destroy")
+    acted, _ = install(monkeypatch, batch, decisions, tmp_path)
+    monkeypatch.setattr(session, "destroy_egg", lambda cfg: acted.append(cfg["slot"]) and False)
+    cb = Recorder()
+    s = new_session(tmp_path, settings={"multi_slot": True}, callbacks=cb)
+    results = s.step()
+    assert acted == [1]
+    assert "↻ Action unconfirmed; rescanning" in cb.logs
+    assert [r["applied"] for r in results] == [False, False]
+
+
+def test_only_carried_out_decisions_update_progress(monkeypatch, tmp_path):
+    batch = [({"slot": i}, make_scan(f"CS Rex Male {i}")) for i in range(2)]
+    decisions = {"CS Rex Male 0": "keep", "CS Rex Male 1": "destroy"}
+    acted, saved = install(monkeypatch, batch, decisions, tmp_path)
+    studs = []
+    monkeypatch.setattr(session, "update_stud", lambda egg, *a, **kw: studs.append(egg) or False)
+    cb = Recorder()
+    s = new_session(tmp_path, settings={"multi_slot": True}, callbacks=cb)
+    results = s.step(actions=("keep",))
+    assert acted == [("keep", 0, False)]
+    assert [r["applied"] for r in results] == [True, False]
+    assert studs == ["CS Rex Male 0"]
+    assert saved == ["default"]
+    # unapplied eggs are still reported
+    assert cb.results == results
+
+
+def test_dry_run_updates_a_private_copy(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    batch = [({"slot": 0}, make_scan("CS Rex Female")), ({"slot": 1}, make_scan("CS Rex Male"))]
+    acted, saved = install(
+        monkeypatch, batch, {"CS Rex Female": "keep", "CS Rex Male": "destroy"}, tmp_path,
+    )
+    history = []
+    monkeypatch.setattr(session, "append_history", lambda entries, wipe: history.extend(entries))
+    sinks = []
+
+    def update_stud(egg, stats, config, progress, wipe, sink=None):
+        sinks.append(sink)
+        return False
+
+    monkeypatch.setattr(session, "update_stud", update_stud)
+    monkeypatch.setattr(
+        session, "adjust_rules_for_females", lambda species, progress, rules, *a: rules.clear() or True,
+    )
+    rules = {"Rex": {"modes": ["automated"]}}
+    s = ScanSession(
+        {"slot": 0, "multi_slot": True, "record_scans": True}, rules, Recorder(),
+        str(tmp_path / "settings.json"), str(tmp_path / "rules.json"), dry_run=True,
+    )
+    for _ in range(2):
+        assert [r["applied"] for r in s.step()] == [True, True]
+    s.close()
+    assert acted == [] and saved == [] and history == []
+    assert sinks == [session._discard_history] * 2
+    assert "act" not in s.timing_report()
+    assert rules == {"Rex": {"modes": ["automated"]}} and s.rules == {}
+    assert not (tmp_path / "rules.json").exists()
+    assert not (tmp_path / "wipes").exists()
+    assert s.load_progress("default")["Rex"]["female_count"] == 2
+
+
+def test_new_species_added_to_rules(monkeypatch, tmp_path):
+    install(
+        monkeypatch, [({"slot": 0}, make_scan("CS Stego Male"))],
+        {"CS Stego Male": "destroy"}, tmp_path,
+    )
+    cb = Recorder(cfg={"modes": ["mutations"]})
+    s = new_session(tmp_path, rules={}, callbacks=cb)
+    s.step(actions=())
+    assert sorted(s.rules["Stego"]["modes"]) == ["automated", "mutations"]
+    assert json.loads((tmp_path / "rules.json").read_text())["Stego"] == s.rules["Stego"]
+    assert cb.added == ["Stego"]
+    assert cb.states == ["Paused", "Running"]
+
+
+def test_run_stops_after_max_eggs_and_closes(monkeypatch, tmp_path):
+    install(
+        monkeypatch, [({"slot": 0}, make_scan("CS Rex Male"))],
+        {"CS Rex Male": "destroy"}, tmp_path,
+    )
+    cb = Recorder()
+    s = new_session(tmp_path, callbacks=cb)
+    s.run(max_eggs=3)
+    assert s.eggs == 3
+    assert not s.running
+    assert cb.states[0] == "Running" and cb.states[-1] == "Stopped"
+    assert cb.logs[-1] == "⏹ Scanning stopped."
+
+
+def test_cli_once_dry_run(monkeypatch, tmp_path, capsys):
+    acted, _ = install(
+        monkeypatch, [({"slot": 0}, make_scan("CS Rex Male"))],
+        {"CS Rex Male": "destroy"}, tmp_path,
+    )
+    settings = tmp_path / "settings.json"
+    rules = tmp_path / "rules.json"
+    settings.write_text(json.dumps({"slot": 0}))
+    rules.write_text(json.dumps({"Rex": {"modes": ["automated"]}}))
+    assert session.main(["--settings", str(settings), "--rules", str(rules), "--once", "--dry-run"]) == 0
+    out = capsys.readouterr().out
+    assert "→ CS Rex Male: DESTROY" in out
+    assert "decide:" in out
+    assert acted == []
+
+
+def test_pipelined_run_persists_off_the_loop(monkeypatch, tmp_path):
+    install(
+        monkeypatch, [({"slot": 0}, make_scan("CS Rex Male"))],
+        {"CS Rex Male": "destroy"}, tmp_path,
+    )
+    writes = []
+    monkeypatch.setattr(
+        session, "save_progress",
+        lambda progress, wipe: writes.append((threading.current_thread().name, dict(progress))),
+    )
+    history = []
+    monkeypatch.setattr(session, "append_history", lambda entries, wipe: history.extend(entries))
+
+    def update_stud(egg, stats, config, progress, wipe, sink=None):
+        progress.setdefault("Rex", {"seen": 0})["seen"] += 1
+        record_history("Rex", "top_stats", "health", progress["Rex"]["seen"], wipe)
+        return False
+
+    monkeypatch.setattr(session, "update_stud", update_stud)
+    cb = Recorder()
+    s = new_session(tmp_path, callbacks=cb)
+    s.run(max_eggs=5)
+    assert s.writer is None
+    assert writes and all(name == "session-writer" for name, _ in writes)
+    assert writes[-1][1] == {"Rex": {"seen": 5}}
+    assert [e[3] for e in history] == [1, 2, 3, 4, 5]
+    assert cb.logs.count("→ CS Rex Male: DESTROY") == 5
+    assert cb.logs[-1] == "⏹ Scanning stopped."
+
+
+def test_progress_reloaded_when_file_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr("progress_tracker.WIPE_DIR", str(tmp_path / "wipes"))
+    s = new_session(tmp_path)
+    path = tmp_path / "wipes" / "w" / "breeding_progress.json"
+    progress = s.load_progress("w")
+    progress["Rex"] = {"female_count": 1}
+    s.save_progress("w")
+    assert json.loads(path.read_text()) == {"Rex": {"female_count": 1}}
+    assert s.load_progress("w") is progress
+    path.write_text(json.dumps({"Rex": {"female_count": 7}}))
+    os.utime(path, (1, 1))
+    assert s.load_progress("w") == {"Rex": {"female_count": 7}}
+
+
+def test_record_scans_appends_to_the_scan_log(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install(monkeypatch, [({"slot": 0}, make_scan("CS Rex Male"))], {"CS Rex Male": "destroy"}, tmp_path)
+    s = new_session(tmp_path, settings={"record_scans": True})
+    s.step()
+    s.close()
+    with open(tmp_path / "wipes" / "default" / "scan_log.jsonl", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [(r["egg"], r["species"], r["sex"]) for r in records] == [("CS Rex Male", "Rex", "male")]
+    assert records[0]["stats"] == {"health": [40, 0]}
+
+
+def test_step_holds_the_gui_lock_while_clicking(monkeypatch, tmp_path):
+    acted, _ = install(
+        monkeypatch, [({"slot": 0}, make_scan("CS Rex Male"))], {"CS Rex Male": "destroy"}, tmp_path,
+    )
+    lock = threading.Lock()
+    held = []
+    monkeypatch.setattr(session, "destroy_egg", lambda cfg: held.append(lock.locked()) or True)
+    s = new_session(tmp_path)
+    s.gui_lock = lock
+    s.step()
+    assert held == [True]
+    assert not lock.locked()
@@ -0,0 +1,185 @@
+import os
+import random
+import sys
+from copy import deepcopy
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import breeding_logic
+import progress_tracker
+from progress_tracker import (
+    adjust_rules_for_females,
+    append_scan_log,
+    increment_female_count,
+    scan_record,
+    update_mutation_stud,
+    update_mutation_thresholds,
+    update_stud,
+)
+from rule_compiler import MODES, STAT_ORDER
+from simulator import CowProgress, ScanStream, compare, simulate
+
+RULES = {
+    "Rex": {
+        "modes": ["automated"],
+        "mutation_stats": ["melee", "health"],
+        "stat_merge_stats": ["health", "melee", "stamina"],
+        "top_stat_females_stats": ["health", "melee"],
+        "war_stats": ["melee"],
+    },
+    "Ovis": {
+        "modes": ["mutations", "all_females", "war"],
+        "mutation_stats": ["food"],
+        "stat_merge_stats": ["food", "weight"],
+        "war_stats": ["food"],
+    },
+}
+
+
+def random_records(rng, n):
+    records = []
+    for i in range(n):
+        species = rng.choice(["Rex", "Ovis"])
+        sex = rng.choice(["male", "female"])
+        stats = {st: {"base": rng.randint(10, 60), "mutation": rng.choice([0, 0, 1, 2, 3, 4])}
+                 for st in STAT_ORDER}
+        records.append(scan_record(f"CS {species} {sex.title()}", species, sex, stats, ts=60.0 * i))
+    return records
+
+
+def naive_replay(records, rules, progress):
+    """ScanSession.decide + ScanSession._apply, one egg at a time."""
+    rules, progress = deepcopy(rules), deepcopy(progress)
+    kept = 0
+    modes = dict.fromkeys(MODES, 0)
+    for rec in records:
+        species, sex, egg = rec["species"], rec["sex"], rec["egg"]
+        stats = {st: {"base": b, "mutation": m} for st, (b, m) in rec["stats"].items()}
+        decision, res = breeding_logic.should_keep_egg(
+            {"egg": egg, "sex": sex, "stats": stats}, rules[species], progress,
+        )
+        config = rules[species]
+        if decision == "keep":
+            kept += 1
+            for mode in MODES:
+                modes[mode] += res[mode]
+            if sex == "female":
+                increment_female_count(egg, progress, sex)
+                adjust_rules_for_females(species, progress, rules)
+        if res["mutations"]:
+            update_mutation_thresholds(egg, stats, config, progress, sex)
+        if sex == "male":
+            update_stud(egg, stats, config, progress)
+            update_mutation_stud(egg, stats, config, progress)
+    return kept, modes, progress
+
+
+def species_of(egg):
+    return egg.split()[1]
+
+
+def test_replay_matches_egg_by_egg_session_updates():
+    records = random_records(random.Random(7), 3000)
+    with patch("breeding_logic.normalize_species_name", side_effect=species_of), \
+            patch("progress_tracker.normalize_species_name", side_effect=species_of), \
+            patch("progress_tracker.record_history"):
+        kept, modes, progress = naive_replay(records, RULES, {})
+    report = simulate(ScanStream(records), RULES)
+    assert report["eggs"] == 3000
+    assert report["kept"] == kept
+    assert report["modes"] == modes
+    for species, res in report["species"].items():
+        entry = progress[species]
+        assert res["female_count"] == entry["female_count"]
+        for key in ("stud", "top_stats", "mutation_thresholds", "mutation_stud"):
+            assert res[key] == entry.get(key, {}), (species, key)
+
+
+def test_scenarios_leave_rules_and_progress_untouched():
+    records = random_records(random.Random(3), 500)
+    rules = deepcopy(RULES)
+    progress = {"Rex": {"female_count": 2, "top_stats": {"melee": 40}, "mutation_thresholds": {},
+                        "stud": {}, "mutation_stud": {}}}
+    before = deepcopy(progress)
+    stream = ScanStream(records)
+    reports = compare(stream, rules, [
+        {"name": "stamina", "rules": {"*": {"top_stat_females_stats": ["health", "melee", "stamina"]}}},
+        {"name": "late war", "automated_thresholds": [10, 80]},
+    ], progress)
+    assert [r["name"] for r in reports] == ["baseline", "stamina", "late war"]
+    assert rules == RULES
+    assert progress == before
+    # the starting progress is shared, so the replays agree with a fresh run
+    assert simulate(stream, rules, progress)["kept"] == reports[0]["kept"]
+
+
+def test_automated_thresholds_change_the_keep_count():
+    rules = {"Rex": {"modes": ["automated"], "top_stat_females_stats": []}}
+    stats = {st: {"base": 20, "mutation": 0} for st in STAT_ORDER}
+    records = [scan_record("CS Rex Female", "Rex", "female", stats, ts=10.0 * i) for i in range(20)]
+    baseline, later = compare(
+        ScanStream(records), rules, [{"automated_thresholds": [10, 80]}],
+        targets={"Rex": {"female_count": 8}},
+    )
+    assert baseline["kept"] == 5 and baseline["species"]["Rex"]["target"] is None
+    assert later["kept"] == 10
+    assert later["species"]["Rex"]["target"] == {"egg_index": 7, "eggs": 8, "seconds": 70.0}
+
+
+def test_trajectories_follow_the_stream():
+    rules = {"Rex": {"modes": ["mutations"], "mutation_stats": ["melee"], "stat_merge_stats": ["melee"]}}
+
+    def male(melee, mut, ts):
+        stats = {"melee": {"base": melee, "mutation": mut}}
+        return scan_record("CS Rex Male", "Rex", "male", stats, ts=ts)
+
+    records = [male(30, 0, 0), male(20, 1, 1), male(35, 0, 2), male(10, 2, 3)]
+    res = simulate(ScanStream(records), rules)["species"]["Rex"]
+    assert res["mutation_thresholds"] == {"melee": 2}
+    assert [t[2:] for t in res["trajectory"]["mutation_thresholds"]] == [("melee", 1), ("melee", 2)]
+    assert [(i, stud) for i, _, stud in res["trajectory"]["stud"]] == [(0, {"melee": 30}), (2, {"melee": 35})]
+
+
+def test_cow_progress_copies_on_access():
+    base = {"Rex": {"female_count": 1, "stud": {"melee": 5}}}
+    cow = CowProgress(base)
+    assert "Rex" in cow and "Ovis" not in cow
+    cow["Rex"]["stud"]["melee"] = 9
+    progress_tracker.ensure_species(cow, "Ovis")
+    assert base == {"Rex": {"female_count": 1, "stud": {"melee": 5}}}
+    assert cow.get("Rex")["stud"] == {"melee": 9}
+
+
+def test_stream_round_trips_through_the_scan_log(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    records = random_records(random.Random(1), 10)
+    append_scan_log(records[:4], "w1")
+    append_scan_log(records[4:], "w1")
+    stream = ScanStream.load(progress_tracker.get_scan_log_file("w1"))
+    assert stream.count == 10
+    rex = stream.species["Rex"]
+    first = next(i for i, r in enumerate(records) if r["species"] == "Rex")
+    assert rex.index[0] == first
+    assert rex.bases[0].tolist() == [records[first]["stats"][st][0] for st in STAT_ORDER]
+
+
+def test_replay_leaves_shared_state_alone():
+    from species_lexicon import get_resolver
+
+    seen = []
+
+    def sink(entry, wipe):
+        seen.append(entry)
+
+    previous = progress_tracker.set_history_sink(sink)
+    memo = dict(get_resolver(progress_tracker.RULES_FILE).resolved)
+    try:
+        report = simulate(ScanStream(random_records(random.Random(5), 300)), RULES)
+    finally:
+        installed = progress_tracker.set_history_sink(previous)
+    assert installed is sink
+    assert report["species"]["Rex"]["trajectory"]["top_stats"]
+    assert seen == []
+    assert get_resolver(progress_tracker.RULES_FILE).resolved == memo
+    assert not progress_tracker.log.filters
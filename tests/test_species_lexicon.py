@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import species_lexicon
+from species_lexicon import BKTree, SpeciesLexicon, levenshtein
+
+SPECIES = ["Rex", "Giganotosaurus", "Stegosaurus", "Tek Stegosaurus", "Snow Owl", "Ovis", "Aberrant Ovis"]
+
+
+def test_levenshtein():
+    assert levenshtein("rex", "rex") == 0
+    assert levenshtein("rex", "r3x") == 1
+    assert levenshtein("snow owl", "snowowl") == 1
+    assert levenshtein("", "ovis") == 4
+
+
+def test_bktree_closest_matches_linear_scan():
+    words = [s.lower() for s in SPECIES]
+    tree = BKTree(words)
+    assert tree.size == len(words)
+    for query in ["gigan0tosaurus", "stegosaurvs", "tek stegosarus", "ovls", "qqqq"]:
+        best = min(words, key=lambda w: levenshtein(query, w))
+        dist = levenshtein(query, best)
+        if dist <= 2:
+            assert tree.closest(query, 2) == (best, dist)
+        else:
+            assert tree.closest(query, 2) == (None, None)
+
+
+def test_snap_fixes_garbled_species_and_tokens():
+    lex = SpeciesLexicon(SPECIES)
+    assert lex.snap("CS Rex Male") == "CS Rex Male"
+    assert lex.snap("C5 Giganotosaurvs Fernale") == "CS Giganotosaurus Female"
+    assert lex.snap("cs Tek Stegosauros 223 - Male") == "CS Tek Stegosaurus Male"
+    assert lex.snap("CS Snow 0wl (Female)") == "CS Snow Owl Female"
+
+
+def test_snap_keeps_unknown_species_and_non_egg_text():
+    lex = SpeciesLexicon(SPECIES)
+    assert lex.snap("CS Dodo Female") == "CS Dodo Female"
+    assert lex.snap("garbage") == "garbage"
+    assert lex.snap("") == ""
+
+
+def test_female_is_not_read_as_male():
+    lex = SpeciesLexicon(SPECIES)
+    assert lex.snap("CS Rex emale") == "CS Rex Female"
+    assert lex.snap("CS Ovis male") == "CS Ovis Male"
+
+
+def test_lexicon_skips_unsnapped_rule_keys():
+    lex = SpeciesLexicon(["Cs  Tek Stegosaurus 223", "Rex"])
+    assert set(lex.names) == {"rex"}
+
+
+def test_get_lexicon_rebuilds_when_rules_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(species_lexicon, "_lexicon", None)
+    rules = tmp_path / "rules.json"
+    extra = tmp_path / "extra_tames.json"
+    rules.write_text(json.dumps({"Rex": {}}))
+    extra.write_text(json.dumps({"Reaper": {}}))
+    lex = species_lexicon.get_lexicon(str(rules), str(extra))
+    assert lex.match("reeper") == "Reaper"
+    assert species_lexicon.get_lexicon(str(rules), str(extra)) is lex
+
+    rules.write_text(json.dumps({"Rex": {}, "Baryonyx": {}}))
+    os.utime(rules, ns=(1, 1))
+    rebuilt = species_lexicon.get_lexicon(str(rules), str(extra))
+    assert rebuilt is not lex
+    assert rebuilt.match("baryonix") == "Baryonyx"
+
+
+def test_resolver_matches_difflib_on_every_key():
+    import random
+    from difflib import get_close_matches
+
+    keys = SPECIES + ["Rexx", "Ovi", "Tek Rex", "Owl", "Giga", "X"]
+    resolver = species_lexicon.SpeciesResolver(keys)
+    rng = random.Random(7)
+    queries = ["", "R", "Rex", "Rx", "Snow 0wl", "Stegosaurs", "Tek Stegosaurus 2"]
+    for _ in range(300):
+        word = list(rng.choice(keys))
+        for _ in range(rng.randint(0, 3)):
+            op = rng.randrange(3)
+            pos = rng.randrange(len(word) + 1)
+            if op == 0:
+                word.insert(pos, rng.choice("aeiouxz0 "))
+            elif word and pos < len(word):
+                if op == 1:
+                    del word[pos]
+                else:
+                    word[pos] = rng.choice("aeiouxz0")
+        queries.append("".join(word))
+    for q in queries:
+        expected = get_close_matches(q, keys, n=1, cutoff=0.8)
+        assert resolver.match(q) == (expected[0] if expected else None), q
+
+
+def test_resolver_add_clears_memo():
+    resolver = species_lexicon.SpeciesResolver(["Rex"])
+    resolver.remember("CS Baryonix Male", "Baryonix")
+    resolver.add("Baryonyx")
+    assert resolver.resolved == {}
+    assert resolver.match("Baryonix") == "Baryonyx"
+
+
+def test_get_resolver_rebuilds_on_change_or_invalidation(tmp_path, monkeypatch):
+    monkeypatch.setattr(species_lexicon, "_resolver", None)
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps({"Rex": {}}))
+    resolver = species_lexicon.get_resolver(str(rules))
+    assert species_lexicon.get_resolver(str(rules)) is resolver
+
+    species_lexicon.invalidate_species_index()
+    assert species_lexicon.get_resolver(str(rules)) is not resolver
+
+    resolver = species_lexicon.get_resolver(str(rules))
+    rules.write_text(json.dumps({"Rex": {}, "Baryonyx": {}}))
+    os.utime(rules, ns=(1, 1))
+    rebuilt = species_lexicon.get_resolver(str(rules))
+    assert rebuilt is not resolver
+    assert rebuilt.match("Baryonix") == "Baryonyx"
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import timing
+from timing import TimingTuner
+
+CEILINGS = {"popup_delay": 0.5, "action_delay": 0.2, "scan_loop_delay": 1.0, "action_timeout": 1.0}
+
+
+def fill(tuner, knob, value, n=timing.MIN_SAMPLES):
+    for _ in range(n):
+        tuner.record(knob, value)
+
+
+def test_delay_starts_at_ceiling_and_needs_samples():
+    tuner = TimingTuner(CEILINGS)
+    fill(tuner, "popup_delay", 0.1, timing.MIN_SAMPLES - 1)
+    assert tuner.delay("popup_delay") == 0.5
+
+
+def test_delay_moves_to_p99_plus_margin():
+    tuner = TimingTuner(CEILINGS, margin=0.5)
+    fill(tuner, "popup_delay", 0.1)
+    assert tuner.delay("popup_delay") == pytest.approx(0.1 * 1.5 + timing.PAD)
+    fill(tuner, "popup_delay", 0.9, 5)
+    # slow outliers push it back up, but never past the hand-set value
+    assert tuner.delay("popup_delay") == 0.5
+
+
+def test_failure_backs_off_and_holds():
+    tuner = TimingTuner(CEILINGS, margin=0.0)
+    fill(tuner, "popup_delay", 0.1)
+    tuned = tuner.delay("popup_delay")
+    tuner.failure("popup_delay")
+    assert tuner.delay("popup_delay") == pytest.approx(tuned * timing.BACKOFF)
+    fill(tuner, "popup_delay", 0.1, timing.HOLD)
+    assert tuner.delay("popup_delay") == pytest.approx(tuned * timing.BACKOFF)
+    tuner.record("popup_delay", 0.1)
+    assert tuner.delay("popup_delay") == pytest.approx(tuned)
+
+
+def test_profile_round_trip():
+    tuner = TimingTuner(CEILINGS)
+    fill(tuner, "scan_loop_delay", 0.3)
+    restored = TimingTuner(CEILINGS, tuner.to_profile())
+    assert restored.delay("scan_loop_delay") == pytest.approx(tuner.delay("scan_loop_delay"), abs=1e-4)
+    assert len(restored.samples["scan_loop_delay"]) == timing.MIN_SAMPLES
+
+
+def test_settings_helpers(monkeypatch):
+    monkeypatch.setattr(timing, "_tuner", None)
+    monkeypatch.setattr(timing, "machine_id", lambda: "box")
+    settings = {"popup_delay": 0.4}
+    assert timing.get_tuner(settings) is None
+    assert timing.get_delay(settings, "popup_delay") == 0.4
+    assert timing.get_delay(settings, "action_delay", 0.0) == 0.0
+    assert timing.store_profile(settings) is False
+
+    settings["timing"] = {"auto_tune": True, "margin": 0.0}
+    for _ in range(timing.MIN_SAMPLES):
+        timing.record_latency(settings, "popup_delay", 0.1)
+    assert timing.get_delay(settings, "popup_delay") == pytest.approx(0.1 + timing.PAD)
+    settings["popup_delay"] = 0.05
+    assert timing.get_delay(settings, "popup_delay") == 0.05
+    assert timing.store_profile(settings) is True
+    assert settings["timing"]["profiles"]["box"]["delays"]["popup_delay"] == pytest.approx(0.12)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Adaptive tuning of the scan loop's timing knobs.
+
+``popup_delay``, ``action_delay`` and ``scan_loop_delay`` are entered once
+during calibration and are usually far more conservative than the machine
+needs; ``action_timeout`` bounds each confirmed keep/destroy step.  ``TimingTuner`` keeps a rolling window of the latencies actually
+measured during live runs and moves each delay to the window's p99 plus a
+safety margin, never above the hand-set value.  Failed scans back the
+affected delay off again.
+
+The learned profile is stored per machine under ``settings["timing"]``::
+
+    "timing": {
+      "auto_tune": true,
+      "margin": 0.25,
+      "profiles": {"<hostname>": {"delays": {...}, "samples": {...}}}
+    }
+"""
+import platform
+import threading
+from collections import deque
+
+import numpy as np
+
+from logger import get_logger
+log = get_logger("timing")
+
+KNOBS = ("popup_delay", "action_delay", "scan_loop_delay", "action_timeout")
+DEFAULT_DELAYS = {
+    "popup_delay": 0.25, "action_delay": 0.05, "scan_loop_delay": 0.5, "action_timeout": 1.0,
+}
+# rolling window of measured latencies per knob
+WINDOW = 200
+# no tuning until this many latencies were measured
+MIN_SAMPLES = 20
+PERCENTILE = 99
+# relative safety margin on top of the percentile, plus a fixed pad (seconds)
+MARGIN = 0.25
+PAD = 0.02
+FLOOR = 0.01
+# a failure multiplies the delay by BACKOFF and freezes it for HOLD samples
+BACKOFF = 1.5
+HOLD = 20
+# samples kept in settings.json so a restart does not start from scratch
+SAVED_SAMPLES = 50
+
+
+def machine_id() -> str:
+    return platform.node() or "default"
+
+
+class TimingTuner:
+    """Rolling latency percentiles and the delays derived from them."""
+
+    def __init__(self, ceilings: dict, profile: dict | None = None, margin: float = MARGIN):
+        profile = profile or {}
+        saved = profile.get("samples", {})
+        delays = profile.get("delays", {})
+        self.margin = margin
+        self.ceilings = dict(ceilings)
+        self.samples = {k: deque(saved.get(k, []), maxlen=WINDOW) for k in KNOBS}
+        self.delays = {
+            k: min(delays.get(k, self.ceilings[k]), self.ceilings[k]) for k in KNOBS
+        }
+        self.hold = dict.fromkeys(KNOBS, 0)
+        self._lock = threading.Lock()
+
+    def percentile(self, knob: str, q: float = PERCENTILE):
+        with self._lock:
+            samples = list(self.samples[knob])
+        return float(np.percentile(samples, q)) if samples else None
+
+    def delay(self, knob: str) -> float:
+        return min(self.delays[knob], self.ceilings[knob])
+
+    def record(self, knob: str, seconds: float) -> None:
+        """Add one measured latency and retune ``knob`` from the window."""
+        with self._lock:
+            self.samples[knob].append(seconds)
+            if self.hold[knob]:
+                self.hold[knob] -= 1
+                return
+            if len(self.samples[knob]) < MIN_SAMPLES:
+                return
+            p = float(np.percentile(self.samples[knob], PERCENTILE))
+            target = max(FLOOR, min(self.ceilings[knob], p * (1 + self.margin) + PAD))
+            if abs(target - self.delays[knob]) >= 0.005:
+                log.debug("%s tuned %.3f → %.3f (p%d %.3f)", knob, self.delays[knob], target, PERCENTILE, p)
+            self.delays[knob] = target
+
+    def failure(self, knob: str) -> None:
+        """Back ``knob`` off after a failed scan or rescan."""
+        with self._lock:
+            old = self.delays[knob]
+            self.delays[knob] = min(self.ceilings[knob], max(FLOOR, old * BACKOFF))
+            self.hold[knob] = HOLD
+        log.info("%s backed off %.3f → %.3f", knob, old, self.delays[knob])
+
+    def to_profile(self) -> dict:
+        with self._lock:
+            return {
+                "delays": {k: round(v, 4) for k, v in self.delays.items()},
+                "samples": {
+                    k: [round(s, 4) for s in list(v)[-SAVED_SAMPLES:]]
+                    for k, v in self.samples.items()
+                },
+            }
+
+
+_tuner = None
+
+
+def get_tuner(settings: dict):
+    """Return the shared tuner, or ``None`` when auto-tuning is disabled.
+
+    The hand-set delays in ``settings`` stay the upper bounds, so raising one
+    in the settings editor takes effect immediately.
+    """
+    global _tuner
+    timing = settings.get("timing", {})
+    if not timing.get("auto_tune", False):
+        return None
+    ceilings = {k: settings.get(k, DEFAULT_DELAYS[k]) for k in KNOBS}
+    if _tuner is None:
+        profile = timing.get("profiles", {}).get(machine_id())
+        _tuner = TimingTuner(ceilings, profile, timing.get("margin", MARGIN))
+    _tuner.ceilings = ceilings
+    return _tuner
+
+
+def get_delay(settings: dict, knob: str, default: float | None = None) -> float:
+    tuner = get_tuner(settings)
+    if tuner:
+        return tuner.delay(knob)
+    return settings.get(knob, DEFAULT_DELAYS[knob] if default is None else default)
+
+
+def record_latency(settings: dict, knob: str, seconds: float) -> None:
+    tuner = get_tuner(settings)
+    if tuner:
+        tuner.record(knob, seconds)
+
+
+def report_failure(settings: dict, knob: str) -> None:
+    tuner = get_tuner(settings)
+    if tuner:
+        tuner.failure(knob)
+
+
+def store_profile(settings: dict) -> bool:
+    """Copy the learned profile into ``settings``; returns ``True`` if it did."""
+    tuner = get_tuner(settings)
+    if tuner is None:
+        return False
+    settings["timing"].setdefault("profiles", {})[machine_id()] = tuner.to_profile()
+    return True
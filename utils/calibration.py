@@ -13,6 +13,8 @@ import numpy as np
 import pyautogui
 import keyboard
 
+from input_backend import get_input
+
 SETTINGS_FILE = "settings.json"
 
 
@@ -51,6 +53,77 @@ def draw_roi(prompt: str, img):
     return {"x": x, "y": y, "w": w, "h": h}
 
 
+def capture_digit_templates(full, species_roi: dict, stat_rois: dict, root: tk.Tk | None = None) -> int:
+    """Learn glyph templates from the stat ROIs of a captured popup.
+
+    The stats are binarized exactly as ``scanner.scan_once`` does it: the
+    frame ``roi_region`` covers goes through ``FramePlanes`` and every stat
+    is sliced out of that plane.  Returns the number of stats whose glyphs
+    were added to the bank.
+    """
+    from scanner import FramePlanes, roi_region
+    from digit_recognizer import load_templates, save_templates
+
+    x, y, w, h = roi_region({"species_roi": species_roi, "stat_rois": stat_rois})
+    planes = FramePlanes(cv2.cvtColor(full[y:y + h, x:x + w], cv2.COLOR_BGR2GRAY))
+    bank = load_templates()
+    learned = 0
+    for stat, r in stat_rois.items():
+        text = simpledialog.askstring(
+            "Digit Templates",
+            f"Value shown for {stat} (e.g. 45(2)), blank to skip:",
+            parent=root,
+        )
+        if not text:
+            continue
+        prim = planes.binarize(r["x"] - x, r["y"] - y, r["w"], r["h"])
+        if bank.learn(prim, text.replace(" ", "")):
+            learned += 1
+    save_templates(bank)
+    return learned
+
+
+def calibrate_slot_grid(slot_x: int, slot_y: int, full, root: tk.Tk | None = None):
+    """Record the inventory grid used by multi-slot scanning.
+
+    ``full`` is a screenshot with an egg in the first slot.  Returns the
+    ``slot_grid`` settings entry, or ``None`` when the grid is a single slot.
+    """
+    from scanner import popup_signature
+
+    columns = simpledialog.askinteger("Slot Grid", "Egg slots per row:", parent=root, minvalue=1) or 1
+    rows = simpledialog.askinteger("Slot Grid", "Rows of egg slots:", parent=root, minvalue=1) or 1
+    if columns * rows == 1:
+        return None
+    dx = dy = 0
+    if columns > 1:
+        x, _ = wait_and_record_gui("Hover over the LAST slot of the first row", root)
+        dx = round((x - slot_x) / (columns - 1))
+    if rows > 1:
+        _, y = wait_and_record_gui("Hover over the first slot of the LAST row", root)
+        dy = round((y - slot_y) / (rows - 1))
+    # sample the inner part of a slot so borders and highlights are ignored
+    w = max(4, int(abs(dx or dy) * 0.6))
+    h = max(4, int(abs(dy or dx) * 0.6))
+    present = popup_signature(full[slot_y - h // 2:slot_y - h // 2 + h, slot_x - w // 2:slot_x - w // 2 + w])
+    ex, ey = wait_and_record_gui("Hover over an EMPTY slot", root)
+    empty = cv2.cvtColor(
+        np.array(pyautogui.screenshot(region=(ex - w // 2, ey - h // 2, w, h))), cv2.COLOR_RGB2BGR
+    )
+    follows = messagebox.askyesno(
+        "Slot Grid", "Does the egg popup open next to the clicked slot?", parent=root
+    )
+    return {
+        "columns": columns,
+        "rows": rows,
+        "dx": dx,
+        "dy": dy,
+        "slot_size": [w, h],
+        "popup_follows_slot": follows,
+        "signatures": {"empty": popup_signature(empty), "present": present},
+    }
+
+
 def run_calibration(root: tk.Tk | None = None) -> dict:
     """Interactive calibration with GUI prompts."""
     if cv2 is None:
@@ -63,8 +136,9 @@ def run_calibration(root: tk.Tk | None = None) -> dict:
 
     slot_x, slot_y = wait_and_record_gui("1) Hover over an EGG SLOT", root)
 
-    pyautogui.moveTo(slot_x, slot_y)
-    pyautogui.rightClick()
+    mouse = get_input()
+    mouse.moveTo(slot_x, slot_y)
+    mouse.rightClick()
     time.sleep(0.5)
 
     dest_x, dest_y = wait_and_record_gui("2) Hover over 'Destroy'", root)
@@ -73,10 +147,18 @@ def run_calibration(root: tk.Tk | None = None) -> dict:
     this_x, this_y = wait_and_record_gui("3) Hover over 'This' submenu", root)
     destroy_this_offsets = [this_x - slot_x, this_y - slot_y]
 
-    pyautogui.click(slot_x, slot_y)
+    mouse.click(slot_x, slot_y)
     time.sleep(0.5)
 
     full = cv2.cvtColor(np.array(pyautogui.screenshot()), cv2.COLOR_RGB2BGR)
+    slot_grid = None
+    if messagebox.askyesno(
+        "Slot Grid",
+        "Scan several egg slots per pass (multi-slot mode)?\n"
+        "You will be asked for the grid size and a few slot positions.",
+        parent=root,
+    ):
+        slot_grid = calibrate_slot_grid(slot_x, slot_y, full, root)
     popup_roi = draw_roi("5) Draw ROI around the STATS POPUP", full)
     px, py_, pw, ph = popup_roi["x"], popup_roi["y"], popup_roi["w"], popup_roi["h"]
     popup_img = full[py_:py_ + ph, px:px + pw]
@@ -92,6 +174,25 @@ def run_calibration(root: tk.Tk | None = None) -> dict:
         r["y"] += py_
         stat_rois[stat] = r
 
+    from scanner import popup_signature
+    sx, sy = species_roi["x"], species_roi["y"]
+    sw, sh = species_roi["w"], species_roi["h"]
+    present_sig = popup_signature(full[sy:sy + sh, sx:sx + sw])
+
+    if messagebox.askyesno(
+        "Digit Templates",
+        "Capture digit templates from the stats on screen?\n"
+        "You will be asked to type the value shown for each stat.",
+        parent=root,
+    ):
+        capture_digit_templates(full, species_roi, stat_rois, root)
+
+    wait_and_record_gui("Close the egg popup so the slot looks empty", root)
+    empty = cv2.cvtColor(
+        np.array(pyautogui.screenshot(region=(sx, sy, sw, sh))), cv2.COLOR_RGB2BGR
+    )
+    popup_signatures = {"empty": popup_signature(empty), "present": present_sig}
+
     hk = simpledialog.askstring("Hotkey", "Enter scan hotkey:", parent=root) or "F8"
     pd = simpledialog.askstring("Popup Delay", "Popup delay sec:", parent=root)
     popup_delay = float(pd) if pd else 0.25
@@ -119,6 +220,9 @@ def run_calibration(root: tk.Tk | None = None) -> dict:
         "drop_all_button": drop_all_button,
         "food_slots": food_slots,
         "species_roi": species_roi,
+        "popup_signatures": popup_signatures,
+        "multi_slot": slot_grid is not None,
+        "slot_grid": slot_grid or {},
         "stat_rois": stat_rois,
         "ocr": {
             "tesseract_cmd": "tesseract",